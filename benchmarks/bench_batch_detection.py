@@ -0,0 +1,52 @@
+# benchmarks/bench_batch_detection.py
+
+"""
+Benchmark of the vectorized batch conflict detection against the per-pair
+`detect_conflicts` loop.
+
+Usage:
+    python -m benchmarks.bench_batch_detection [num_scenarios] [num_vehicles]
+"""
+
+import json
+import random
+import sys
+import time
+
+from src.conflict_detection import parse_intersection_layout, parse_vehicles, detect_conflicts
+from src.data_generation import generate_vehicle_scenario
+from src.batch_detection import encode_scenarios, detect_conflicts_batch
+
+
+def main():
+    num_scenarios = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    num_vehicles = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with open('data/intersection_layout.json') as f:
+        intersection_layout = parse_intersection_layout(json.load(f))
+
+    random.seed(0)
+    scenarios = [generate_vehicle_scenario(num_vehicles, intersection_layout)
+                 for _ in range(num_scenarios)]
+    vehicle_lists = [parse_vehicles(scenario, intersection_layout) for scenario in scenarios]
+    arrays = encode_scenarios(scenarios, intersection_layout)
+
+    start = time.perf_counter()
+    scalar_total = sum(len(detect_conflicts(vehicles)) for vehicles in vehicle_lists)
+    scalar_time = time.perf_counter() - start
+
+    batch_time = float('inf')
+    for _ in range(5):
+        start = time.perf_counter()
+        result = detect_conflicts_batch(arrays['speed'], arrays['distance'], arrays['direction'],
+                                        arrays['movement'], arrays['offsets'])
+        batch_time = min(batch_time, time.perf_counter() - start)
+
+    assert scalar_total == int(result.offsets[-1])
+    print(f"{num_scenarios} scenarios x {num_vehicles} vehicles, {scalar_total} conflicts")
+    print(f"detect_conflicts loop:  {scalar_time:.3f}s")
+    print(f"detect_conflicts_batch: {batch_time:.3f}s ({scalar_time / batch_time:.1f}x, best of 5)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_bulk_parser.py
+
+"""
+Benchmark of validating scenarios with `parse_scenarios` against calling
+`parse_vehicles` per scenario and catching its exceptions and warnings, on
+data with a share of invalid vehicles. A second run with warnings ignored
+shows the cost of the Vehicle objects alone.
+
+Usage:
+    python -m benchmarks.bench_bulk_parser
+"""
+
+import json
+import random
+import time
+import warnings
+
+from src.bulk_parser import parse_scenarios
+from src.conflict_detection import parse_intersection_layout, parse_vehicles
+from src.data_generation import generate_vehicle_scenario
+
+NUM_SCENARIOS = 20000
+FAULT_RATE = 0.05
+
+
+def dirty_scenarios(intersection_layout):
+    scenarios = []
+    for _ in range(NUM_SCENARIOS):
+        scenario = generate_vehicle_scenario(5, intersection_layout, fixed_vehicle_count=False)
+        for vehicle in scenario['vehicles_scenario']:
+            if random.random() < FAULT_RATE:
+                field, value = random.choice([('speed', -1), ('lane', '9'), ('destination', 'Z'),
+                                              ('direction', 'up')])
+                vehicle[field] = value
+        scenarios.append(scenario)
+    return scenarios
+
+
+def main():
+    with open('data/intersection_layout.json') as f:
+        intersection_layout = parse_intersection_layout(json.load(f))
+    random.seed(0)
+    scenarios = dirty_scenarios(intersection_layout)
+
+    start = time.perf_counter()
+    rejected = 0
+    # Record every warning: per-scenario reasons are what ingestion needs to report
+    with warnings.catch_warnings(record=True):
+        warnings.simplefilter('always')
+        for scenario in scenarios:
+            try:
+                parse_vehicles(scenario, intersection_layout)
+            except ValueError:
+                rejected += 1
+    per_scenario_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parsed = parse_scenarios(scenarios, intersection_layout)
+    bulk_time = time.perf_counter() - start
+    assert parsed.error_mask.sum() == rejected
+
+    start = time.perf_counter()
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for scenario in scenarios:
+            try:
+                parse_vehicles(scenario, intersection_layout)
+            except ValueError:
+                pass
+    ignored_time = time.perf_counter() - start
+
+    print(f"{NUM_SCENARIOS} scenarios, {rejected} rejected")
+    print(f"parse_vehicles loop: {per_scenario_time * 1e3:8.1f}ms (warnings ignored: {ignored_time * 1e3:.1f}ms)")
+    print(f"parse_scenarios:     {bulk_time * 1e3:8.1f}ms ({per_scenario_time / bulk_time:.1f}x)")
+    print(parsed.summary())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_columnar_dataset.py
+
+"""
+Benchmark of loading a dataset from CSV (with `ast.literal_eval` on the
+literal columns and `json.loads` on the scenarios) against opening the
+same dataset in the columnar format and reading a whole column, plus the
+size of both on disk.
+
+Usage:
+    python -m benchmarks.bench_columnar_dataset
+"""
+
+import ast
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from src.columnar_dataset import LITERAL_COLUMNS, convert_csv, load_columnar
+from src.dataset_writer import write_dataset
+
+TOTAL_RECORDS = 20000
+
+
+def directory_size(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'dataset.csv')
+        columnar_path = os.path.join(directory, 'dataset')
+        write_dataset(csv_path, TOTAL_RECORDS, fixed_vehicle_count=False, seed=0)
+
+        start = time.perf_counter()
+        convert_csv(csv_path, columnar_path)
+        convert_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        dataset = pd.read_csv(csv_path)
+        for column in LITERAL_COLUMNS:
+            dataset[column] = dataset[column].map(ast.literal_eval)
+        speeds = [vehicle['speed'] for scenario in dataset['scenario'].map(json.loads)
+                  for vehicle in scenario['vehicles_scenario']]
+        csv_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        columnar = load_columnar(columnar_path)
+        open_time = time.perf_counter() - start
+        start = time.perf_counter()
+        columnar_speed = float(columnar.speed.mean())
+        column_time = time.perf_counter() - start
+        assert len(speeds) == len(columnar.speed)
+
+        print(f"{TOTAL_RECORDS} records, {len(speeds)} vehicles (mean speed {columnar_speed:.2f} km/h)")
+        print(f"CSV:      {os.path.getsize(csv_path) / 2 ** 20:7.2f} MiB, parsed in {csv_time * 1e3:8.1f}ms")
+        print(f"columnar: {directory_size(columnar_path) / 2 ** 20:7.2f} MiB, opened in {open_time * 1e3:8.2f}ms, "
+              f"speed column read in {column_time * 1e3:.2f}ms (converted in {convert_time:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_concurrent_evaluation.py
+
+"""
+Benchmark of evaluating test conversations against a local stand-in for
+the chat completions endpoint that answers after a fixed latency, one
+request at a time (as the sequential evaluation loop did) against growing
+concurrency, in requests per second. A second run fails one request in
+ten with 429 to show the cost of retries.
+
+Usage:
+    python -m benchmarks.bench_concurrent_evaluation [requests] [latency_ms]
+"""
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.concurrent_evaluation import ChatCompletionsClient, evaluate_chat_completions
+
+DEFAULT_REQUESTS = 200
+DEFAULT_LATENCY_MS = 50
+CONCURRENCY_LEVELS = (1, 4, 8, 16, 32)
+
+
+class LatencyHandler(BaseHTTPRequestHandler):
+    """
+    Answers 'yes' after the server's latency; every `fail_every`-th request gets a 429.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, delayed ACKs stall kept-alive connections
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        with self.server.lock:
+            self.server.requests += 1
+            fail = self.server.fail_every and self.server.requests % self.server.fail_every == 0
+        time.sleep(self.server.latency)
+        if fail:
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        payload = json.dumps({'choices': [{'message': {'role': 'assistant', 'content': 'yes'}}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REQUESTS
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_LATENCY_MS
+    server = ThreadingHTTPServer(('127.0.0.1', 0), LatencyHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.latency = latency_ms / 1000
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}/v1'
+    test_data = [{'messages': [{'role': 'system', 'content': 'system'},
+                               {'role': 'user', 'content': f'scenario {index}'},
+                               {'role': 'assistant', 'content': 'yes'}]} for index in range(requests)]
+    print(f"{requests} requests, {latency_ms:.0f} ms latency")
+    try:
+        for fail_every in (0, 10):
+            server.fail_every = fail_every
+            for concurrency in CONCURRENCY_LEVELS:
+                server.requests = 0
+                client = ChatCompletionsClient('model', 'key', base_url=base_url, backoff_base=0.01)
+                stats = evaluate_chat_completions(test_data, client, concurrency=concurrency)[2]
+                name = f"concurrency {concurrency}" + (f", 429 every {fail_every}" if fail_every else "")
+                print(f"{name:30s} {stats['requests_per_second']:8.1f} requests/s, "
+                      f"{stats['retries']:3d} retries, {stats['errors']} errors")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
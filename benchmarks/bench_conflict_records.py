@@ -0,0 +1,62 @@
+# benchmarks/bench_conflict_records.py
+
+"""
+Benchmark of `detect_conflicts` returning conflict dictionaries versus lazy
+ConflictRecord objects, for the dataset generation use case where only the
+number of conflicts is read for most scenarios.
+
+Usage:
+    python -m benchmarks.bench_conflict_records
+"""
+
+import json
+import random
+import timeit
+import tracemalloc
+
+from src.conflict_detection import parse_intersection_layout, parse_vehicles, detect_conflicts
+from src.data_generation import generate_vehicle_scenario
+
+VEHICLE_COUNTS = [2, 5, 8, 20]
+NUM_SCENARIOS = 2000
+
+
+def allocated_bytes(function):
+    """
+    Returns the peak memory allocated while running `function` once.
+    """
+    tracemalloc.start()
+    result = function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main():
+    with open('data/intersection_layout.json') as f:
+        intersection_layout = parse_intersection_layout(json.load(f))
+
+    random.seed(0)
+    print(f"{'vehicles':>8} {'dicts':>10} {'records':>10} {'speedup':>8} {'dict mem':>10} {'record mem':>11}")
+    for num_vehicles in VEHICLE_COUNTS:
+        scenarios = [parse_vehicles(generate_vehicle_scenario(num_vehicles, intersection_layout),
+                                    intersection_layout)
+                     for _ in range(NUM_SCENARIOS)]
+
+        def run_dicts():
+            return [detect_conflicts(vehicles) for vehicles in scenarios]
+
+        def run_records():
+            return [detect_conflicts(vehicles, records=True) for vehicles in scenarios]
+
+        dict_time = min(timeit.repeat(run_dicts, number=1, repeat=5))
+        record_time = min(timeit.repeat(run_records, number=1, repeat=5))
+        dict_memory = allocated_bytes(run_dicts)
+        record_memory = allocated_bytes(run_records)
+        print(f"{num_vehicles:>8} {dict_time * 1e3:>8.1f}ms {record_time * 1e3:>8.1f}ms "
+              f"{dict_time / record_time:>7.2f}x {dict_memory / 1024:>8.0f}KiB {record_memory / 1024:>9.0f}KiB")
+
+
+if __name__ == '__main__':
+    main()
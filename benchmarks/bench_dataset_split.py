@@ -0,0 +1,39 @@
+# benchmarks/bench_dataset_split.py
+
+"""
+Benchmark of deduplicating and splitting a CSV dataset with
+`split_dataset`, with an exact hash set and with a Bloom filter, in
+records per second, including reading and writing the CSV files.
+
+Usage:
+    python -m benchmarks.bench_dataset_split
+"""
+
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from src.dataset_split import split_dataset, BloomFilter
+from src.dataset_writer import write_dataset
+
+TOTAL_RECORDS = 20000
+CHUNK_SIZE = 5000
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'dataset.csv')
+        write_dataset(csv_path, TOTAL_RECORDS, num_vehicles=3, fixed_vehicle_count=False, seed=0)
+        for name, seen in (('exact set', None), ('Bloom filter', BloomFilter(TOTAL_RECORDS))):
+            start = time.perf_counter()
+            report = split_dataset(pd.read_csv(csv_path, chunksize=CHUNK_SIZE), os.path.join(directory, 'splits'),
+                                   seen=seen)
+            rate = TOTAL_RECORDS / (time.perf_counter() - start)
+            memory = f", {seen.nbytes / 1024:.0f} KiB" if seen is not None else ""
+            print(f"{name:>12}: {rate:8,.0f} records/s, duplicate rate {report['duplicate_rate']:.2%}{memory}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/bench_finetune_shards.py
+
+"""
+Benchmark of building GPT fine-tuning data from a CSV dataset: the
+in-memory path (read the whole CSV, then write one JSONL file as
+`prepare_chat_jsonl_file` does) against `build_jsonl_shards` for growing
+worker counts, with and without gzip, in records per second and peak
+traced memory of the main process.
+
+Usage:
+    python -m benchmarks.bench_finetune_shards [records]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.conflict_detection import parse_intersection_layout
+from src.data_generation import INTERSECTION_LAYOUT_JSON
+from src.finetune_shards import build_jsonl_shards
+from src.prompt_renderer import render_gpt_conversations
+from src.scenario_generator import generate_scenarios
+
+DEFAULT_RECORDS = 200000
+RECORDS_PER_SHARD = 20000
+WORKER_COUNTS = (1, 2, 4)
+
+
+def build_in_memory(csv_path, output_path):
+    """
+    Reads the whole dataset and writes one JSONL file.
+    """
+    df = pd.read_csv(csv_path)
+    with open(output_path, 'w') as jsonl_file:
+        for conversation in render_gpt_conversations(df, 'system'):
+            jsonl_file.write(json.dumps(conversation) + '\n')
+
+
+def measure(function, *args, **kwargs):
+    """
+    Returns the run time and the peak traced memory (in a second run) of a call.
+    """
+    start = time.perf_counter()
+    function(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    function(*args, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    records = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_RECORDS
+    intersection_layout = parse_intersection_layout(json.loads(INTERSECTION_LAYOUT_JSON))
+    scenarios = generate_scenarios(records, intersection_layout, fixed_vehicle_count=False, rng=0)
+    labels = np.where(np.random.default_rng(0).random(records) < 0.5, 'yes', 'no')
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'dataset.csv')
+        pd.DataFrame({'scenario': [json.dumps(scenario) for scenario in scenarios.to_dicts()],
+                      'is_conflict': labels}).to_csv(csv_path, index=False)
+        del scenarios
+        print(f"{records} records, {os.path.getsize(csv_path) / 2 ** 20:.0f} MiB CSV, {os.cpu_count()} CPUs")
+
+        elapsed, peak = measure(build_in_memory, csv_path, os.path.join(directory, 'train.jsonl'))
+        print(f"{'in memory':22s} {records / elapsed:8.0f} records/s, peak {peak / 2 ** 20:6.0f} MiB")
+        for workers in WORKER_COUNTS:
+            for compress in (False, True):
+                elapsed, peak = measure(build_jsonl_shards, csv_path, os.path.join(directory, 'shards'), 'gpt',
+                                        'system', workers=workers, records_per_shard=RECORDS_PER_SHARD,
+                                        compress=compress)
+                name = f"{workers} workers" + (", gzip" if compress else "")
+                print(f"{name:22s} {records / elapsed:8.0f} records/s, peak {peak / 2 ** 20:6.0f} MiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# benchmarks/bench_incremental.py
+
+"""
+Benchmark of per-update cost of IncrementalConflictDetector compared with
+re-running `detect_conflicts` (with sweep pruning) on the whole vehicle set
+after every position and speed update.
+
+Usage:
+    python -m benchmarks.bench_incremental
+"""
+
+import json
+import random
+import time
+
+from src.conflict_detection import parse_intersection_layout, parse_vehicles, detect_conflicts
+from src.data_generation import generate_vehicle_scenario
+from src.incremental import IncrementalConflictDetector
+
+VEHICLE_COUNTS = [10, 100, 1000, 5000]
+NUM_UPDATES = 2000
+
+
+def main():
+    with open('data/intersection_layout.json') as f:
+        intersection_layout = parse_intersection_layout(json.load(f))
+
+    random.seed(0)
+    print(f"{'vehicles':>8} {'incremental':>14} {'full sweep':>14} {'speedup':>9}")
+    for num_vehicles in VEHICLE_COUNTS:
+        scenario = generate_vehicle_scenario(num_vehicles, intersection_layout)
+        for vehicle_data in scenario['vehicles_scenario']:
+            # Spread arrivals over a few minutes like a busy corridor feed
+            vehicle_data['distance_to_intersection'] *= num_vehicles / 50
+        detector = IncrementalConflictDetector(intersection_layout)
+        for vehicle_data in scenario['vehicles_scenario']:
+            detector.add(vehicle_data)
+        updates = [(random.choice(scenario['vehicles_scenario'])['vehicle_id'],
+                    random.uniform(20, 80), random.uniform(50, 500) * num_vehicles / 50)
+                   for _ in range(NUM_UPDATES)]
+
+        start = time.perf_counter()
+        for vehicle_id, speed, distance in updates:
+            detector.update(vehicle_id, speed=speed, distance_to_intersection=distance)
+        incremental_time = (time.perf_counter() - start) / NUM_UPDATES
+
+        vehicles = parse_vehicles(scenario, intersection_layout)
+        repeats = max(1, NUM_UPDATES // num_vehicles)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            detect_conflicts(vehicles, sweep=True)
+        full_time = (time.perf_counter() - start) / repeats
+
+        print(f"{num_vehicles:>8} {incremental_time * 1e6:>12.1f}us {full_time * 1e6:>12.1f}us "
+              f"{full_time / incremental_time:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
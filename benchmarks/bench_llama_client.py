@@ -0,0 +1,116 @@
+# benchmarks/bench_llama_client.py
+
+"""
+Benchmark of the per-request latency of Yes/No classification requests
+against a local stand-in for the chat completions endpoint, sent one after
+another as `evaluate_model` does. It compares a new connection per request
+with max_tokens 4096 (how `llama32` used `requests.post`) against one
+kept-alive connection with the small classification budget (`LlamaClient`).
+
+The stand-in delays every request by one network round trip plus the
+server time, and every new connection by three more round trips, as TCP
+and a TLS 1.2 handshake take against a remote API. The token budget is
+sent but does not change the stand-in's answer time.
+
+Usage:
+    python -m benchmarks.bench_llama_client [requests] [rtt_ms] [server_ms]
+"""
+
+import json
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.concurrent_evaluation import ChatCompletionsClient
+
+DEFAULT_REQUESTS = 50
+DEFAULT_RTT_MS = 20
+DEFAULT_SERVER_MS = 30
+HANDSHAKE_ROUND_TRIPS = 3
+STOP_TOKENS = ["<|eot_id|>", "<|eom_id|>"]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Answers 'Yes' after the request delay; new connections wait for the handshake first.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, delayed ACKs stall kept-alive connections
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        time.sleep(self.server.handshake)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        time.sleep(self.server.delay)
+        payload = json.dumps({'choices': [{'message': {'role': 'assistant', 'content': 'Yes'}}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def new_connection_request(url, messages):
+    """
+    Sends one request on a new connection, asking for up to 4096 tokens.
+    """
+    body = {"model": "model", "max_tokens": 4096, "temperature": 0.0, "stop": STOP_TOKENS, "messages": messages}
+    request = urllib.request.Request(url, data=json.dumps(body).encode(), headers={
+        "Accept": "application/json", "Content-Type": "application/json", "Authorization": "Bearer key"})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.loads(response.read())['choices'][0]['message']['content']
+
+
+def latencies(send, requests):
+    """
+    Returns the latency of each of `requests` sequential calls of `send`, in milliseconds.
+    """
+    result = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        send()
+        result.append((time.perf_counter() - start) * 1000)
+    return result
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_REQUESTS
+    rtt_ms = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_RTT_MS
+    server_ms = float(sys.argv[3]) if len(sys.argv) > 3 else DEFAULT_SERVER_MS
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    server.handshake = HANDSHAKE_ROUND_TRIPS * rtt_ms / 1000
+    server.delay = (rtt_ms + server_ms) / 1000
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_address[1]}/v1'
+    messages = [{"role": "system", "content": "system"}, {"role": "user", "content": "scenario"}]
+    print(f"{requests} requests, {rtt_ms:.0f} ms round trip, {server_ms:.0f} ms server time")
+    try:
+        results = {'new connection, 4096 tokens': latencies(
+            lambda: new_connection_request(base_url + '/chat/completions', messages), requests)}
+        with ChatCompletionsClient('model', 'key', base_url=base_url) as client:
+            results['kept alive, 3 tokens'] = latencies(
+                lambda: client.complete(messages, max_tokens=3, stop=STOP_TOKENS), requests)
+            connections = client.connections_opened
+        for name, values in results.items():
+            values.sort()
+            print(f"{name:28s} mean {statistics.mean(values):6.1f} ms, median {values[len(values) // 2]:6.1f} ms, "
+                  f"p95 {values[int(len(values) * 0.95) - 1]:6.1f} ms")
+        print(f"kept-alive client opened {connections} connection(s)")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_near_threshold.py
+
+"""
+Benchmark of near-threshold sampling against uniform sampling, reporting
+the share of crossing vehicle pairs whose arrival time difference falls in
+the band around each decision threshold, the number of such pairs per
+1000 scenarios and the sampling speed.
+
+Usage:
+    python -m benchmarks.bench_near_threshold
+"""
+
+import json
+import time
+
+import numpy as np
+
+from src.batch_detection import compute_times_to_intersection
+from src.conflict_detection import parse_intersection_layout
+from src.data_generation import INTERSECTION_LAYOUT_JSON, SAMPLERS
+from src.scenario_generator import DEFAULT_THRESHOLD_BANDS, _PATHS_CROSS
+
+NUM_SCENARIOS = 20000
+VEHICLE_COUNTS = (2, 5, 10)
+
+
+def near_threshold_pairs(scenarios, num_vehicles):
+    """
+    Returns the number of crossing pairs and of those in each threshold's band.
+    """
+    times = compute_times_to_intersection(scenarios.speed, scenarios.distance).reshape(-1, num_vehicles)
+    direction = scenarios.direction.reshape(-1, num_vehicles)
+    movement = scenarios.movement.reshape(-1, num_vehicles)
+    first, second = np.triu_indices(num_vehicles, 1)
+    crossing = _PATHS_CROSS[direction[:, first], movement[:, first], direction[:, second], movement[:, second]]
+    difference = np.abs(times[:, first] - times[:, second])[crossing]
+    return len(difference), {threshold: int(np.sum(np.abs(difference - threshold) <= width))
+                             for threshold, width in DEFAULT_THRESHOLD_BANDS.items()}
+
+
+def main():
+    layout = parse_intersection_layout(json.loads(INTERSECTION_LAYOUT_JSON))
+    bands = ', '.join(f"{threshold:g} s +/- {width:g} s" for threshold, width in DEFAULT_THRESHOLD_BANDS.items())
+    print(f"{NUM_SCENARIOS} scenarios, bands {bands}")
+    for num_vehicles in VEHICLE_COUNTS:
+        for name, sample in SAMPLERS.items():
+            start = time.perf_counter()
+            scenarios = sample(NUM_SCENARIOS, layout, num_vehicles, True, 0)
+            elapsed = time.perf_counter() - start
+            crossing, near = near_threshold_pairs(scenarios, num_vehicles)
+            shares = ', '.join(f"{threshold:g} s: {count / max(crossing, 1):5.1%} "
+                               f"({count * 1000 / NUM_SCENARIOS:6.1f} per 1000)"
+                               for threshold, count in near.items())
+            print(f"{num_vehicles:3d} vehicles {name:>14}: {NUM_SCENARIOS / elapsed:9.0f} scenarios/s, {shares}")
+
+
+if __name__ == '__main__':
+    main()
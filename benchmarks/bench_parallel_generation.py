@@ -0,0 +1,32 @@
+# benchmarks/bench_parallel_generation.py
+
+"""
+Benchmark of `generate_dataset` throughput with 1, 2, 4 and 8 worker
+processes. Speedups are bounded by the number of CPU cores available.
+
+Usage:
+    python -m benchmarks.bench_parallel_generation
+"""
+
+import os
+import time
+
+from src.data_generation import generate_dataset
+
+TOTAL_RECORDS = 40000
+WORKER_COUNTS = (1, 2, 4, 8)
+
+
+def main():
+    print(f"{TOTAL_RECORDS} records, {os.cpu_count()} CPU cores")
+    base_rate = None
+    for workers in WORKER_COUNTS:
+        start = time.perf_counter()
+        generate_dataset(TOTAL_RECORDS, num_vehicles=5, fixed_vehicle_count=False, workers=workers, seed=0)
+        rate = TOTAL_RECORDS / (time.perf_counter() - start)
+        base_rate = base_rate or rate
+        print(f"workers={workers}: {rate:10,.0f} records/s ({rate / base_rate:.2f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+# benchmarks/bench_prompt_renderer.py
+
+"""
+Benchmark of rendering GPT user prompts for a dataset: the per-row code the
+fine-tuning scripts used before (`iterrows`, `json.loads` and an f-string
+per vehicle) against `render_user_prompts` on the DataFrame of JSON strings
+and on the columnar GeneratedScenarios, in rows per second.
+
+Usage:
+    python -m benchmarks.bench_prompt_renderer [rows]
+"""
+
+import json
+import sys
+import time
+
+import pandas as pd
+
+from src.conflict_detection import parse_intersection_layout
+from src.data_generation import INTERSECTION_LAYOUT_JSON
+from src.prompt_renderer import render_user_prompts
+from src.scenario_generator import generate_scenarios
+
+DEFAULT_ROWS = 100000
+NUM_VEHICLES = 5
+
+
+def render_per_row(df):
+    """
+    Renders the GPT user prompts row by row, as `prepare_data` did.
+    """
+    prompts = []
+    for _, row in df.iterrows():
+        vehicles = json.loads(row['scenario']).get("vehicles_scenario", [])
+        scenario_string = " ".join(
+            f"Vehicle {vehicle.get('vehicle_id', 'Unknown')} is in lane {vehicle.get('lane', 'Unknown')}, "
+            f"moving {vehicle.get('direction', 'Unknown')} at a speed of {vehicle.get('speed', 'Unknown'):.2f} "
+            f"km/h, and is {vehicle.get('distance_to_intersection', 'Unknown'):.2f} meters away from the "
+            f"intersection, heading towards {vehicle.get('destination', 'Unknown')}."
+            for vehicle in vehicles
+        )
+        prompts.append("Analyze the following scenario and determine if there is a conflict "
+                       f"(Respond only with 'yes' or 'no'): {scenario_string}")
+    return prompts
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    intersection_layout = parse_intersection_layout(json.loads(INTERSECTION_LAYOUT_JSON))
+    scenarios = generate_scenarios(rows, intersection_layout, num_vehicles=NUM_VEHICLES, fixed_vehicle_count=False,
+                                   rng=0)
+    df = pd.DataFrame({'scenario': [json.dumps(scenario) for scenario in scenarios.to_dicts()]})
+    print(f"{rows} rows, 2 to {NUM_VEHICLES} vehicles")
+
+    legacy, per_row = timed(render_per_row, df)
+    batch, from_json = timed(render_user_prompts, df, 'gpt')
+    columnar, from_columns = timed(render_user_prompts, scenarios, 'gpt')
+    assert batch == legacy and columnar == legacy
+    for name, elapsed in (('per row (iterrows)', per_row), ('batch, JSON strings', from_json),
+                          ('batch, columnar', from_columns)):
+        print(f"{name:20s} {elapsed:7.2f} s {rows / elapsed:9.0f} rows/s ({per_row / elapsed:5.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
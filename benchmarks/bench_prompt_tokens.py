@@ -0,0 +1,91 @@
+# benchmarks/bench_prompt_tokens.py
+
+"""
+Benchmark of the size of GPT fine-tuning examples for each scenario style
+and system instruction: bytes of the JSONL line and tokens of the messages
+per example, with the share saved against the original 'gpt' wording and
+system instruction. Tokens are counted with tiktoken's cl100k_base encoding
+when it is installed, and otherwise approximated offline by splitting text
+the way BPE pre-tokenizers do (one token per word, number group of up to
+three digits or punctuation run, and one more per 8 letters of long words).
+
+Usage:
+    python -m benchmarks.bench_prompt_tokens [examples]
+"""
+
+import json
+import re
+import sys
+import time
+
+from src.conflict_detection import parse_intersection_layout
+from src.data_generation import INTERSECTION_LAYOUT_JSON, generate_dataset
+from src.prompt_renderer import compact_system_instruction, render_gpt_conversations
+
+DEFAULT_EXAMPLES = 2000
+NUM_VEHICLES = 5
+
+# System instruction of run_fine_tuning.py
+LONG_SYSTEM_INSTRUCTION = """
+You are an Urban Intersection Traffic Conflict Detector, responsible for monitoring a four-way intersection with traffic coming from the north, east, south, and west. Each direction has two lanes guiding vehicles to different destinations:
+
+- North: Lane 1 directs vehicles to F and H, Lane 2 directs vehicles to E, D, and C.
+- East: Lane 3 leads to H and B, Lane 4 leads to G, E, and F.
+- South: Lane 5 directs vehicles to B and D, Lane 6 directs vehicles to A, G, and H.
+- West: Lane 7 directs vehicles to D and F, Lane 8 directs vehicles to B, C, and A.
+
+Analyze the traffic data from all directions and lanes, and determine if there is a potential conflict between vehicles at the intersection. Respond only with 'yes' or 'no'.
+"""
+
+_PRE_TOKEN = re.compile(r"'(?:s|t|re|ve|m|ll|d)| ?[A-Za-z]+| ?\d{1,3}| ?[^\sA-Za-z\d]+|\s+")
+
+
+def approximate_token_count(text):
+    """
+    Approximates the number of BPE tokens of a text.
+    """
+    return sum(1 + len(piece) // 8 if piece[-1:].isalpha() else 1 for piece in _PRE_TOKEN.findall(text))
+
+
+def token_counter():
+    """
+    Returns the token counting function and its name.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return approximate_token_count, "approximate BPE"
+    encoding = tiktoken.get_encoding('cl100k_base')
+    return lambda text: len(encoding.encode(text)), "tiktoken cl100k_base"
+
+
+def main():
+    examples = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_EXAMPLES
+    count_tokens, tokenizer = token_counter()
+    records = generate_dataset(examples, num_vehicles=NUM_VEHICLES, fixed_vehicle_count=False, seed=0)
+    compact_instruction = compact_system_instruction(parse_intersection_layout(json.loads(INTERSECTION_LAYOUT_JSON)))
+    encodings = (
+        ('gpt, long system', 'gpt', LONG_SYSTEM_INSTRUCTION),
+        ('compact, long system', 'compact', LONG_SYSTEM_INSTRUCTION),
+        ('gpt, compact system', 'gpt', compact_instruction),
+        ('compact, compact system', 'compact', compact_instruction),
+        ('eta, compact system', 'eta', compact_instruction),
+    )
+    print(f"{examples} examples of 2 to {NUM_VEHICLES} vehicles, tokens by {tokenizer}")
+    print(f"{'encoding':24s} {'bytes':>7s} {'tokens':>7s} {'user':>6s} {'saved':>6s} {'render':>12s}")
+    baseline = None
+    for name, style, instruction in encodings:
+        start = time.perf_counter()
+        conversations = render_gpt_conversations(records, instruction, style)
+        elapsed = time.perf_counter() - start
+        line_bytes = sum(len(json.dumps(conversation).encode()) + 1 for conversation in conversations) / examples
+        user_tokens = sum(count_tokens(conversation['messages'][1]['content'])
+                          for conversation in conversations) / examples
+        tokens = user_tokens + count_tokens(instruction) + 1
+        baseline = baseline or tokens
+        print(f"{name:24s} {line_bytes:7.0f} {tokens:7.0f} {user_tokens:6.0f} {1 - tokens / baseline:6.0%} "
+              f"{examples / elapsed:8.0f} ex/s")
+
+
+if __name__ == '__main__':
+    main()
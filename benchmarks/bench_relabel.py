@@ -0,0 +1,68 @@
+# benchmarks/bench_relabel.py
+
+"""
+Benchmark of relabeling a dataset with `relabel_records` against running
+the rule engine on every scenario (`parse_vehicles`, `detect_conflicts` and
+`build_record` per row), in records per second, and of `relabel_dataset`
+end to end on a CSV file for growing worker counts.
+
+Usage:
+    python -m benchmarks.bench_relabel
+"""
+
+import json
+import os
+import tempfile
+import time
+
+from src.conflict_detection import parse_intersection_layout, parse_vehicles, detect_conflicts
+from src.data_generation import INTERSECTION_LAYOUT_JSON, generate_dataset, build_record
+from src.dataset_writer import ChunkWriter
+from src.relabel import relabel_dataset, relabel_records
+
+TOTAL_RECORDS = 20000
+VEHICLE_COUNTS = (3, 5, 10)
+WORKER_COUNTS = (1, 2, 4)
+
+
+def relabel_per_row(records, intersection_layout):
+    """
+    Relabels every record with the full rule engine.
+    """
+    relabeled = []
+    for scenario in records['scenario']:
+        scenario = json.loads(scenario)
+        vehicles = parse_vehicles(scenario, intersection_layout)
+        relabeled.append(build_record(scenario, vehicles, detect_conflicts(vehicles, records=True)))
+    return relabeled
+
+
+def main():
+    intersection_layout = parse_intersection_layout(json.loads(INTERSECTION_LAYOUT_JSON))
+    print(f"{TOTAL_RECORDS} records, balanced")
+    for num_vehicles in VEHICLE_COUNTS:
+        records = generate_dataset(TOTAL_RECORDS, num_vehicles=num_vehicles, fixed_vehicle_count=False, seed=0)
+        start = time.perf_counter()
+        relabel_per_row(records, intersection_layout)
+        per_row = TOTAL_RECORDS / (time.perf_counter() - start)
+        start = time.perf_counter()
+        relabel_records(records, intersection_layout)
+        screened = TOTAL_RECORDS / (time.perf_counter() - start)
+        print(f"up to {num_vehicles:2d} vehicles: per row {per_row:8.0f} records/s, "
+              f"screened {screened:8.0f} records/s ({screened / per_row:.2f}x)")
+
+    records = generate_dataset(TOTAL_RECORDS, seed=0)
+    with tempfile.TemporaryDirectory() as directory:
+        input_path = os.path.join(directory, 'dataset.csv')
+        with ChunkWriter(input_path) as writer:
+            writer.write(records)
+        print(f"relabel_dataset on a {os.path.getsize(input_path) / 2 ** 20:.1f} MiB CSV ({os.cpu_count()} CPUs)")
+        for workers in WORKER_COUNTS:
+            report = relabel_dataset(input_path, os.path.join(directory, 'relabeled.csv'), workers=workers,
+                                     chunk_size=2000)
+            print(f"{workers} workers: {report['records_per_second']:8.0f} records/s, "
+                  f"{report['changed_records']} records changed")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/bench_scenario_generator.py
+
+"""
+Benchmark of generating scenarios with `generate_scenarios` against a
+`generate_vehicle_scenario` loop, in vehicles per second, for the columnar
+arrays alone and for the exported scenario dicts.
+
+Usage:
+    python -m benchmarks.bench_scenario_generator
+"""
+
+import json
+import random
+import time
+
+import numpy as np
+
+from src.conflict_detection import parse_intersection_layout
+from src.data_generation import generate_vehicle_scenario
+from src.scenario_generator import generate_scenarios
+
+NUM_SCENARIOS = 200000
+NUM_LOOP_SCENARIOS = 20000
+NUM_VEHICLES = 5
+
+
+def main():
+    with open('data/intersection_layout.json') as f:
+        intersection_layout = parse_intersection_layout(json.load(f))
+    random.seed(0)
+    rng = np.random.default_rng(0)
+
+    start = time.perf_counter()
+    loop_vehicles = 0
+    for _ in range(NUM_LOOP_SCENARIOS):
+        scenario = generate_vehicle_scenario(NUM_VEHICLES, intersection_layout, fixed_vehicle_count=False)
+        loop_vehicles += len(scenario['vehicles_scenario'])
+    loop_rate = loop_vehicles / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    scenarios = generate_scenarios(NUM_SCENARIOS, intersection_layout, NUM_VEHICLES,
+                                   fixed_vehicle_count=False, rng=rng)
+    array_rate = scenarios.num_vehicles / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    scenarios.to_dicts()
+    export_rate = scenarios.num_vehicles / (time.perf_counter() - start)
+
+    print(f"{NUM_SCENARIOS} scenarios, {scenarios.num_vehicles} vehicles")
+    print(f"generate_vehicle_scenario loop: {loop_rate:12,.0f} vehicles/s")
+    print(f"generate_scenarios (arrays):    {array_rate:12,.0f} vehicles/s ({array_rate / loop_rate:.0f}x)")
+    print(f"to_dicts export:                {export_rate:12,.0f} vehicles/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+# benchmarks/bench_stratified_generation.py
+
+"""
+Benchmark of `generate_dataset` with rejection balancing against stratified
+balancing, reporting run time, the number of scenarios that went through
+`detect_conflicts` and the acceptance rate for growing vehicle counts.
+
+Usage:
+    python -m benchmarks.bench_stratified_generation
+"""
+
+import time
+
+from src.data_generation import generate_dataset
+
+TOTAL_RECORDS = 4000
+VEHICLE_COUNTS = (2, 5, 8, 10, 12, 20)
+# Rejection balancing needs ever more scenarios per conflict-free record beyond this
+MAX_REJECT_VEHICLES = 10
+
+
+def run(num_vehicles, balance):
+    start = time.perf_counter()
+    dataset = generate_dataset(TOTAL_RECORDS, num_vehicles=num_vehicles, seed=0, balance=balance)
+    elapsed = time.perf_counter() - start
+    stats = dataset.attrs['generation_stats']
+    print(f"{num_vehicles:3d} vehicles {balance:>10}: {elapsed:7.2f}s, "
+          f"{stats['evaluated']:7d} evaluated, acceptance rate {stats['acceptance_rate']:6.1%}")
+
+
+def main():
+    print(f"{TOTAL_RECORDS} records, fixed vehicle count")
+    for num_vehicles in VEHICLE_COUNTS:
+        if num_vehicles <= MAX_REJECT_VEHICLES:
+            run(num_vehicles, 'reject')
+        run(num_vehicles, 'stratified')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,46 @@
+# benchmarks/bench_streaming_writer.py
+
+"""
+Benchmark of the peak Python memory of writing a dataset with
+`generate_dataset` followed by `to_csv` against streaming it with
+`write_dataset`, for growing dataset sizes.
+
+Usage:
+    python -m benchmarks.bench_streaming_writer
+"""
+
+import os
+import tempfile
+import time
+import tracemalloc
+
+from src.data_generation import generate_dataset
+from src.dataset_writer import write_dataset
+
+RECORD_COUNTS = (10000, 40000, 80000)
+CHUNK_SIZE = 5000
+
+
+def measure(function):
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'dataset.csv')
+        for total_records in RECORD_COUNTS:
+            in_memory = measure(lambda: generate_dataset(total_records, seed=0, chunk_size=CHUNK_SIZE)
+                                .to_csv(path, index=False))
+            streamed = measure(lambda: write_dataset(path, total_records, seed=0, chunk_size=CHUNK_SIZE))
+            print(f"{total_records:7d} records: in memory {in_memory[1]:7.1f} MiB peak ({in_memory[0]:.1f}s), "
+                  f"streamed {streamed[1]:6.1f} MiB peak ({streamed[0]:.1f}s)")
+
+
+if __name__ == '__main__':
+    main()
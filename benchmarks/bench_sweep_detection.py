@@ -0,0 +1,55 @@
+# benchmarks/bench_sweep_detection.py
+
+"""
+Scaling benchmark of `detect_conflicts` with and without sweep-line pair
+pruning, showing where the sweep starts to pay off.
+
+Usage:
+    python -m benchmarks.bench_sweep_detection
+"""
+
+import json
+import random
+import timeit
+
+from src.conflict_detection import parse_intersection_layout, parse_vehicles, detect_conflicts
+from src.data_generation import generate_vehicle_scenario
+
+VEHICLE_COUNTS = [2, 3, 5, 8, 12, 20, 50, 100, 200, 500, 1000, 2000]
+
+
+def best_time(function, min_duration=0.2):
+    """
+    Returns the best per-call time of `function` over a few timing runs.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    number = max(1, int(number * min_duration / 0.2))
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main():
+    with open('data/intersection_layout.json') as f:
+        intersection_layout = parse_intersection_layout(json.load(f))
+
+    random.seed(0)
+    crossover = None
+    print(f"{'vehicles':>8} {'pairwise':>12} {'sweep':>12} {'speedup':>8}")
+    for num_vehicles in VEHICLE_COUNTS:
+        scenario = generate_vehicle_scenario(num_vehicles, intersection_layout)
+        vehicles = parse_vehicles(scenario, intersection_layout)
+        assert detect_conflicts(vehicles, sweep=True) == detect_conflicts(vehicles)
+
+        pairwise_time = best_time(lambda: detect_conflicts(vehicles))
+        sweep_time = best_time(lambda: detect_conflicts(vehicles, sweep=True))
+        speedup = pairwise_time / sweep_time
+        if crossover is None and speedup > 1:
+            crossover = num_vehicles
+        print(f"{num_vehicles:>8} {pairwise_time * 1e3:>10.3f}ms {sweep_time * 1e3:>10.3f}ms {speedup:>7.2f}x")
+
+    print(f"Sweep is faster from {crossover} vehicles per scenario" if crossover
+          else "Sweep was not faster for any tested size")
+
+
+if __name__ == '__main__':
+    main()
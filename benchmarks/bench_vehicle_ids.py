@@ -0,0 +1,56 @@
+# benchmarks/bench_vehicle_ids.py
+
+"""
+Benchmark of vehicle ID allocation for growing scenario sizes: the retry
+loop of `generate_vehicle_scenario`, the default draw of
+`generate_scenarios` ('V1000' to 'V9999') and the permuted counter of a
+VehicleIdNamespace, in microseconds per vehicle.
+
+Usage:
+    python -m benchmarks.bench_vehicle_ids
+"""
+
+import json
+import random
+import time
+
+import numpy as np
+
+from src.conflict_detection import parse_intersection_layout
+from src.data_generation import generate_vehicle_scenario
+from src.scenario_generator import VehicleIdNamespace, _vehicle_numbers
+
+SCENARIO_SIZES = (100, 1000, 5000, 8999, 100000, 1000000)
+# The default IDs run out above this size
+MAX_DEFAULT_SIZE = 9000
+NAMESPACE = VehicleIdNamespace('V', size=2 ** 32)
+
+
+def per_vehicle(function, size):
+    """
+    Returns the run time of `function` in microseconds per vehicle.
+    """
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) / size * 1e6
+
+
+def main():
+    with open('data/intersection_layout.json') as f:
+        intersection_layout = parse_intersection_layout(json.load(f))
+    random.seed(0)
+    rng = np.random.default_rng(0)
+    print("   vehicles   scenario loop   default IDs   namespace IDs   (us per vehicle)")
+    for size in SCENARIO_SIZES:
+        sizes = np.array([size])
+        counter = per_vehicle(lambda: NAMESPACE.allocate(rng, sizes), size)
+        if size <= MAX_DEFAULT_SIZE:
+            loop = per_vehicle(lambda: generate_vehicle_scenario(size, intersection_layout), size)
+            default = per_vehicle(lambda: _vehicle_numbers(rng, sizes), size)
+            print(f"{size:11d} {loop:15.3f} {default:13.3f} {counter:15.3f}")
+        else:
+            print(f"{size:11d} {'-':>15} {'-':>13} {counter:15.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+# benchmarks/bench_vehicle_memory.py
+
+"""
+Memory benchmark of lists of Vehicle objects against a columnar VehicleBatch.
+
+Usage:
+    python -m benchmarks.bench_vehicle_memory [num_scenarios] [num_vehicles]
+"""
+
+import gc
+import json
+import random
+import sys
+import tracemalloc
+
+from src.conflict_detection import parse_intersection_layout, parse_vehicles
+from src.data_generation import generate_vehicle_scenario
+from src.vehicle_batch import VehicleBatch
+
+
+def measure(build):
+    """
+    Returns the object built by `build` and the memory it retains in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained
+
+
+def main():
+    num_scenarios = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    num_vehicles = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    with open('data/intersection_layout.json') as f:
+        intersection_layout = parse_intersection_layout(json.load(f))
+
+    random.seed(0)
+    # Serialize and reload so that no vehicle field is shared with the generator's objects
+    scenarios_json = json.dumps([generate_vehicle_scenario(num_vehicles, intersection_layout)
+                                 for _ in range(num_scenarios)])
+    total_vehicles = num_scenarios * num_vehicles
+
+    scenarios = json.loads(scenarios_json)
+    vehicle_lists, list_bytes = measure(
+        lambda: [parse_vehicles(scenario, intersection_layout) for scenario in scenarios])
+    del vehicle_lists
+
+    scenarios = json.loads(scenarios_json)
+    batch, batch_bytes = measure(lambda: VehicleBatch.from_scenarios(scenarios, intersection_layout))
+
+    print(f"{total_vehicles} vehicles")
+    print(f"list of Vehicle: {list_bytes / total_vehicles:7.1f} bytes/vehicle")
+    print(f"VehicleBatch:    {batch_bytes / total_vehicles:7.1f} bytes/vehicle "
+          f"({list_bytes / batch_bytes:.1f}x smaller, columns {batch.nbytes / total_vehicles:.1f} bytes/vehicle)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# build_finetune_shards.py
+
+import argparse
+import json
+
+from src.finetune_shards import build_jsonl_shards, MODELS, DEFAULT_RECORDS_PER_SHARD, DEFAULT_COMPRESSION_LEVEL
+from src.conflict_detection import parse_intersection_layout
+from src.data_generation import INTERSECTION_LAYOUT_JSON
+from src.prompt_renderer import STYLES, TABLE_STYLES, compact_system_instruction
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Build GPT or Llama fine-tuning JSONL shards with a manifest from a large dataset.")
+    parser.add_argument('input', help="Dataset CSV or JSON Lines file, or columnar dataset directory")
+    parser.add_argument('output', help="Directory of the shards and manifest.json")
+    parser.add_argument('--model', choices=MODELS, required=True, help="Fine-tuning format")
+    parser.add_argument('--system-file',
+                        help="Text file with the system instruction (GPT) or system prompt (Llama); "
+                             "optional for the compact and eta styles")
+    parser.add_argument('--style', choices=STYLES,
+                        help="Scenario text style (default: the style of the model); "
+                             "'compact' and 'eta' take fewer tokens")
+    parser.add_argument('--workers', type=int, default=1, help="Number of worker processes")
+    parser.add_argument('--records-per-shard', type=int, default=DEFAULT_RECORDS_PER_SHARD,
+                        help="Records per shard")
+    parser.add_argument('--gzip', action='store_true', help="Compress the shards with gzip")
+    parser.add_argument('--compression-level', type=int, default=DEFAULT_COMPRESSION_LEVEL,
+                        help="gzip compression level (1-9)")
+    args = parser.parse_args()
+
+    if args.system_file:
+        with open(args.system_file, encoding='utf-8') as f:
+            instruction = f.read()
+    elif args.style in TABLE_STYLES:
+        instruction = compact_system_instruction(parse_intersection_layout(json.loads(INTERSECTION_LAYOUT_JSON)))
+    else:
+        parser.error("--system-file is required unless --style is compact or eta")
+    report = build_jsonl_shards(
+        args.input,
+        args.output,
+        args.model,
+        instruction,
+        workers=args.workers,
+        records_per_shard=args.records_per_shard,
+        compress=args.gzip,
+        compression_level=args.compression_level,
+        style=args.style,
+    )
+
+    print(f"Wrote {report['records']} records to {len(report['shards'])} shards in {args.output} "
+          f"in {report['elapsed']:.1f}s ({report['records_per_second']:.0f} records/s)")
+    print(json.dumps({key: report[key] for key in ('model', 'style', 'compressed', 'records')}, indent=2))
+
+if __name__ == '__main__':
+    main()
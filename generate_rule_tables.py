@@ -0,0 +1,16 @@
+# generate_rule_tables.py
+
+from src.reference_rules import build_rule_tables, render_rule_tables_module
+
+def main():
+    # Rebuild the lookup tables from the reference rule functions
+    source = render_rule_tables_module(build_rule_tables())
+
+    # The tree uses CRLF line endings
+    with open('src/rule_tables.py', 'w', newline='\r\n') as f:
+        f.write(source)
+
+    print("Rule tables generated and saved to 'src/rule_tables.py'")
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,7 @@ Initialization file for the gpt_finetuning package.
 from .prepare_data import (
     parse_scenario_to_string,
     prepare_chat_jsonl_file,
+    prepare_chat_jsonl_shards,
     prepare_test_data_for_gpt
 )
 
@@ -9,70 +9,51 @@ Author: Your Name
 Date: YYYY-MM-DD
 """
 
-import openai
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from src.concurrent_evaluation import (
+    ChatCompletionsClient,
+    TokenBucket,
+    evaluate_chat_completions,
+    DEFAULT_BASE_URL,
+    DEFAULT_CONCURRENCY,
+    ERROR_LABEL,
+)
 
-def predict_and_evaluate(test_data, fine_tuned_model_id, openai_api_key):
+
+def predict_and_evaluate(test_data, fine_tuned_model_id, openai_api_key, concurrency=DEFAULT_CONCURRENCY,
+                         requests_per_second=None, base_url=DEFAULT_BASE_URL, progress_every=100):
     """
     Predicts and evaluates the fine-tuned GPT model on the test dataset.
 
+    Requests run concurrently, optionally under a rate limit, and rate-limited
+    (429) or failed (5xx) requests are retried with exponential backoff.
+    Predictions keep the order of the test data.
+
     Parameters:
     - test_data: List of dictionaries containing test scenarios in GPT's chat format.
     - fine_tuned_model_id: The ID of the fine-tuned GPT model.
     - openai_api_key: Your OpenAI API key.
+    - concurrency: Number of requests in flight.
+    - requests_per_second: Request rate limit (None for no limit).
+    - base_url: Root of the OpenAI-compatible API.
+    - progress_every: Print the ongoing accuracy after this many predictions (0 for never).
 
     Returns:
     - y_true: List of true labels (from the dataset).
-    - y_pred: List of predicted labels (from the model).
+    - y_pred: List of predicted labels (from the model); 'error' where a request failed after all retries.
     """
-    openai.api_key = openai_api_key
-
-    y_true = []
-    y_pred = []
-    correct_predictions = 0
-    count = 0
-
-    # Loop through each test example
-    for item in test_data:
-        # Retrieve system instructions and user message
-        system_message = item['messages'][0]['content']  # System instruction
-        user_message = item['messages'][1]['content']    # Traffic scenario
-        true_label = item['messages'][2]['content'].strip()  # True label ('yes' or 'no')
-
-        # Get the fine-tuned model's prediction
-        response = openai.ChatCompletion.create(
-            model=fine_tuned_model_id,
-            messages=[
-                {"role": "system", "content": system_message},  # Custom instruction
-                {"role": "user", "content": user_message}       # Scenario prompt
-            ],
-            max_tokens=5,
-            temperature=0.0
-        )
-
-        # Extract the predicted label from the model's response
-        predicted_label = response.choices[0].message.content.strip().lower()
-
-        # Append true and predicted labels to the lists
-        y_true.append(true_label)
-        y_pred.append(predicted_label)
-
-        # Check if the prediction matches the true label
-        if predicted_label == true_label:
-            correct_predictions += 1
-
-        # Increment the count
-        count += 1
-
-        # Calculate ongoing accuracy
-        ongoing_accuracy = correct_predictions / count
-
-        # Print the current prediction and ongoing accuracy
-        print(f"Scenario {count}/{len(test_data)}, True: {true_label}, Predicted: {predicted_label}, Ongoing Accuracy: {ongoing_accuracy * 100:.2f}%")
-
+    rate_limiter = TokenBucket(requests_per_second) if requests_per_second else None
+    with ChatCompletionsClient(fine_tuned_model_id, openai_api_key, base_url=base_url,
+                               rate_limiter=rate_limiter) as client:
+        y_true, y_pred, stats = evaluate_chat_completions(test_data, client, concurrency=concurrency, max_tokens=5,
+                                                          progress_every=progress_every)
+
+    print(f"Evaluated {stats['requests']} scenarios in {stats['elapsed']:.1f}s "
+          f"({stats['requests_per_second']:.1f} requests/s), Accuracy: {stats['accuracy'] * 100:.2f}%, "
+          f"Retries: {stats['retries']}, Errors: {stats['errors']}")
     return y_true, y_pred
 
 
@@ -80,13 +61,21 @@ def generate_evaluation_report(y_true, y_pred):
     """
     Generates and displays evaluation metrics including classification report and confusion matrix.
 
+    Failed requests ('error' predictions) are counted separately; the per-class metrics cover
+    'yes' and 'no' only, and the accuracy counts failed requests as wrong.
+
     Parameters:
     - y_true: List of true labels.
     - y_pred: List of predicted labels.
     """
+    errors = sum(prediction == ERROR_LABEL for prediction in y_pred)
+    if errors:
+        print(f"Failed Requests: {errors} of {len(y_pred)}")
+
     # Generate classification report
     print("Classification Report:")
-    print(classification_report(y_true, y_pred, target_names=['Conflict: Yes', 'Conflict: No']))
+    print(classification_report(y_true, y_pred, labels=['yes', 'no'], target_names=['Conflict: Yes', 'Conflict: No'],
+                                zero_division=0))
 
     # Generate confusion matrix
     conf_matrix = confusion_matrix(y_true, y_pred, labels=['yes', 'no'])
@@ -11,7 +11,9 @@ Date: YYYY-MM-DD
 """
 
 import json
-import pandas as pd
+
+from src.finetune_shards import build_jsonl_shards
+from src.prompt_renderer import render_scenarios, render_gpt_conversations
 
 
 def parse_scenario_to_string(scenario_string):
@@ -24,28 +26,10 @@ def parse_scenario_to_string(scenario_string):
     Returns:
         str: Formatted text description of the scenario.
     """
-    scenario_data = json.loads(scenario_string)
-    vehicles = scenario_data.get("vehicles_scenario", [])
-    scenario_description = []
-
-    for vehicle in vehicles:
-        vehicle_id = vehicle.get("vehicle_id", "Unknown")
-        lane = vehicle.get("lane", "Unknown")
-        speed = vehicle.get("speed", "Unknown")
-        distance = vehicle.get("distance_to_intersection", "Unknown")
-        direction = vehicle.get("direction", "Unknown")
-        destination = vehicle.get("destination", "Unknown")
-
-        vehicle_description = (f"Vehicle {vehicle_id} is in lane {lane}, moving {direction} at a speed of "
-                               f"{speed:.2f} km/h, and is {distance:.2f} meters away from the intersection, "
-                               f"heading towards {destination}.")
-        scenario_description.append(vehicle_description)
+    return render_scenarios([scenario_string], 'gpt')[0]
 
-    readable_string = " ".join(scenario_description)
-    return readable_string
 
-
-def prepare_chat_jsonl_file(df, file_path, system_instruction):
+def prepare_chat_jsonl_file(df, file_path, system_instruction, style=None):
     """
     Converts the DataFrame to a JSONL file format for GPT fine-tuning in chat format.
 
@@ -53,51 +37,42 @@ def prepare_chat_jsonl_file(df, file_path, system_instruction):
     - df: DataFrame containing the dataset.
     - file_path: Path to the output JSONL file.
     - system_instruction: Custom instruction for the system message.
+    - style: Scenario text style of src.prompt_renderer (default: 'gpt'); evaluate with the same style.
     """
     with open(file_path, 'w') as jsonl_file:
-        for index, row in df.iterrows():
-            # Convert the scenario to a human-readable string
-            scenario_string = parse_scenario_to_string(row['scenario'])
-
-            # Prepare the conversation with system, user, and assistant messages
-            conversation = {
-                "messages": [
-                    {"role": "system", "content": system_instruction},
-                    {"role": "user", "content": f"Analyze the following scenario and determine if there is a conflict (Respond only with 'yes' or 'no'): {scenario_string}"},
-                    {"role": "assistant", "content": row['is_conflict'].strip().lower()}  # Ensure it's either 'yes' or 'no'
-                ]
-            }
-
+        # Scenarios and prompts are rendered for the whole DataFrame at once
+        for conversation in render_gpt_conversations(df, system_instruction, style):
             # Write the JSON object as a new line in the JSONL file
             jsonl_file.write(json.dumps(conversation) + '\n')
 
 
-def prepare_test_data_for_gpt(df, system_instruction):
+def prepare_chat_jsonl_shards(source, output_directory, system_instruction, **options):
     """
-    Prepares test data for GPT in chat format with system, user, and assistant roles.
+    Writes the lines of prepare_chat_jsonl_file as JSONL shards with a manifest, for datasets too large for memory.
 
     Parameters:
-    - df: DataFrame containing the test data.
-    - system_instruction: Instruction for the system message.
+    - source: Dataset CSV or JSON Lines file, columnar dataset directory, or DataFrame.
+    - output_directory: Directory of the shards and manifest.json.
+    - system_instruction: Custom instruction for the system message.
+    - options: workers, records_per_shard, compress, compression_level and style of build_jsonl_shards.
 
     Returns:
-    - List of dictionaries where each dictionary is a chat conversation for GPT.
+    - The manifest of the shards, with the build time.
     """
-    test_data = []
+    return build_jsonl_shards(source, output_directory, 'gpt', system_instruction, **options)
 
-    for _, row in df.iterrows():
-        # Convert the scenario to a human-readable string
-        scenario_string = parse_scenario_to_string(row['scenario'])
 
-        # Create a message conversation with system, user, and assistant
-        conversation = {
-            "messages": [
-                {"role": "system", "content": system_instruction},
-                {"role": "user", "content": f"Analyze the following scenario and determine if there is a conflict (Respond only with 'yes' or 'no'): {scenario_string}"},
-                {"role": "assistant", "content": row['is_conflict'].strip().lower()}  # True label: 'yes' or 'no'
-            ]
-        }
+def prepare_test_data_for_gpt(df, system_instruction, style=None):
+    """
+    Prepares test data for GPT in chat format with system, user, and assistant roles.
 
-        test_data.append(conversation)
+    Parameters:
+    - df: DataFrame containing the test data.
+    - system_instruction: Instruction for the system message.
+    - style: Scenario text style of src.prompt_renderer (default: 'gpt'); use the style the model was
+      fine-tuned with.
 
-    return test_data
+    Returns:
+    - List of dictionaries where each dictionary is a chat conversation for GPT.
+    """
+    return render_gpt_conversations(df, system_instruction, style)
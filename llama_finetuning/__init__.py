@@ -7,6 +7,7 @@ Initialization file for the llama_finetuning package.
 from .prepare_data import (
     parse_scenario_to_string,
     create_finetune_dataset,
+    create_finetune_shards,
     verify_dataset
 )
 
@@ -20,6 +21,8 @@ from .evaluation import (
 )
 
 from .together_utils import (
+    LlamaClient,
+    llama_client,
     llama32,
     load_env,
     disp_image,
@@ -12,16 +12,20 @@ Date: YYYY-MM-DD
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.metrics import classification_report, confusion_matrix
-from .together_utils import llama32
+from src.prompt_renderer import render_user_prompts
+from .together_utils import llama_client
 
 
-def evaluate_model(test_df, prompt):
+def evaluate_model(test_df, prompt, client=None, style=None):
     """
     Evaluates the fine-tuned LLAMA model on the test dataset.
 
     Args:
         test_df (pd.DataFrame): Test dataset.
         prompt (str): The system prompt.
+        client (LlamaClient, optional): Client to send the requests with (default: the shared 11B client).
+        style (str, optional): Scenario text style of `src.prompt_renderer` (default: 'llama'); use the
+            style the model was fine-tuned with.
 
     Returns:
         tuple: Final accuracy, confusion matrix, classification report.
@@ -31,14 +35,16 @@ def evaluate_model(test_df, prompt):
     count = 1
     correct_predictions = 0
     scenario_total_count = len(test_df)
+    client = client or llama_client(11)
 
-    # Loop through the dataset to gather predictions and actual values
-    for index, row in test_df.iterrows():
-        scenario_string = row['scenario']  # 'scenario' column holds the JSON string
-        actual_conflict = row['is_conflict'].strip().lower()  # 'yes' or 'no'
+    # Render all user messages up front, so the loop only waits on the model
+    user_messages = render_user_prompts(test_df, 'llama', style)
+    actual_labels = test_df['is_conflict'].str.strip().str.lower().tolist()  # 'yes' or 'no'
 
+    # Loop through the dataset to gather predictions and actual values
+    for user_message, actual_conflict in zip(user_messages, actual_labels):
         # Detect conflict using LLAMA
-        predicted_conflict = detect_conflicts_llama(scenario_string, prompt).lower()  # 'yes' or 'no'
+        predicted_conflict = classify_user_message(user_message, prompt, client).lower()  # 'yes' or 'no'
 
         # Check if prediction is correct and update the count
         if predicted_conflict == actual_conflict:
@@ -84,20 +90,34 @@ def evaluate_model(test_df, prompt):
     return final_accuracy, cm, report
 
 
-def detect_conflicts_llama(scenario_string, prompt):
+def detect_conflicts_llama(scenario_string, prompt, client=None, style=None):
     """
     Uses the LLAMA model to detect conflicts in a given traffic scenario.
 
     Args:
         scenario_string (str): JSON string of the vehicle scenario.
         prompt (str): The system prompt.
+        client (LlamaClient, optional): Client to send the request with (default: the shared 11B client).
+        style (str, optional): Scenario text style of `src.prompt_renderer` (default: 'llama').
 
     Returns:
         str: 'yes' or 'no' indicating whether there is a conflict.
     """
-    # Convert the scenario into a human-readable format
-    readable_scenario = parse_scenario_to_string(scenario_string)
+    return classify_user_message(render_user_prompts([scenario_string], 'llama', style)[0], prompt, client)
+
+
+def classify_user_message(user_message, prompt, client=None):
+    """
+    Asks the LLAMA model to classify a rendered user message.
+
+    Args:
+        user_message (str): User message from `render_user_prompts`.
+        prompt (str): The system prompt.
+        client (LlamaClient, optional): Client to send the request with (default: the shared 11B client).
 
+    Returns:
+        str: 'yes' or 'no' indicating whether there is a conflict.
+    """
     # Set up the system and user messages to pass to LLAMA
     messages = [
         {
@@ -106,13 +126,9 @@ def detect_conflicts_llama(scenario_string, prompt):
         },
         {
             "role": "user",
-            "content": f"Analyze the following scenario and determine if there is a conflict (Respond only with 'Yes' or 'No'):\n{readable_scenario}"
+            "content": user_message
         }
     ]
 
-    # Get the response from LLAMA
-    response = llama32(messages, model_size=11)
-
-    # Extract the model's output (Yes/No)
-    answer = response.strip()
-    return answer
+    # Get the model's output (Yes/No), with an output budget of a few tokens
+    return (client or llama_client(11)).classify(messages)
@@ -11,7 +11,9 @@ Date: YYYY-MM-DD
 """
 
 import json
-import pandas as pd
+
+from src.finetune_shards import build_jsonl_shards
+from src.prompt_renderer import render_scenarios, render_llama_texts
 
 
 def parse_scenario_to_string(scenario_string):
@@ -24,30 +26,10 @@ def parse_scenario_to_string(scenario_string):
     Returns:
         str: Formatted text description of the scenario.
     """
-    scenario_data = json.loads(scenario_string)
-    vehicles = scenario_data.get("vehicles_scenario", [])
-    scenario_description = []
-
-    for vehicle in vehicles:
-        vehicle_id = vehicle.get("vehicle_id", "Unknown")
-        lane = vehicle.get("lane", "Unknown")
-        speed = vehicle.get("speed", "Unknown")
-        distance = vehicle.get("distance_to_intersection", "Unknown")
-        direction = vehicle.get("direction", "Unknown")
-        destination = vehicle.get("destination", "Unknown")
-
-        vehicle_description = (
-            f"Vehicle {vehicle_id} is in lane {lane}, moving {direction} at a speed of "
-            f"{speed:.2f} km/h, and is {distance:.2f} meters away from the intersection, "
-            f"heading towards {destination}."
-        )
-        scenario_description.append(vehicle_description)
-
-    readable_string = " ".join(scenario_description)
-    return readable_string
-
-
-def create_finetune_dataset(df, output_file, system_prompt, model='llama3'):
+    return render_scenarios([scenario_string], 'llama')[0]
+
+
+def create_finetune_dataset(df, output_file, system_prompt, model='llama3', style=None):
     """
     Creates a fine-tuning dataset in JSONL format suitable for LLAMA models.
 
@@ -56,32 +38,32 @@ def create_finetune_dataset(df, output_file, system_prompt, model='llama3'):
         output_file (str): Path to the output JSONL file.
         system_prompt (str): The system prompt to include.
         model (str): The model version ('llama3' or others).
+        style (str, optional): Scenario text style of `src.prompt_renderer` (default: 'llama');
+            evaluate with the same style.
     """
     with open(output_file, 'w', encoding='utf-8') as f_out:
-        for idx, row in df.iterrows():
-            scenario_string = row['scenario']
-            is_conflict = row['is_conflict'].strip()
-
-            readable_scenario = parse_scenario_to_string(scenario_string)
-
-            # Prepare the user input
-            user_input = (
-                "Analyze the following scenario and determine if there is a conflict "
-                f"(Respond only with 'Yes' or 'No'):\n{readable_scenario}"
-            )
-
-            # Depending on the model, format accordingly
-            text = f"""<|begin_of_text|><|start_header_id|>system<|end_header_id|>
+        # Scenarios are rendered in the Llama 3 chat format for the whole DataFrame at once
+        for text in render_llama_texts(df, system_prompt, style):
+            # Write to the JSONL file
+            json_line = json.dumps({"text": text})
+            f_out.write(json_line + '\n')
 
-{system_prompt}<|eot_id|><|start_header_id|>user<|end_header_id|>
 
-{user_input}<|eot_id|><|start_header_id|>assistant<|end_header_id|>
+def create_finetune_shards(source, output_directory, system_prompt, **options):
+    """
+    Writes the lines of create_finetune_dataset as JSONL shards with a manifest, for datasets too large for memory.
 
-{is_conflict}<|eot_id|>"""
+    Args:
+        source (str or pd.DataFrame): Dataset CSV or JSON Lines file, columnar dataset directory, or DataFrame.
+        output_directory (str): Directory of the shards and manifest.json.
+        system_prompt (str): The system prompt to include.
+        **options: `workers`, `records_per_shard`, `compress`, `compression_level` and `style` of
+            `build_jsonl_shards`.
 
-            # Write to the JSONL file
-            json_line = json.dumps({"text": text})
-            f_out.write(json_line + '\n')
+    Returns:
+        dict: The manifest of the shards, with the build time.
+    """
+    return build_jsonl_shards(source, output_directory, 'llama', system_prompt, **options)
 
 
 def verify_dataset(file_path):
@@ -4,24 +4,97 @@
 Together AI Utility Functions
 
 This module contains helper functions for interacting with the Together AI API and the LLAMA model.
+`LlamaClient` loads the configuration once and reuses kept-alive connections with timeouts and
+retries; `llama32` sends through a shared client per model size.
 
 Author: Your Name
 Date: YYYY-MM-DD
 """
 
+import functools
 import os
-import requests
-import json
-from dotenv import load_dotenv, find_dotenv
+from src.concurrent_evaluation import ChatCompletionsClient
 
+TOGETHER_API_BASE = 'https://api.together.xyz'
+STOP_TOKENS = ["<|eot_id|>", "<|eom_id|>"]
+CHAT_MAX_TOKENS = 4096
+# 'Yes' and 'No' are single tokens; the rest leaves room for leading whitespace
+CLASSIFICATION_MAX_TOKENS = 3
 
+
+@functools.lru_cache(maxsize=None)
 def load_env():
     """
     Loads environment variables from a .env file.
+
+    The file is searched for (a walk up the directory tree) on the first call only. Without
+    python-dotenv, only variables already set in the environment are used.
     """
+    try:
+        from dotenv import load_dotenv, find_dotenv
+    except ImportError:
+        return
     load_dotenv(find_dotenv())
 
 
+class LlamaClient(ChatCompletionsClient):
+    """
+    Client of the LLAMA model on the Together AI API.
+
+    The API base and key are read once, when the client is created. Requests reuse kept-alive
+    connections, time out after `timeout` seconds, and rate limits, server errors and
+    connection failures are retried with backoff (see `ChatCompletionsClient`).
+    """
+
+    def __init__(self, model_size=11, api_key=None, base_url=None, **options):
+        """
+        Configures the client.
+
+        Args:
+            model_size (int): Size of the LLAMA model (e.g., 11 for 11B model).
+            api_key (str, optional): Together AI API key (default: TOGETHER_API_KEY).
+            base_url (str, optional): API root without '/v1' (default: DLAI_TOGETHER_API_BASE, else Together AI).
+            **options: `timeout`, `max_retries`, `backoff_base`, `backoff_cap` or `rate_limiter`.
+        """
+        load_env()
+        base_url = base_url or os.getenv('DLAI_TOGETHER_API_BASE', TOGETHER_API_BASE)
+        super().__init__(f"meta-llama/Llama-3.2-{model_size}B-Vision-Instruct-Turbo",
+                         api_key or os.getenv('TOGETHER_API_KEY'), base_url=base_url.rstrip('/') + '/v1', **options)
+
+    def chat(self, messages, max_tokens=CHAT_MAX_TOKENS):
+        """
+        Sends a chat completion request.
+
+        Args:
+            messages (list): List of messages in the conversation.
+            max_tokens (int): Longest reply.
+
+        Returns:
+            str: The content of the assistant's reply.
+        """
+        return self.complete(messages, max_tokens=max_tokens, stop=STOP_TOKENS)
+
+    def classify(self, messages):
+        """
+        Asks for a one-word answer, such as 'Yes' or 'No', with a small output budget.
+
+        Args:
+            messages (list): List of messages in the conversation.
+
+        Returns:
+            str: The stripped reply.
+        """
+        return self.chat(messages, max_tokens=CLASSIFICATION_MAX_TOKENS).strip()
+
+
+@functools.lru_cache(maxsize=None)
+def llama_client(model_size=11):
+    """
+    Returns the shared client of a model size, creating it on first use.
+    """
+    return LlamaClient(model_size)
+
+
 def llama32(messages, model_size=11):
     """
     Sends a chat completion request to the LLAMA model via the Together AI API.
@@ -33,26 +106,4 @@ def llama32(messages, model_size=11):
     Returns:
         str: The content of the assistant's reply.
     """
-    load_env()
-    model = f"meta-llama/Llama-3.2-{model_size}B-Vision-Instruct-Turbo"
-    url = f"{os.getenv('DLAI_TOGETHER_API_BASE', 'https://api.together.xyz')}/v1/chat/completions"
-    payload = {
-        "model": model,
-        "max_tokens": 4096,
-        "temperature": 0.0,
-        "stop": ["<|eot_id|>", "<|eom_id|>"],
-        "messages": messages
-    }
-
-    headers = {
-        "Accept": "application/json",
-        "Content-Type": "application/json",
-        "Authorization": f"Bearer {os.getenv('TOGETHER_API_KEY')}"
-    }
-    response = requests.post(url, headers=headers, data=json.dumps(payload))
-    res = response.json()
-
-    if 'error' in res:
-        raise Exception(res['error'])
-
-    return res['choices'][0]['message']['content']
+    return llama_client(model_size).chat(messages)
@@ -0,0 +1,42 @@
+# relabel_dataset.py
+
+import argparse
+import json
+
+from src.relabel import relabel_dataset, OUTPUT_FORMATS, DEFAULT_RELABEL_CHUNK_SIZE
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Recompute the labels of an existing dataset with the current rules and intersection layout.")
+    parser.add_argument('input', help="Dataset CSV or JSON Lines file")
+    parser.add_argument('output', help="Relabeled dataset file, or directory for the columnar format")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS,
+                        help="Output format (default: the format of the input)")
+    parser.add_argument('--layout', help="Intersection layout JSON file (default: the layout of generate_dataset)")
+    parser.add_argument('--workers', type=int, default=1, help="Number of worker processes")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_RELABEL_CHUNK_SIZE, help="Records per chunk")
+    parser.add_argument('--report', help="Write the relabel report to this JSON file")
+    args = parser.parse_args()
+
+    intersection_layout = None
+    if args.layout:
+        with open(args.layout) as f:
+            intersection_layout = json.load(f)
+    report = relabel_dataset(
+        args.input,
+        args.output,
+        intersection_layout=intersection_layout,
+        output_format=args.format,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+
+    print(json.dumps(report, indent=2))
+    print(f"Relabeled {report['relabeled']} of {report['records']} records in {report['elapsed']:.1f}s "
+          f"({report['records_per_second']:.0f} records/s); {report['changed_records']} changed")
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,20 @@
 # run_evaluation.py
 
+import argparse
+import json
 from gpt_finetuning.prepare_data import prepare_test_data_for_gpt
 from gpt_finetuning.evaluation import predict_and_evaluate, generate_evaluation_report
-import openai
+from src.conflict_detection import parse_intersection_layout
+from src.data_generation import INTERSECTION_LAYOUT_JSON
+from src.prompt_renderer import STYLES, TABLE_STYLES, compact_system_instruction
 import pandas as pd
 import os
 
+parser = argparse.ArgumentParser(description="Evaluate a fine-tuned GPT model on the test set.")
+parser.add_argument('--style', choices=STYLES,
+                    help="Scenario text style the model was fine-tuned with (default: the style of the model)")
+args = parser.parse_args()
+
 # Set your OpenAI API key
 openai_api_key = os.getenv('OPENAI_API_KEY')
 if not openai_api_key:
@@ -30,8 +39,12 @@ You are an Urban Intersection Traffic Conflict Detector, responsible for monitor
 Analyze the traffic data from all directions and lanes, and determine if there is a potential conflict between vehicles at the intersection. Respond only with 'yes' or 'no'.
 """
 
+# The table styles come with a short system instruction that lists the lanes
+if args.style in TABLE_STYLES:
+    system_instruction = compact_system_instruction(parse_intersection_layout(json.loads(INTERSECTION_LAYOUT_JSON)))
+
 # Prepare test data
-test_data = prepare_test_data_for_gpt(test_df, system_instruction)
+test_data = prepare_test_data_for_gpt(test_df, system_instruction, style=args.style)
 
 # Evaluate the model
 y_true, y_pred = predict_and_evaluate(test_data, fine_tuned_model_id, openai_api_key)
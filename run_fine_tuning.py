@@ -1,11 +1,21 @@
 # run_fine_tuning.py
 
+import argparse
+import json
 from gpt_finetuning.prepare_data import prepare_chat_jsonl_file
 from gpt_finetuning.fine_tune_gpt import fine_tune_model, wait_for_fine_tuning_completion
+from src.conflict_detection import parse_intersection_layout
+from src.data_generation import INTERSECTION_LAYOUT_JSON
+from src.prompt_renderer import STYLES, TABLE_STYLES, compact_system_instruction
 import openai
 import pandas as pd
 import os
 
+parser = argparse.ArgumentParser(description="Fine-tune a GPT model to classify intersection conflicts.")
+parser.add_argument('--style', choices=STYLES,
+                    help="Scenario text style (default: the style of the model); 'compact' and 'eta' take fewer tokens")
+args = parser.parse_args()
+
 # Set your OpenAI API key
 openai_api_key = os.getenv('OPENAI_API_KEY')
 if not openai_api_key:
@@ -27,9 +37,13 @@ You are an Urban Intersection Traffic Conflict Detector, responsible for monitor
 Analyze the traffic data from all directions and lanes, and determine if there is a potential conflict between vehicles at the intersection. Respond only with 'yes' or 'no'.
 """
 
+# The table styles come with a short system instruction that lists the lanes
+if args.style in TABLE_STYLES:
+    system_instruction = compact_system_instruction(parse_intersection_layout(json.loads(INTERSECTION_LAYOUT_JSON)))
+
 # Prepare data files
-prepare_chat_jsonl_file(train_df, 'data/train_data.jsonl', system_instruction)
-prepare_chat_jsonl_file(val_df, 'data/val_data.jsonl', system_instruction)
+prepare_chat_jsonl_file(train_df, 'data/train_data.jsonl', system_instruction, style=args.style)
+prepare_chat_jsonl_file(val_df, 'data/val_data.jsonl', system_instruction, style=args.style)
 
 # Upload files to OpenAI
 train_file_response = openai.File.create(
@@ -7,11 +7,21 @@ Author: Sari Masri
 Date: 2024-11-15
 """
 
+import argparse
+import json
 import os
 import pandas as pd
 from llama_finetuning.prepare_data import parse_scenario_to_string
 from llama_finetuning.evaluation import evaluate_model
 from llama_finetuning.together_utils import load_env
+from src.conflict_detection import parse_intersection_layout
+from src.data_generation import INTERSECTION_LAYOUT_JSON
+from src.prompt_renderer import STYLES, TABLE_STYLES, compact_system_instruction
+
+parser = argparse.ArgumentParser(description="Evaluate a fine-tuned LLAMA model on the test set.")
+parser.add_argument('--style', choices=STYLES,
+                    help="Scenario text style the model was fine-tuned with (default: the style of the model)")
+args = parser.parse_args()
 
 # Set your Together AI API key
 api_key = os.getenv('TOGETHER_API_KEY')
@@ -33,5 +43,9 @@ You are an Urban Intersection Traffic Conflict Detector, responsible for monitor
 Analyze the traffic data from all directions and lanes, and determine if there is a potential conflict between vehicles at the intersection. Respond only with 'Yes' or 'No'.
 """
 
+# The table styles come with a short system prompt that lists the lanes
+if args.style in TABLE_STYLES:
+    system_prompt = compact_system_instruction(parse_intersection_layout(json.loads(INTERSECTION_LAYOUT_JSON)))
+
 # Evaluate the model
-final_accuracy, cm, report = evaluate_model(test_df, system_prompt)
+final_accuracy, cm, report = evaluate_model(test_df, system_prompt, style=args.style)
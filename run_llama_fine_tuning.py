@@ -7,12 +7,22 @@ Author: Sari Masri
 Date: 2024-11-15
 """
 
+import argparse
+import json
 import os
 import pandas as pd
 from llama_finetuning.prepare_data import create_finetune_dataset, verify_dataset
 from llama_finetuning.fine_tune_llama import fine_tune_model, monitor_fine_tuning_job
+from src.conflict_detection import parse_intersection_layout
+from src.data_generation import INTERSECTION_LAYOUT_JSON
+from src.prompt_renderer import STYLES, TABLE_STYLES, compact_system_instruction
 from together import Together
 
+parser = argparse.ArgumentParser(description="Fine-tune a LLAMA model to classify intersection conflicts.")
+parser.add_argument('--style', choices=STYLES,
+                    help="Scenario text style (default: the style of the model); 'compact' and 'eta' take fewer tokens")
+args = parser.parse_args()
+
 # Set your Together AI API key
 api_key = os.getenv('TOGETHER_API_KEY')
 if not api_key:
@@ -34,9 +44,13 @@ You are an Urban Intersection Traffic Conflict Detector, responsible for monitor
 Analyze the traffic data from all directions and lanes, and determine if there is a potential conflict between vehicles at the intersection. Respond only with 'Yes' or 'No'.
 """
 
+# The table styles come with a short system prompt that lists the lanes
+if args.style in TABLE_STYLES:
+    system_prompt = compact_system_instruction(parse_intersection_layout(json.loads(INTERSECTION_LAYOUT_JSON)))
+
 # Prepare data files
-create_finetune_dataset(train_df, 'data/train_finetune.jsonl', system_prompt)
-create_finetune_dataset(val_df, 'data/val_finetune.jsonl', system_prompt)
+create_finetune_dataset(train_df, 'data/train_finetune.jsonl', system_prompt, style=args.style)
+create_finetune_dataset(val_df, 'data/val_finetune.jsonl', system_prompt, style=args.style)
 
 # Verify datasets
 verify_dataset('data/train_finetune.jsonl')
@@ -0,0 +1,43 @@
+# split_dataset.py
+
+import argparse
+import json
+
+import pandas as pd
+
+from src.dataset_split import split_dataset, BloomFilter, DEFAULT_FRACTIONS, DEFAULT_SPEED_STEP, \
+    DEFAULT_DISTANCE_STEP
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Remove duplicate scenarios and split a dataset into train, validation and test sets.")
+    parser.add_argument('input', nargs='?', default='data/generated_dataset.csv', help="Dataset CSV file")
+    parser.add_argument('--output-dir', default='data', help="Directory of train_set.csv, val_set.csv and test_set.csv")
+    parser.add_argument('--train', type=float, default=DEFAULT_FRACTIONS['train'], help="Share of the train set")
+    parser.add_argument('--val', type=float, default=DEFAULT_FRACTIONS['val'], help="Share of the validation set")
+    parser.add_argument('--test', type=float, default=DEFAULT_FRACTIONS['test'], help="Share of the test set")
+    parser.add_argument('--speed-step', type=float, default=DEFAULT_SPEED_STEP, help="Speed quantization in km/h")
+    parser.add_argument('--distance-step', type=float, default=DEFAULT_DISTANCE_STEP, help="Distance quantization in m")
+    parser.add_argument('--bloom-capacity', type=int,
+                        help="Use a Bloom filter sized for this many scenarios instead of an exact set")
+    parser.add_argument('--chunk-size', type=int, default=100000, help="Rows read at a time")
+    parser.add_argument('--report', help="Write the duplicate report to this JSON file")
+    args = parser.parse_args()
+
+    seen = BloomFilter(args.bloom_capacity) if args.bloom_capacity else None
+    report = split_dataset(
+        pd.read_csv(args.input, chunksize=args.chunk_size),
+        args.output_dir,
+        fractions={'train': args.train, 'val': args.val, 'test': args.test},
+        seen=seen,
+        speed_step=args.speed_step,
+        distance_step=args.distance_step,
+    )
+
+    print(json.dumps(report, indent=2))
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -14,4 +14,108 @@ from .conflict_detection import (
     is_vehicle_on_right,
     apply_priority_rules,
     compute_waiting_times,
-)
\ No newline at end of file
+    priority_winner,
+    path_rule,
+    ConflictRecord,
+)
+
+from .batch_detection import (
+    BatchConflicts,
+    detect_conflicts_batch,
+    encode_scenarios,
+)
+
+from .vehicle_batch import (
+    VehicleBatch,
+    VehicleView,
+)
+
+from .intersection_layout import (
+    CompiledIntersectionLayout,
+)
+
+from .incremental import (
+    ConflictDelta,
+    IncrementalConflictDetector,
+)
+
+from .scheduling import (
+    schedule_intersection,
+)
+
+from .instrumentation import (
+    Trace,
+    enable_tracing,
+    disable_tracing,
+    tracing,
+)
+
+from .bulk_parser import (
+    ParsedScenarios,
+    parse_scenarios,
+)
+
+from .scenario_generator import (
+    GeneratedScenarios,
+    VehicleIdNamespace,
+    generate_scenarios,
+    generate_conflict_free_scenarios,
+    generate_near_threshold_scenarios,
+    iter_scenarios,
+)
+
+from .dataset_writer import (
+    ChunkWriter,
+    write_chunks,
+    write_dataset,
+)
+
+from .columnar_dataset import (
+    ColumnarDataset,
+    ColumnarDatasetWriter,
+    load_columnar,
+    write_columnar,
+    convert_csv,
+)
+
+from .checkpointing import (
+    generate_checkpointed,
+    combine_chunks,
+    load_manifest,
+)
+
+from .dataset_split import (
+    split_dataset,
+    canonical_scenario,
+    scenario_hashes,
+    HashSet,
+    BloomFilter,
+)
+
+from .relabel import (
+    relabel_dataset,
+    relabel_records,
+    read_chunks,
+)
+
+from .prompt_renderer import (
+    render_scenarios,
+    render_user_prompts,
+    render_gpt_conversations,
+    render_llama_texts,
+    compact_system_instruction,
+    STYLES,
+    TABLE_STYLES,
+)
+
+from .finetune_shards import (
+    build_jsonl_shards,
+    read_shards,
+    load_shard_manifest,
+)
+
+from .concurrent_evaluation import (
+    ChatCompletionsClient,
+    TokenBucket,
+    evaluate_chat_completions,
+)
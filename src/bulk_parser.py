@@ -0,0 +1,312 @@
+# src/bulk_parser.py
+
+"""
+Bulk Parser Module
+
+This module validates many vehicle scenarios at once. Instead of building
+one Vehicle per vehicle, raising on the first invalid field and warning
+about unknown lanes, it flattens all scenarios into columns, runs every
+check as a NumPy operation and reports the outcome as reason codes: one per
+vehicle and one per scenario, plus an error mask of the scenarios that
+`parse_vehicles` would reject.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import json
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+from .conflict_detection import DIRECTION_CODES, MOVEMENT_CODES
+from .intersection_layout import CompiledIntersectionLayout
+from .vehicle_batch import VehicleBatch
+
+# Reason codes, in the order the checks of `parse_vehicles` and `Vehicle` apply
+REASON_CODES = {
+    'ok': 0,
+    'malformed_scenario': 1,
+    'missing_field': 2,
+    'invalid_number': 3,
+    'duplicate_vehicle_id': 4,
+    'negative_speed': 5,
+    'negative_distance': 6,
+    'invalid_direction': 7,
+    'empty_vehicle_id': 8,
+    # Not errors: `Vehicle` only warns and sets the movement type to 'unknown'
+    'unknown_lane': 9,
+    'unreachable_destination': 10,
+    'unknown_movement': 11,  # Also a lane or destination that is None
+}
+REASON_NAMES = sorted(REASON_CODES, key=REASON_CODES.get)
+
+# Reason codes that make a scenario invalid
+FATAL_REASONS = frozenset(range(REASON_CODES['malformed_scenario'], REASON_CODES['empty_vehicle_id'] + 1))
+
+VEHICLE_FIELDS = ('vehicle_id', 'lane', 'speed', 'distance_to_intersection', 'direction', 'destination')
+
+
+class ParsedScenarios:
+    """
+    Result of `parse_scenarios`.
+
+    The vehicles of scenario `s` are the rows `offsets[s]:offsets[s + 1]` of
+    the vehicle columns. Columns of vehicles with a fatal reason hold
+    placeholder values.
+
+    Attributes:
+        offsets (np.ndarray): Start of each scenario in the vehicle columns (int64).
+        vehicle_reasons (np.ndarray): Reason code of each vehicle (int8).
+        scenario_reasons (np.ndarray): Reason code of each scenario (int8): the first
+            fatal reason of its vehicles, or otherwise the first non-fatal one.
+        error_mask (np.ndarray): True for scenarios that `parse_vehicles` would reject.
+        batch (VehicleBatch): Columns of all vehicles, including invalid ones.
+    """
+
+    def __init__(self, offsets, vehicle_reasons, scenario_reasons, batch):
+        self.offsets = offsets
+        self.vehicle_reasons = vehicle_reasons
+        self.scenario_reasons = scenario_reasons
+        self.error_mask = np.isin(scenario_reasons, list(FATAL_REASONS))
+        self.batch = batch
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def reasons(self):
+        """
+        Returns the reason name of every scenario.
+
+        Returns:
+            list of str: Reason names.
+        """
+        return [REASON_NAMES[code] for code in self.scenario_reasons]
+
+    def summary(self):
+        """
+        Counts the scenarios per reason.
+
+        Returns:
+            dict: Reason name -> number of scenarios, for reasons that occur.
+        """
+        counts = np.bincount(self.scenario_reasons, minlength=len(REASON_NAMES))
+        return {REASON_NAMES[code]: int(count) for code, count in enumerate(counts) if count}
+
+    def valid_batch(self):
+        """
+        Returns the vehicles of the scenarios without errors.
+
+        Returns:
+            tuple: (VehicleBatch of the valid scenarios, np.ndarray of their scenario indices)
+        """
+        valid = np.flatnonzero(~self.error_mask)
+        sizes = np.diff(self.offsets)[valid]
+        rows = np.repeat(self.offsets[valid], sizes) + _ranges(sizes)
+        offsets = np.zeros(len(valid) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        batch = self.batch
+        return VehicleBatch(
+            batch.speed[rows], batch.distance[rows], batch.direction[rows], batch.movement[rows],
+            batch.lane[rows], batch.destination[rows], batch.vehicle_id[rows], offsets,
+            batch.lanes, batch.destinations, batch.vehicle_ids
+        ), valid
+
+
+def _ranges(sizes):
+    """
+    Returns concatenated `arange(size)` for every size.
+    """
+    total = int(sizes.sum())
+    starts = np.repeat(np.cumsum(sizes) - sizes, sizes)
+    return np.arange(total, dtype=np.int64) - starts
+
+
+def _to_float(values, types):
+    """
+    Converts values to float64 and returns them with a mask of the values that
+    are not real numbers (including numeric strings, which `Vehicle` cannot
+    compare); those become NaN. A float NaN is a real number here, as `Vehicle`
+    accepts it. `types` is the set of types of the values.
+    """
+    if types <= {int, float}:
+        return np.array(values, dtype=np.float64), np.zeros(len(values), dtype=bool)
+    invalid = np.array([not isinstance(value, (int, float, np.integer, np.floating)) for value in values],
+                       dtype=bool)
+    return np.array([np.nan if bad else value for value, bad in zip(values, invalid)], dtype=np.float64), invalid
+
+
+def _factorize(values):
+    """
+    Encodes values as integer codes in order of first appearance.
+
+    Missing values (None or NaN) and unhashable values share one code whose
+    unique value is None.
+
+    Returns:
+        tuple: (np.ndarray of int64 codes, list of unique values)
+    """
+    array = np.fromiter(values, dtype=object, count=len(values))
+    try:
+        codes, uniques = pd.factorize(array)
+    except TypeError:
+        array = np.fromiter((value if getattr(type(value), '__hash__', None) else None for value in values),
+                            dtype=object, count=len(values))
+        codes, uniques = pd.factorize(array)
+    codes = codes.astype(np.int64)
+    uniques = uniques.tolist()
+    unknown = codes < 0
+    if unknown.any():
+        codes[unknown] = len(uniques)
+        uniques.append(None)
+    return codes, uniques
+
+
+def _scenario_dicts(scenarios):
+    """
+    Yields each scenario as a dict, or None if it cannot be decoded.
+    """
+    if hasattr(scenarios, 'columns'):
+        # DataFrame with a 'scenario' column, as written by generate_dataset
+        scenarios = scenarios['scenario']
+    for scenario in scenarios:
+        if isinstance(scenario, (str, bytes)):
+            try:
+                scenario = json.loads(scenario)
+            except ValueError:
+                scenario = None
+        if not isinstance(scenario, dict) or not isinstance(scenario.get('vehicles_scenario'), list):
+            yield None
+        else:
+            yield scenario
+
+
+def parse_scenarios(scenarios, intersection_layout):
+    """
+    Validates and encodes many vehicle scenarios without raising or warning.
+
+    Args:
+        scenarios (iterable or DataFrame): Scenario dicts or JSON strings, or a DataFrame
+            with a 'scenario' column of either.
+        intersection_layout (dict or CompiledIntersectionLayout): Layout of the intersection.
+
+    Returns:
+        ParsedScenarios: Columns, reason codes and error mask.
+    """
+    if not isinstance(intersection_layout, CompiledIntersectionLayout):
+        intersection_layout = CompiledIntersectionLayout(intersection_layout)
+
+    vehicles = []
+    offsets = [0]
+    malformed = []
+    for scenario in _scenario_dicts(scenarios):
+        if scenario is None:
+            malformed.append(len(offsets) - 1)
+        else:
+            vehicles.extend(scenario['vehicles_scenario'])
+        offsets.append(len(vehicles))
+    offsets = np.array(offsets, dtype=np.int64)
+    n_scenarios = len(offsets) - 1
+    n_vehicles = int(offsets[-1])
+    scenario_index = np.repeat(np.arange(n_scenarios), np.diff(offsets))
+
+    columns = {}
+    absent = np.zeros(n_vehicles, dtype=bool)
+    for field in VEHICLE_FIELDS:
+        try:
+            columns[field] = list(map(itemgetter(field), vehicles))
+        except (KeyError, TypeError, IndexError):
+            # Absent fields become None; `parse_vehicles` reads every field, so they are missing_field
+            columns[field] = [vehicle.get(field) if isinstance(vehicle, dict) else None for vehicle in vehicles]
+            absent |= np.array([not isinstance(vehicle, dict) or field not in vehicle for vehicle in vehicles],
+                               dtype=bool)
+
+    # Per-row work is limited to factorizing; checks then run on the distinct values
+    id_codes, vehicle_ids = _factorize(columns['vehicle_id'])
+    lane_keys, lane_values = _factorize(columns['lane'])
+    direction_keys, direction_values = _factorize(columns['direction'])
+    destination_keys, destinations = _factorize(columns['destination'])
+
+    # A None vehicle ID, direction, speed or distance makes `Vehicle` raise; a None lane or
+    # destination only gives the movement type 'unknown'
+    missing = absent.copy()
+    for codes, uniques in ((id_codes, vehicle_ids), (direction_keys, direction_values)):
+        if None in uniques:
+            missing |= codes == uniques.index(None)
+    no_route = np.zeros(n_vehicles, dtype=bool)
+    for codes, uniques in ((lane_keys, lane_values), (destination_keys, destinations)):
+        if None in uniques:
+            no_route |= codes == uniques.index(None)
+    numbers = []
+    invalid_number = np.zeros(n_vehicles, dtype=bool)
+    for field in ('speed', 'distance_to_intersection'):
+        values = columns[field]
+        types = set(map(type, values))
+        if type(None) in types:
+            missing |= np.array([value is None for value in values], dtype=bool)
+        number, invalid = _to_float(values, types)
+        numbers.append(number)
+        invalid_number |= invalid
+    speed, distance = numbers
+    # NaN speeds and distances pass, as in `Vehicle` (NaN < 0 is False)
+    invalid_number &= ~missing
+
+    # Duplicates within a scenario: same ID code in the same scenario as an earlier row
+    keys = scenario_index * max(len(vehicle_ids), 1) + id_codes
+    order = np.argsort(keys, kind='stable')
+    duplicate = np.zeros(n_vehicles, dtype=bool)
+    duplicate[order[1:]] = keys[order[1:]] == keys[order[:-1]]
+    empty_id = np.array([not vehicle_id for vehicle_id in vehicle_ids], dtype=bool)[id_codes]
+
+    direction = np.array([DIRECTION_CODES.get(value.lower(), -1) if isinstance(value, str) else -1
+                          for value in direction_values], dtype=np.int8)[direction_keys]
+
+    lane_names, lanes = _factorize([str(lane) for lane in lane_values])
+    lane_keys = lane_names[lane_keys]
+    layout_lanes = intersection_layout.lane_codes(lanes)[lane_keys]
+    layout_destinations = intersection_layout.destination_codes(destinations)[destination_keys]
+
+    known_direction = direction >= 0
+    safe_direction = np.where(known_direction, direction, 0)
+    safe_lane = np.where(layout_lanes >= 0, layout_lanes, 0)
+    safe_destination = np.where(layout_destinations >= 0, layout_destinations, 0)
+    has_lane = known_direction & (layout_lanes >= 0) & intersection_layout.lane_table[safe_direction, safe_lane]
+    reachable = has_lane & (layout_destinations >= 0) & \
+        intersection_layout.route_table[safe_direction, safe_lane, safe_destination]
+    movement = intersection_layout.movement_table[safe_direction, safe_lane, safe_destination]
+    movement = np.where(reachable, movement, MOVEMENT_CODES['unknown']).astype(np.int8)
+
+    # The first failing check decides, as the first exception or warning would
+    checks = [
+        ('missing_field', missing),
+        ('invalid_number', invalid_number),
+        ('duplicate_vehicle_id', duplicate),
+        ('negative_speed', speed < 0),
+        ('negative_distance', distance < 0),
+        ('invalid_direction', ~known_direction),
+        ('empty_vehicle_id', empty_id),
+        ('unknown_lane', ~has_lane & ~no_route),
+        ('unreachable_destination', ~reachable & ~no_route),
+        ('unknown_movement', movement == MOVEMENT_CODES['unknown']),
+    ]
+    vehicle_reasons = np.zeros(n_vehicles, dtype=np.int8)
+    for reason, mask in reversed(checks):
+        vehicle_reasons[mask] = REASON_CODES[reason]
+
+    # Scenario reason: first fatal vehicle reason, else first non-fatal one
+    scenario_reasons = np.zeros(n_scenarios, dtype=np.int8)
+    flagged = np.flatnonzero(vehicle_reasons)
+    fatal = np.isin(vehicle_reasons[flagged], list(FATAL_REASONS))
+    for rows in (flagged[~fatal], flagged[fatal]):
+        # Rows are ascending, so the first occurrence per scenario is its first vehicle
+        scenarios, first = np.unique(scenario_index[rows], return_index=True)
+        scenario_reasons[scenarios] = vehicle_reasons[rows[first]]
+    scenario_reasons[malformed] = REASON_CODES['malformed_scenario']
+
+    batch = VehicleBatch(
+        np.where(invalid_number | missing, 0.0, speed), np.where(invalid_number | missing, 0.0, distance),
+        safe_direction.astype(np.int8), movement, lane_keys.astype(np.int16), destination_keys.astype(np.int16),
+        id_codes.astype(np.int32), offsets, lanes, destinations, vehicle_ids
+    )
+    return ParsedScenarios(offsets, vehicle_reasons, scenario_reasons, batch)
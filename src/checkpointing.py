@@ -0,0 +1,252 @@
+# src/checkpointing.py
+
+"""
+Checkpointed Generation Module
+
+This module generates datasets into a directory of numbered chunk files and
+a `manifest.json` that is updated after every completed chunk. The manifest
+records the generation parameters, the completed chunks, the running class
+counts and the state each chunk's random generator ended in, so an
+interrupted run continues from the last completed chunk and produces the
+same dataset as an uninterrupted one.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import json
+import os
+import random
+import shutil
+
+from .data_generation import (
+    DEFAULT_CHUNK_SIZE,
+    chunk_quotas,
+    chunk_seeds,
+    combine_generation_stats,
+    generate_shard,
+    iter_dataset_chunks,
+)
+from .dataset_writer import ChunkWriter, FORMATS
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 2
+
+# Parameters that must match when a run is resumed
+PARAMETERS = ('total_records', 'num_vehicles', 'fixed_vehicle_count', 'seed', 'balance', 'chunk_size', 'file_format',
+              'sampler')
+
+
+def chunk_file_name(index, file_format):
+    """
+    Returns the file name of a chunk.
+
+    Args:
+        index (int): Index of the chunk.
+        file_format (str): One of FORMATS.
+
+    Returns:
+        str: The file name, e.g. 'chunk-00003.csv'.
+    """
+    return f"chunk-{index:05d}.{file_format}"
+
+
+def _final_rng_state(parameters, index):
+    """
+    Regenerates a chunk without writing it and returns the state its bit generator ended in.
+    """
+    quotas = chunk_quotas(parameters['total_records'], parameters['chunk_size'])
+    chunk_seed = chunk_seeds(parameters['seed'], len(quotas))[index]
+    stats = generate_shard(quotas[index], parameters['num_vehicles'], parameters['fixed_vehicle_count'], chunk_seed,
+                           parameters['balance'], parameters['sampler'])[1]
+    return stats['rng_state']
+
+
+def _write_json(path, document):
+    """
+    Writes a JSON file atomically, so a crash never leaves a partial file.
+    """
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'w') as f:
+        json.dump(document, f, indent=2)
+    os.replace(temporary_path, path)
+
+
+def load_manifest(directory):
+    """
+    Reads the manifest of a checkpoint directory.
+
+    Args:
+        directory (str): Checkpoint directory.
+
+    Returns:
+        dict: The manifest, or None if the directory has none.
+    """
+    path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def generate_checkpointed(directory, total_records=50000, num_vehicles=5, fixed_vehicle_count=True, workers=1,
+                          seed=None, balance='reject', chunk_size=DEFAULT_CHUNK_SIZE, file_format='csv',
+                          max_chunks=None, sampler='uniform'):
+    """
+    Generates a dataset into chunk files, resuming an earlier run if there is one.
+
+    If the directory holds a manifest, its parameters must match (an omitted
+    seed is taken from the manifest) and generation continues after the last
+    completed chunk. Files of chunks that were not completed are discarded.
+    Each chunk file is written under a temporary name and renamed once
+    complete, and the manifest is updated after every chunk.
+
+    Args:
+        directory (str): Checkpoint directory.
+        total_records (int): Total number of records to generate.
+        num_vehicles (int): Maximum number of vehicles in each scenario.
+        fixed_vehicle_count (bool): If True, use num_vehicles; else, randomly choose between 2 and num_vehicles.
+        workers (int): Number of worker processes; may differ between runs.
+        seed (int, optional): Seed of the dataset (default: from the manifest, or drawn from `random`).
+        balance (str): 'reject' or 'stratified' (see `generate_dataset`).
+        chunk_size (int): Number of records per chunk file.
+        file_format (str): Format of the chunk files, one of FORMATS.
+        max_chunks (int, optional): Stop after completing this many chunks in this call.
+        sampler (str): 'uniform' or 'near_threshold' (see `data_generation.SAMPLERS`).
+
+    Returns:
+        dict: The manifest; `manifest['complete']` tells whether all chunks are done.
+
+    Raises:
+        ValueError: If the parameters differ from those of the resumed run.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unknown dataset format: {file_format}")
+    os.makedirs(directory, exist_ok=True)
+    manifest = load_manifest(directory)
+    if seed is None:
+        seed = manifest['parameters']['seed'] if manifest else random.getrandbits(64)
+    parameters = {
+        'total_records': total_records,
+        'num_vehicles': num_vehicles,
+        'fixed_vehicle_count': fixed_vehicle_count,
+        'seed': seed,
+        'balance': balance,
+        'chunk_size': chunk_size,
+        'file_format': file_format,
+        'sampler': sampler,
+    }
+    num_chunks = len(chunk_quotas(total_records, chunk_size))
+
+    if manifest is None:
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'parameters': parameters,
+            'num_chunks': num_chunks,
+            'completed_chunks': [],
+            'class_counts': {'yes': 0, 'no': 0},
+            'generation_stats': combine_generation_stats([]),
+            'complete': num_chunks == 0,
+        }
+    else:
+        # Runs started before the sampler was recorded used the uniform one
+        recorded = {'sampler': 'uniform', **manifest['parameters']}
+        different = [name for name in PARAMETERS if recorded.get(name) != parameters[name]]
+        if different:
+            raise ValueError(f"Cannot resume '{directory}' with different parameters: {', '.join(different)}")
+        # Regenerating the last completed chunk must end in the state recorded before the interruption;
+        # manifests of version 1 did not record it
+        completed = manifest['completed_chunks']
+        if completed and 'rng_state' in completed[-1]:
+            if completed[-1]['rng_state'] != _final_rng_state(parameters, len(completed) - 1):
+                raise ValueError(f"The random state recorded in '{directory}' does not match its seed.")
+
+    # Remove leftovers of chunks that were not completed
+    completed_files = {chunk['file'] for chunk in manifest['completed_chunks']}
+    for name in os.listdir(directory):
+        if name.startswith('chunk-') and name not in completed_files:
+            os.remove(os.path.join(directory, name))
+    _write_json(os.path.join(directory, MANIFEST_FILE), manifest)
+
+    start = len(manifest['completed_chunks'])
+    if manifest['complete'] or max_chunks == 0:
+        return manifest
+    chunks = iter_dataset_chunks(total_records, num_vehicles, fixed_vehicle_count, workers, seed, balance,
+                                 chunk_size, start_chunk=start, sampler=sampler)
+    for index, chunk in enumerate(chunks, start=start):
+        name = chunk_file_name(index, file_format)
+        temporary_path = os.path.join(directory, name + '.tmp')
+        with ChunkWriter(temporary_path, file_format) as writer:
+            writer.write(chunk)
+        os.replace(temporary_path, os.path.join(directory, name))
+
+        counts = chunk['is_conflict'].value_counts().to_dict() if len(chunk) else {}
+        manifest['completed_chunks'].append({
+            'file': name,
+            'records': len(chunk),
+            'yes': int(counts.get('yes', 0)),
+            'no': int(counts.get('no', 0)),
+            'rng_state': chunk.attrs['rng_state'],
+        })
+        for label in ('yes', 'no'):
+            manifest['class_counts'][label] += int(counts.get(label, 0))
+        manifest['generation_stats'] = combine_generation_stats([manifest['generation_stats'],
+                                                                 chunk.attrs['generation_stats']])
+        manifest['complete'] = index + 1 == num_chunks
+        _write_json(os.path.join(directory, MANIFEST_FILE), manifest)
+
+        if max_chunks is not None and index + 1 - start >= max_chunks:
+            # Closing the generator stops the workers
+            chunks.close()
+            break
+    return manifest
+
+
+def combine_chunks(directory, path):
+    """
+    Concatenates the chunk files of a completed run into one file.
+
+    CSV and JSON Lines chunks are concatenated byte by byte (the CSV header
+    is kept once), so the result is identical to `write_dataset` with the
+    same parameters. Parquet chunks are combined with pyarrow. A run without
+    records still gives a CSV header or a Parquet file with the record
+    columns, so the file can be read back.
+
+    Args:
+        directory (str): Checkpoint directory.
+        path (str): Output file.
+
+    Returns:
+        int: Number of records written.
+
+    Raises:
+        ValueError: If the run is not complete.
+    """
+    manifest = load_manifest(directory)
+    if manifest is None or not manifest['complete']:
+        raise ValueError(f"'{directory}' does not hold a completed run.")
+    file_format = manifest['parameters']['file_format']
+    files = [os.path.join(directory, chunk['file']) for chunk in manifest['completed_chunks'] if chunk['records']]
+
+    if not files:
+        with ChunkWriter(path, file_format) as writer:
+            writer.write_empty()
+    elif file_format == 'parquet':
+        # Optional dependency, only needed for Parquet output
+        import pyarrow.parquet
+        writer = None
+        for chunk_path in files:
+            table = pyarrow.parquet.read_table(chunk_path)
+            if writer is None:
+                writer = pyarrow.parquet.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+    else:
+        with open(path, 'wb') as output:
+            for position, chunk_path in enumerate(files):
+                with open(chunk_path, 'rb') as f:
+                    if file_format == 'csv' and position:
+                        f.readline()  # Header
+                    shutil.copyfileobj(f, output)
+    return sum(chunk['records'] for chunk in manifest['completed_chunks'])
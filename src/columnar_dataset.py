@@ -0,0 +1,404 @@
+# src/columnar_dataset.py
+
+"""
+Columnar Dataset Module
+
+This module stores generated datasets in a compact columnar format and
+loads them with memory maps. A dataset is a directory with one raw binary
+file per column and a `meta.json` header:
+
+    vehicle arrays:  vehicle_id, direction, lane, destination (dictionary codes),
+                     speed, distance (float32), priority, waiting_time
+    conflict arrays: conflict_vehicle1, conflict_vehicle2 (vehicle positions
+                     within the scenario), conflict_winner, conflict_place
+    scenario arrays: vehicle_offsets, conflict_offsets (n_scenarios + 1), is_conflict
+
+The vehicles of scenario `s` are the rows `vehicle_offsets[s]:vehicle_offsets[s + 1]`
+and its conflicts the rows `conflict_offsets[s]:conflict_offsets[s + 1]`.
+Columns are appended chunk by chunk, so datasets of any size can be written
+and converted with constant memory, and opening one reads only the header.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import ast
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+from .conflict_detection import DIRECTION_CODES
+from .vehicle_batch import VehicleBatch, _Interner
+from .intersection_layout import CompiledIntersectionLayout
+
+FORMAT_NAME = 'intersection-columnar-dataset'
+FORMAT_VERSION = 1
+META_FILE = 'meta.json'
+
+DIRECTION_NAMES = sorted(DIRECTION_CODES, key=DIRECTION_CODES.get)
+
+# Column name -> dtype, in file order
+COLUMNS = {
+    'vehicle_offsets': np.int64,
+    'conflict_offsets': np.int64,
+    'is_conflict': np.bool_,
+    'vehicle_id': np.int32,
+    'direction': np.int8,
+    'lane': np.int16,
+    'destination': np.int16,
+    'speed': np.float32,
+    'distance': np.float32,
+    'priority': np.int16,          # release rank, 0 for vehicles without conflicts
+    'waiting_time': np.int32,
+    'conflict_vehicle1': np.int16,
+    'conflict_vehicle2': np.int16,
+    'conflict_winner': np.int8,    # 0 if vehicle1 has priority, 1 if vehicle2 has priority
+    'conflict_place': np.int16,
+}
+
+# Columns of generate_dataset stored as Python literals in CSV files
+LITERAL_COLUMNS = ('places_of_conflicts', 'conflict_vehicles', 'decisions', 'priority_order', 'waiting_times')
+
+DECISION_PATTERN = re.compile(r"Potential conflict: Vehicle (.+) must yield to Vehicle (.+)")
+
+_MAX_VEHICLES_PER_SCENARIO = np.iinfo(np.int16).max
+
+
+def _decode(value):
+    """
+    Returns a cell of a dataset as a Python object, parsing it if it was read from a CSV file.
+    """
+    return ast.literal_eval(value) if isinstance(value, str) else value
+
+
+class ColumnarDatasetWriter:
+    """
+    Appends dataset records to a columnar dataset directory.
+
+    Use as a context manager, or call `close` when done; the header is
+    written on close, and the dataset cannot be loaded before.
+    """
+
+    def __init__(self, path):
+        """
+        Creates the dataset directory and its column files.
+
+        Args:
+            path (str): Dataset directory; existing column files are overwritten.
+        """
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self.num_scenarios = 0
+        self.num_vehicles = 0
+        self.num_conflicts = 0
+        self._vehicle_ids = _Interner()
+        self._lanes = _Interner()
+        self._destinations = _Interner()
+        self._places = _Interner()
+        self._files = {name: open(os.path.join(path, f'{name}.bin'), 'wb') for name in COLUMNS}
+        np.zeros(1, dtype=np.int64).tofile(self._files['vehicle_offsets'])
+        np.zeros(1, dtype=np.int64).tofile(self._files['conflict_offsets'])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, records):
+        """
+        Appends records.
+
+        Args:
+            records (pd.DataFrame): Records with the columns of `generate_dataset`, either as
+                Python objects or as read from a CSV file (JSON and Python literal strings).
+
+        Raises:
+            ValueError: If a decision does not have the format of `detect_conflicts`.
+        """
+        columns = {name: [] for name in COLUMNS}
+        vehicle_end = self.num_vehicles
+        conflict_end = self.num_conflicts
+        for scenario, is_conflict, places, conflict_vehicles, decisions, priority_order, waiting_times in zip(
+                records['scenario'], records['is_conflict'], *(records[column] for column in LITERAL_COLUMNS)):
+            if isinstance(scenario, str):
+                scenario = json.loads(scenario)
+            vehicles = scenario['vehicles_scenario']
+            if len(vehicles) > _MAX_VEHICLES_PER_SCENARIO:
+                raise ValueError(f"At most {_MAX_VEHICLES_PER_SCENARIO} vehicles per scenario are supported.")
+            priority_order = _decode(priority_order) or {}
+            waiting_times = _decode(waiting_times) or {}
+            positions = {}
+            for position, vehicle in enumerate(vehicles):
+                vehicle_id = vehicle['vehicle_id']
+                positions[vehicle_id] = position
+                columns['vehicle_id'].append(self._vehicle_ids.code(vehicle_id))
+                columns['direction'].append(DIRECTION_CODES[vehicle['direction'].lower()])
+                columns['lane'].append(self._lanes.code(str(vehicle['lane'])))
+                columns['destination'].append(self._destinations.code(vehicle['destination']))
+                columns['speed'].append(vehicle['speed'])
+                columns['distance'].append(vehicle['distance_to_intersection'])
+                columns['priority'].append(priority_order.get(vehicle_id) or 0)
+                columns['waiting_time'].append(waiting_times.get(vehicle_id, 0))
+
+            for place, pair, decision in zip(_decode(places), _decode(conflict_vehicles), _decode(decisions)):
+                match = DECISION_PATTERN.fullmatch(decision)
+                if match is None:
+                    raise ValueError(f"Unrecognized decision: {decision}")
+                columns['conflict_vehicle1'].append(positions[pair['vehicle1_id']])
+                columns['conflict_vehicle2'].append(positions[pair['vehicle2_id']])
+                columns['conflict_winner'].append(0 if match.group(2) == pair['vehicle1_id'] else 1)
+                columns['conflict_place'].append(self._places.code(place))
+
+            vehicle_end += len(vehicles)
+            conflict_end = self.num_conflicts + len(columns['conflict_place'])
+            columns['vehicle_offsets'].append(vehicle_end)
+            columns['conflict_offsets'].append(conflict_end)
+            columns['is_conflict'].append(is_conflict == 'yes')
+
+        for name, dtype in COLUMNS.items():
+            np.asarray(columns[name], dtype=dtype).tofile(self._files[name])
+        self.num_scenarios += len(columns['is_conflict'])
+        self.num_vehicles = vehicle_end
+        self.num_conflicts = conflict_end
+
+    def close(self):
+        """
+        Closes the column files and writes the header.
+        """
+        if self._files is None:
+            return
+        for f in self._files.values():
+            f.close()
+        self._files = None
+        meta = {
+            'format': FORMAT_NAME,
+            'version': FORMAT_VERSION,
+            'num_scenarios': self.num_scenarios,
+            'num_vehicles': self.num_vehicles,
+            'num_conflicts': self.num_conflicts,
+            'columns': {name: np.dtype(dtype).str for name, dtype in COLUMNS.items()},
+            'vehicle_ids': self._vehicle_ids.values,
+            'lanes': self._lanes.values,
+            'destinations': self._destinations.values,
+            'places': self._places.values,
+        }
+        with open(os.path.join(self.path, META_FILE), 'w') as f:
+            json.dump(meta, f)
+
+
+class ColumnarDataset:
+    """
+    A columnar dataset opened with memory maps.
+
+    Every column of COLUMNS is an attribute holding a read-only array;
+    `number_of_conflicts` is derived from the conflict offsets.
+
+    Attributes:
+        vehicle_ids (list of str): Vehicle IDs by code.
+        lanes (list of str): Lane names by code.
+        destinations (list of str): Destination names by code.
+        places (list of str): Conflict places by code.
+    """
+
+    def __init__(self, path, meta, arrays):
+        self.path = path
+        self.vehicle_ids = meta['vehicle_ids']
+        self.lanes = meta['lanes']
+        self.destinations = meta['destinations']
+        self.places = meta['places']
+        for name, array in arrays.items():
+            setattr(self, name, array)
+
+    def __len__(self):
+        return len(self.vehicle_offsets) - 1
+
+    @property
+    def number_of_conflicts(self):
+        """
+        np.ndarray: Number of conflicts of each scenario.
+        """
+        return np.diff(self.conflict_offsets)
+
+    def scenario(self, index):
+        """
+        Builds the scenario dict of one record.
+
+        Args:
+            index (int): Index of the scenario.
+
+        Returns:
+            dict: The scenario with its 'vehicles_scenario' list (float32 kinematics widened to float).
+        """
+        rows = slice(self.vehicle_offsets[index], self.vehicle_offsets[index + 1])
+        vehicles = [
+            {
+                "vehicle_id": self.vehicle_ids[vehicle_id],
+                "lane": self.lanes[lane],
+                "speed": speed,
+                "distance_to_intersection": distance,
+                "direction": DIRECTION_NAMES[direction],
+                "destination": self.destinations[destination]
+            }
+            for vehicle_id, lane, speed, distance, direction, destination in zip(
+                self.vehicle_id[rows].tolist(), self.lane[rows].tolist(), self.speed[rows].tolist(),
+                self.distance[rows].tolist(), self.direction[rows].tolist(), self.destination[rows].tolist())
+        ]
+        return {"vehicles_scenario": vehicles}
+
+    def record(self, index):
+        """
+        Builds one record in the format of `generate_dataset`.
+
+        Args:
+            index (int): Index of the scenario.
+
+        Returns:
+            dict: The record.
+        """
+        scenario = self.scenario(index)
+        ids = [vehicle['vehicle_id'] for vehicle in scenario['vehicles_scenario']]
+        rows = slice(self.vehicle_offsets[index], self.vehicle_offsets[index + 1])
+        priorities = self.priority[rows].tolist()
+        waits = self.waiting_time[rows].tolist()
+
+        conflict_vehicles = []
+        decisions = []
+        places = []
+        for k in range(self.conflict_offsets[index], self.conflict_offsets[index + 1]):
+            id1 = ids[self.conflict_vehicle1[k]]
+            id2 = ids[self.conflict_vehicle2[k]]
+            first, second = (id1, id2) if self.conflict_winner[k] == 0 else (id2, id1)
+            conflict_vehicles.append({'vehicle1_id': id1, 'vehicle2_id': id2})
+            decisions.append(f"Potential conflict: Vehicle {second} must yield to Vehicle {first}")
+            places.append(self.places[self.conflict_place[k]])
+
+        # Ranked vehicles first, in release order, as schedule_intersection returns them
+        order = sorted((position for position, rank in enumerate(priorities) if rank), key=priorities.__getitem__)
+        order += [position for position, rank in enumerate(priorities) if not rank]
+        return {
+            'scenario': json.dumps(scenario),
+            'is_conflict': 'yes' if self.is_conflict[index] else 'no',
+            'number_of_conflicts': len(decisions),
+            'places_of_conflicts': places,
+            'conflict_vehicles': conflict_vehicles,
+            'decisions': decisions,
+            'priority_order': {ids[position]: priorities[position] or None for position in order},
+            'waiting_times': {ids[position]: waits[position] for position in order},
+        }
+
+    def to_dataframe(self, start=0, stop=None):
+        """
+        Builds the records of a range of scenarios.
+
+        Args:
+            start (int): First scenario.
+            stop (int, optional): End of the range (default: all scenarios).
+
+        Returns:
+            pd.DataFrame: Records with the columns of `generate_dataset`.
+        """
+        stop = len(self) if stop is None else stop
+        return pd.DataFrame([self.record(index) for index in range(start, stop)])
+
+    def to_vehicle_batch(self, intersection_layout):
+        """
+        Converts the vehicles into a VehicleBatch, e.g. for `detect_conflicts_batch`.
+
+        Args:
+            intersection_layout (dict or CompiledIntersectionLayout): Layout used to classify movements.
+
+        Returns:
+            VehicleBatch: The vehicles of all scenarios (kinematics widened to float64).
+        """
+        if not isinstance(intersection_layout, CompiledIntersectionLayout):
+            intersection_layout = CompiledIntersectionLayout(intersection_layout)
+        lane_codes = intersection_layout.lane_codes(self.lanes)
+        destination_codes = intersection_layout.destination_codes(self.destinations)
+        movement = intersection_layout.classify(self.direction, lane_codes[self.lane],
+                                                destination_codes[self.destination])
+        return VehicleBatch(
+            self.speed, self.distance, self.direction, movement, self.lane, self.destination,
+            self.vehicle_id, self.vehicle_offsets, self.lanes, self.destinations, self.vehicle_ids
+        )
+
+
+def load_columnar(path):
+    """
+    Opens a columnar dataset with memory maps.
+
+    Only the header is read; column data is paged in on access.
+
+    Args:
+        path (str): Dataset directory.
+
+    Returns:
+        ColumnarDataset: The dataset.
+
+    Raises:
+        ValueError: If the directory does not hold a dataset of this format or a column is truncated.
+    """
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+    if meta.get('format') != FORMAT_NAME or meta.get('version') != FORMAT_VERSION:
+        raise ValueError(f"'{path}' is not a version {FORMAT_VERSION} columnar dataset.")
+
+    lengths = {
+        'vehicle_offsets': meta['num_scenarios'] + 1,
+        'conflict_offsets': meta['num_scenarios'] + 1,
+        'is_conflict': meta['num_scenarios'],
+    }
+    arrays = {}
+    for name, dtype in meta['columns'].items():
+        if name.startswith('conflict_') and name != 'conflict_offsets':
+            length = meta['num_conflicts']
+        else:
+            length = lengths.get(name, meta['num_vehicles'])
+        dtype = np.dtype(dtype)
+        file_path = os.path.join(path, f'{name}.bin')
+        if os.path.getsize(file_path) != length * dtype.itemsize:
+            raise ValueError(f"Column '{name}' of '{path}' does not hold {length} values.")
+        # Empty files cannot be memory-mapped
+        arrays[name] = np.memmap(file_path, dtype=dtype, mode='r', shape=(length,)) if length \
+            else np.zeros(0, dtype=dtype)
+    return ColumnarDataset(path, meta, arrays)
+
+
+def write_columnar(chunks, path):
+    """
+    Writes records to a columnar dataset.
+
+    Args:
+        chunks (pd.DataFrame or iterable of pd.DataFrame): Records, e.g. from `generate_dataset`
+            or `iter_dataset_chunks`.
+        path (str): Dataset directory.
+
+    Returns:
+        int: Number of scenarios written.
+    """
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    with ColumnarDatasetWriter(path) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    return writer.num_scenarios
+
+
+def convert_csv(csv_path, path, chunk_size=100000):
+    """
+    Converts a CSV dataset written by `generate_dataset` to a columnar dataset.
+
+    The CSV is read `chunk_size` rows at a time, so files of any size can be converted.
+
+    Args:
+        csv_path (str): CSV file.
+        path (str): Dataset directory.
+        chunk_size (int): Rows read at a time.
+
+    Returns:
+        int: Number of scenarios converted.
+    """
+    return write_columnar(pd.read_csv(csv_path, chunksize=chunk_size), path)
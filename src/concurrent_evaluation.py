@@ -0,0 +1,322 @@
+# src/concurrent_evaluation.py
+
+"""
+Concurrent Evaluation Module
+
+This module evaluates a chat model on many test conversations at once. A
+pool of threads sends requests to an OpenAI-compatible chat completions
+endpoint, a token bucket keeps the request rate under the account limit,
+and responses with status 429 or 5xx (and connection errors) are retried
+with exponential backoff and jitter, honoring `Retry-After`. Each thread
+keeps its connection to the server alive between requests, so only the
+first request of a thread pays for the TCP and TLS handshakes. Predictions
+are collected in the order of the test data, whatever order the responses
+arrive in.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import http.client
+import io
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_BASE_URL = 'https://api.openai.com/v1'
+DEFAULT_CONCURRENCY = 8
+DEFAULT_TIMEOUT = 30.0          # seconds per request
+DEFAULT_MAX_RETRIES = 6
+DEFAULT_BACKOFF_BASE = 0.5      # seconds before the first retry
+DEFAULT_BACKOFF_CAP = 30.0      # longest wait between retries
+
+# Predicted label of a test example whose request failed after all retries
+ERROR_LABEL = 'error'
+
+
+def is_retryable(status):
+    """
+    Tells whether a response status is worth retrying.
+
+    Args:
+        status (int): HTTP status code.
+
+    Returns:
+        bool: True for 429 (rate limited) and 5xx (server errors).
+    """
+    return status == 429 or 500 <= status < 600
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiting the rate of requests.
+
+    The bucket holds up to `capacity` tokens and refills at `rate` tokens per
+    second; every request takes one token, waiting until one is available.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Creates a full bucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (float, optional): Largest burst (default: one second of tokens, at least 1).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Takes one token, sleeping until the bucket has one.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+class ChatCompletionsClient:
+    """
+    Minimal client of an OpenAI-compatible chat completions endpoint.
+
+    Safe to share between threads: every thread gets its own keep-alive
+    connection, so the client holds a pool of at most one connection per
+    thread. Only the standard library is used, so it also runs where the
+    `openai` package is not installed, e.g. against a local stand-in server.
+    Use it as a context manager, or call `close`, to close the connections.
+    """
+
+    def __init__(self, model, api_key=None, base_url=DEFAULT_BASE_URL, timeout=DEFAULT_TIMEOUT,
+                 max_retries=DEFAULT_MAX_RETRIES, backoff_base=DEFAULT_BACKOFF_BASE, backoff_cap=DEFAULT_BACKOFF_CAP,
+                 rate_limiter=None):
+        """
+        Configures the client.
+
+        Args:
+            model (str): Model ID, e.g. a fine-tuned model.
+            api_key (str, optional): Bearer token.
+            base_url (str): API root; requests go to '<base_url>/chat/completions'.
+            timeout (float): Seconds to wait for each response.
+            max_retries (int): Retries of a request after a retryable failure.
+            backoff_base (float): Wait before the first retry; it doubles with every retry.
+            backoff_cap (float): Longest wait between retries.
+            rate_limiter (TokenBucket, optional): Limiter every attempt waits on.
+        """
+        self.model = model
+        self.api_key = api_key
+        self.url = base_url.rstrip('/') + '/chat/completions'
+        url = urllib.parse.urlsplit(self.url)
+        if url.scheme not in ('http', 'https'):
+            raise ValueError(f"Unsupported URL scheme: {url.scheme!r}.")
+        self._connection_class = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        self._address = (url.hostname, url.port)
+        self._path = url.path + (f'?{url.query}' if url.query else '')
+        self._headers = {'Accept': 'application/json', 'Content-Type': 'application/json'}
+        if api_key:
+            self._headers['Authorization'] = f'Bearer {api_key}'
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.rate_limiter = rate_limiter
+        self.retries = 0
+        self.connections_opened = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Closes the connections of all threads. Later requests open new ones.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+
+    def _connection(self):
+        """
+        Returns the calling thread's connection, creating it on first use.
+        """
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._connection_class(*self._address, timeout=self.timeout)
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _backoff(self, attempt, retry_after=None):
+        """
+        Returns the wait before retry `attempt` (0-based): the server's Retry-After if given,
+        else a random wait up to the capped exponential delay ("full jitter").
+        """
+        if retry_after is not None:
+            try:
+                return min(self.backoff_cap, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def _post(self, body):
+        """
+        Sends one request on the thread's connection and returns the decoded JSON response.
+
+        If the server has closed a kept-alive connection in the meantime, the request is sent
+        again at once on a new connection; that is not counted as a retry.
+        """
+        data = json.dumps(body).encode('utf-8')
+        while True:
+            connection = self._connection()
+            reused = connection.sock is not None
+            if not reused:
+                with self._lock:
+                    self.connections_opened += 1
+            try:
+                connection.request('POST', self._path, body=data, headers=self._headers)
+                response = connection.getresponse()
+                payload = response.read()
+            except ConnectionError:
+                connection.close()
+                if reused:
+                    continue
+                raise
+            except (http.client.HTTPException, OSError):
+                connection.close()
+                raise
+            if response.status >= 400:
+                raise urllib.error.HTTPError(self.url, response.status, response.reason, response.headers,
+                                             io.BytesIO(payload))
+            return json.loads(payload)
+
+    def complete(self, messages, max_tokens=5, temperature=0.0, stop=None):
+        """
+        Requests a chat completion, retrying rate limits, server errors and connection failures.
+
+        Args:
+            messages (list of dict): Chat messages with 'role' and 'content'.
+            max_tokens (int): Longest answer.
+            temperature (float): Sampling temperature.
+            stop (list of str, optional): Sequences that end the answer.
+
+        Returns:
+            str: Content of the first choice.
+
+        Raises:
+            urllib.error.HTTPError: On a non-retryable status, or when the retries are used up.
+            urllib.error.URLError: When the server stays unreachable.
+            ValueError: If the response holds an error instead of choices.
+            KeyError: If the response has no choices.
+        """
+        body = {'model': self.model, 'messages': messages, 'max_tokens': max_tokens, 'temperature': temperature}
+        if stop:
+            body['stop'] = stop
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                response = self._post(body)
+            except urllib.error.HTTPError as error:
+                if not is_retryable(error.code) or attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt, error.headers.get('Retry-After'))
+            except (urllib.error.URLError, http.client.HTTPException, TimeoutError, ConnectionError):
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                if 'error' in response:
+                    raise ValueError(response['error'])
+                return response['choices'][0]['message']['content']
+            with self._lock:
+                self.retries += 1
+            time.sleep(delay)
+
+
+def evaluate_chat_completions(test_data, client, concurrency=DEFAULT_CONCURRENCY, max_tokens=5, progress_every=0):
+    """
+    Predicts the labels of test conversations with concurrent requests.
+
+    Each conversation's system and user messages are sent, and the answer
+    is compared with its assistant message. A request that still fails after
+    the client's retries is counted in 'errors' and predicted as ERROR_LABEL,
+    so one bad request does not lose the whole run.
+
+    Args:
+        test_data (list of dict): Conversations in GPT's chat format ({'messages': [system, user, assistant]}).
+        client (ChatCompletionsClient): Client to send the requests with.
+        concurrency (int): Number of requests in flight.
+        max_tokens (int): Longest answer.
+        progress_every (int): Print the running accuracy after this many predictions (0: never).
+
+    Returns:
+        tuple: (list of true labels, list of predicted labels, in the order of `test_data`,
+            dictionary with the number of 'requests', 'errors', 'retries', 'correct', the
+            'accuracy', 'elapsed' seconds and 'requests_per_second')
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1.")
+
+    def predict(item):
+        try:
+            answer = client.complete(item['messages'][:2], max_tokens=max_tokens)
+        except (urllib.error.URLError, http.client.HTTPException, TimeoutError, ConnectionError, KeyError,
+                ValueError):
+            return None
+        return answer.strip().lower()
+
+    start = time.perf_counter()
+    retries_before = client.retries
+    y_true = [item['messages'][2]['content'].strip().lower() for item in test_data]
+    y_pred = []
+    errors = correct = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        # map yields in submission order while up to `concurrency` requests run
+        for true_label, predicted_label in zip(y_true, executor.map(predict, test_data)):
+            if predicted_label is None:
+                errors += 1
+                predicted_label = ERROR_LABEL
+            correct += predicted_label == true_label
+            y_pred.append(predicted_label)
+            if progress_every and len(y_pred) % progress_every == 0:
+                print(f"Scenario {len(y_pred)}/{len(test_data)}, Ongoing Accuracy: "
+                      f"{correct / len(y_pred) * 100:.2f}%, Errors: {errors}")
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        'requests': len(test_data),
+        'errors': errors,
+        'retries': client.retries - retries_before,
+        'correct': correct,
+        'accuracy': correct / len(test_data) if test_data else 0.0,
+        'elapsed': elapsed,
+        'requests_per_second': len(test_data) / elapsed if elapsed else 0.0,
+    }
+    return y_true, y_pred, stats
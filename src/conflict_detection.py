@@ -11,10 +11,20 @@ Author: Your Name
 Date: YYYY-MM-DD
 """
 
+import copy
 import json
 import math
 import warnings
 
+from .rule_tables import (
+    NUM_MOVEMENTS,
+    PATH_RULES,
+    CONFLICT_TABLE,
+    PATH_RULE_TABLE,
+    PRIORITY_TABLE,
+    RIGHT_OF_TABLE,
+)
+
 # Mapping of opposite directions
 OPPOSITE_DIRECTIONS = {
     'north': 'south',
@@ -23,8 +33,18 @@ OPPOSITE_DIRECTIONS = {
     'west': 'east'
 }
 
-# Enable or disable logging for debugging
-log = False
+# Integer codes used by the columnar/batch code paths
+DIRECTION_CODES = {'north': 0, 'east': 1, 'south': 2, 'west': 3}
+MOVEMENT_CODES = {'straight': 0, 'left': 1, 'right': 2, 'unknown': 3}
+
+# Maximum difference in arrival times (seconds) for two vehicles to conflict
+ARRIVAL_TIME_THRESHOLD = 4.0
+
+# Maximum difference in arrival times (seconds) for the movement rules to decide priority
+PRIORITY_TIME_THRESHOLD = 1.0
+
+# Time in seconds a vehicle needs to clear the intersection
+TRAVERSAL_TIME = 2
 
 
 def parse_intersection_layout(data):
@@ -40,6 +60,42 @@ def parse_intersection_layout(data):
     return data['intersection_layout']
 
 
+# id of a dictionary layout -> (copy of the layout, its CompiledIntersectionLayout or None if malformed)
+_compiled_layouts = {}
+
+
+def compile_intersection_layout(intersection_layout):
+    """
+    Compiles a dictionary layout once for the callers that classify many vehicles.
+
+    A CompiledIntersectionLayout is returned as is. A malformed dictionary is
+    returned unchanged, so `Vehicle.get_movement_type` warns and classifies
+    its vehicles as 'unknown' instead of failing the whole scenario.
+
+    Args:
+        intersection_layout (dict or CompiledIntersectionLayout): Layout of the intersection.
+
+    Returns:
+        CompiledIntersectionLayout or dict: The compiled layout, or the malformed dictionary.
+    """
+    if not isinstance(intersection_layout, dict):
+        return intersection_layout
+    cached = _compiled_layouts.get(id(intersection_layout))
+    # The copy catches a dictionary that was changed, or a new one at a reused address
+    if cached is not None and cached[0] == intersection_layout:
+        return intersection_layout if cached[1] is None else cached[1]
+    # intersection_layout imports this module, so it is imported here
+    from .intersection_layout import CompiledIntersectionLayout
+    try:
+        compiled_layout = CompiledIntersectionLayout(intersection_layout)
+    except ValueError:
+        compiled_layout = None
+    if len(_compiled_layouts) >= 8:
+        _compiled_layouts.clear()
+    _compiled_layouts[id(intersection_layout)] = (copy.deepcopy(intersection_layout), compiled_layout)
+    return intersection_layout if compiled_layout is None else compiled_layout
+
+
 class Vehicle:
     """
     Represents a vehicle approaching an intersection.
@@ -57,6 +113,18 @@ class Vehicle:
 
     VALID_DIRECTIONS = ['north', 'east', 'south', 'west']
 
+    # No per-instance __dict__: datasets hold millions of vehicles
+    __slots__ = (
+        'vehicle_id',
+        'lane',
+        'speed',
+        'distance_to_intersection',
+        'direction',
+        'destination',
+        'time_to_intersection',
+        'movement_type',
+    )
+
     def __init__(
         self,
         vehicle_id,
@@ -77,7 +145,7 @@ class Vehicle:
             distance_to_intersection (float): Distance to intersection in meters.
             direction (str): Direction of approach.
             destination (str): Destination road.
-            intersection_layout (dict): Layout of the intersection.
+            intersection_layout (dict or CompiledIntersectionLayout): Layout of the intersection.
         """
         self.vehicle_id = vehicle_id
         self.lane = str(lane)
@@ -88,12 +156,6 @@ class Vehicle:
         self.validate_inputs()
         self.time_to_intersection = self.compute_time_to_intersection()
         self.movement_type = self.get_movement_type(intersection_layout)
-        # If logging is enabled, print vehicle information after initialization
-        if log:
-            print(f"Initialized Vehicle {self.vehicle_id}: lane={self.lane}, speed={self.speed}, "
-                  f"distance_to_intersection={self.distance_to_intersection}, direction={self.direction}, "
-                  f"destination={self.destination}, movement_type={self.movement_type}, "
-                  f"time_to_intersection={self.time_to_intersection:.2f}s")
 
     def validate_inputs(self):
         """
@@ -126,7 +188,7 @@ class Vehicle:
         Determines the movement type (straight, left, right) based on the intersection layout.
 
         Args:
-            intersection_layout (dict): Layout of the intersection.
+            intersection_layout (dict or CompiledIntersectionLayout): Layout of the intersection.
 
         Returns:
             str: Movement type ('straight', 'left', 'right', or 'unknown').
@@ -135,7 +197,21 @@ class Vehicle:
         lane = self.lane
         destination = self.destination
 
-        lane_destinations = intersection_layout.get(direction, {}).get(lane, [])
+        if isinstance(intersection_layout, dict):
+            lane_destinations = intersection_layout.get(direction, {}).get(lane, [])
+        else:
+            # CompiledIntersectionLayout: every combination is resolved up front
+            movement_type = intersection_layout.movement_type(direction, lane, destination)
+            if movement_type != 'unknown':
+                return movement_type
+            lane_destinations = intersection_layout.destinations_for(direction, lane)
+            if lane_destinations and destination in lane_destinations:
+                warnings.warn(
+                    f"Vehicle {self.vehicle_id} has unknown movement type.",
+                    category=UserWarning
+                )
+                return movement_type
+
         if not lane_destinations:
             warnings.warn(
                 f"Vehicle {self.vehicle_id} is in an unknown lane '{lane}' for direction '{direction}'.",
@@ -178,11 +254,13 @@ def parse_vehicles(data, intersection_layout):
 
     Args:
         data (dict): Vehicle scenario data.
-        intersection_layout (dict): Layout of the intersection.
+        intersection_layout (dict or CompiledIntersectionLayout): Layout of the intersection.
 
     Returns:
         list of Vehicle: List of Vehicle objects.
     """
+    # Compiled once per scenario rather than once per vehicle
+    intersection_layout = compile_intersection_layout(intersection_layout)
     vehicles = []
     vehicle_ids = set()
     for vehicle_data in data['vehicles_scenario']:
@@ -203,10 +281,28 @@ def parse_vehicles(data, intersection_layout):
     return vehicles
 
 
+def rule_class(vehicle):
+    """
+    Returns the row/column index of a vehicle in the precompiled rule tables.
+
+    Args:
+        vehicle (Vehicle): The vehicle.
+
+    Returns:
+        int: `direction_code * 3 + movement_code`, or None for an unknown movement.
+    """
+    movement_code = MOVEMENT_CODES[vehicle.movement_type]
+    if movement_code >= NUM_MOVEMENTS:
+        return None
+    return DIRECTION_CODES[vehicle.direction] * NUM_MOVEMENTS + movement_code
+
+
 def paths_cross(vehicle1, vehicle2):
     """
     Determines if the paths of two vehicles cross.
 
+    The rules are precompiled into `CONFLICT_TABLE` (see `reference_rules.py`).
+
     Args:
         vehicle1 (Vehicle): First vehicle.
         vehicle2 (Vehicle): Second vehicle.
@@ -214,84 +310,34 @@ def paths_cross(vehicle1, vehicle2):
     Returns:
         bool: True if paths cross, False otherwise.
     """
-    if log:
-        print(f"Checking if paths cross between Vehicle {vehicle1.vehicle_id} and Vehicle {vehicle2.vehicle_id}")
-    if 'unknown' in [vehicle1.movement_type, vehicle2.movement_type]:
-        if log:
-            print(f"At least one vehicle has unknown movement type: {vehicle1.movement_type}, {vehicle2.movement_type}")
-        return False
-    if vehicle1.vehicle_id == vehicle2.vehicle_id:
-        if log:
-            print("Comparing the same vehicle.")
+    class1 = rule_class(vehicle1)
+    class2 = rule_class(vehicle2)
+    if class1 is None or class2 is None or vehicle1.vehicle_id == vehicle2.vehicle_id:
         return False
+    return CONFLICT_TABLE[class1][class2] == 1
 
-    # Same direction
-    if vehicle1.direction == vehicle2.direction:
-        if log:
-            print(f"Vehicles are coming from the same direction: {vehicle1.direction}")
-        return False
 
-    # Vehicles going straight from opposite directions do not conflict
-    if vehicle1.movement_type == 'straight' and vehicle2.movement_type == 'straight' and \
-       OPPOSITE_DIRECTIONS[vehicle1.direction] == vehicle2.direction:
-        if log:
-            print(f"Vehicles are going straight from opposite directions: {vehicle1.direction} and {vehicle2.direction}")
-        return False
+def path_rule(vehicle1, vehicle2):
+    """
+    Returns the name of the rule that decides whether the paths of two vehicles cross.
 
-    # Opposite left turns do not conflict
-    if vehicle1.movement_type == 'left' and vehicle2.movement_type == 'left' and \
-       OPPOSITE_DIRECTIONS[vehicle1.direction] == vehicle2.direction:
-        if log:
-            print(f"Vehicles are making left turns from opposite directions: {vehicle1.direction} and {vehicle2.direction}")
-        return False
+    Args:
+        vehicle1 (Vehicle): First vehicle.
+        vehicle2 (Vehicle): Second vehicle.
 
-    # Right turns from opposite directions do not conflict
-    if vehicle1.movement_type == 'right' and vehicle2.movement_type == 'right' and \
-       OPPOSITE_DIRECTIONS[vehicle1.direction] == vehicle2.direction:
-        if log:
-            print(f"Vehicles are making right turns from opposite directions: {vehicle1.direction} and {vehicle2.direction}")
-        return False
+    Returns:
+        str: One of PATH_RULES (see `reference_rules.py`).
+    """
+    class1 = rule_class(vehicle1)
+    class2 = rule_class(vehicle2)
+    if class1 is None or class2 is None:
+        return 'unknown_movement'
+    if vehicle1.vehicle_id == vehicle2.vehicle_id:
+        return 'same_vehicle'
+    return PATH_RULES[PATH_RULE_TABLE[class1][class2]]
 
-    # Right turns from adjacent directions do not conflict
-    if vehicle1.movement_type == 'right' and vehicle2.movement_type == 'right' and \
-       vehicle1.direction != vehicle2.direction and \
-       OPPOSITE_DIRECTIONS[vehicle1.direction] != vehicle2.direction:
-        if log:
-            print(f"Vehicles are making right turns from adjacent directions: {vehicle1.direction} and {vehicle2.direction}")
-        return False
 
-    # Vehicles going straight from perpendicular directions conflict
-    if vehicle1.movement_type == 'straight' and vehicle2.movement_type == 'straight' and \
-       (vehicle1.direction != vehicle2.direction) and \
-       (OPPOSITE_DIRECTIONS[vehicle1.direction] != vehicle2.direction):
-        if log:
-            print(f"Vehicles are going straight from perpendicular directions: {vehicle1.direction} and {vehicle2.direction}")
-        return True
-
-    # Left turn conflicts
-    if vehicle1.movement_type == 'left' or vehicle2.movement_type == 'left':
-        if log:
-            print(f"At least one vehicle is turning left: {vehicle1.movement_type}, {vehicle2.movement_type}")
-        return True
-
-    # Right turn vs straight from adjacent directions conflict
-    if (vehicle1.movement_type == 'right' and vehicle2.movement_type == 'straight' and \
-        (vehicle1.direction != vehicle2.direction) and \
-        (OPPOSITE_DIRECTIONS[vehicle1.direction] != vehicle2.direction)) or \
-       (vehicle2.movement_type == 'right' and vehicle1.movement_type == 'straight' and \
-        (vehicle1.direction != vehicle2.direction) and \
-        (OPPOSITE_DIRECTIONS[vehicle2.direction] != vehicle1.direction)):
-        if log:
-            print("One vehicle is turning right and the other is going straight from adjacent directions.")
-        return True
-
-    # For all other cases, assume paths do not cross
-    if log:
-        print(f"Vehicles do not conflict: {vehicle1.vehicle_id} and {vehicle2.vehicle_id}")
-    return False
-
-
-def arrival_time_close(vehicle1, vehicle2, threshold=4.0):
+def arrival_time_close(vehicle1, vehicle2, threshold=ARRIVAL_TIME_THRESHOLD):
     """
     Checks if the arrival times of two vehicles are within a certain threshold.
 
@@ -304,12 +350,8 @@ def arrival_time_close(vehicle1, vehicle2, threshold=4.0):
         bool: True if arrival times are within the threshold, False otherwise.
     """
     if vehicle1.time_to_intersection == float('inf') or vehicle2.time_to_intersection == float('inf'):
-        if log:
-            print(f"At least one vehicle has infinite time to intersection: {vehicle1.time_to_intersection}, {vehicle2.time_to_intersection}")
         return False
     time_diff = abs(vehicle1.time_to_intersection - vehicle2.time_to_intersection)
-    if log:
-        print(f"Time difference between Vehicle {vehicle1.vehicle_id} and Vehicle {vehicle2.vehicle_id}: {time_diff:.2f}s")
     return time_diff <= threshold
 
 
@@ -324,19 +366,46 @@ def is_vehicle_on_right(vehicle1, vehicle2):
     Returns:
         bool: True if vehicle2 is on the right of vehicle1, False otherwise.
     """
-    direction_order = ['north', 'east', 'south', 'west']
-    idx1 = direction_order.index(vehicle1.direction)
-    idx2 = direction_order.index(vehicle2.direction)
-    result = (idx2 - idx1) % 4 == 1
-    if log:
-        print(f"Vehicle {vehicle2.vehicle_id} is {'on the right of' if result else 'not on the right of'} Vehicle {vehicle1.vehicle_id}")
-    return result
+    return RIGHT_OF_TABLE[DIRECTION_CODES[vehicle1.direction]][DIRECTION_CODES[vehicle2.direction]] == 1
+
+
+def priority_winner(vehicle1, vehicle2):
+    """
+    Determines which of two vehicles has priority.
+
+    Within 1 second the movement and right-hand rules decide, looked up in
+    `PRIORITY_TABLE`; otherwise the vehicle that arrives later must yield.
+
+    Args:
+        vehicle1 (Vehicle): First vehicle.
+        vehicle2 (Vehicle): Second vehicle.
+
+    Returns:
+        int: 0 if vehicle1 has priority, 1 if vehicle2 has priority.
+    """
+    time_difference = abs(vehicle1.time_to_intersection - vehicle2.time_to_intersection)
+    if time_difference <= PRIORITY_TIME_THRESHOLD:
+        class1 = rule_class(vehicle1)
+        class2 = rule_class(vehicle2)
+        if class1 is None or class2 is None:
+            # Unknown movements only take part in the straight and right-hand rules
+            if vehicle1.movement_type == 'straight':
+                return 0
+            if vehicle2.movement_type == 'straight':
+                return 1
+            return 1 if is_vehicle_on_right(vehicle1, vehicle2) else 0
+        return PRIORITY_TABLE[class1][class2]
+    # Vehicle that arrives later must yield
+    return 1 if vehicle1.time_to_intersection > vehicle2.time_to_intersection else 0
 
 
 def apply_priority_rules(vehicle1, vehicle2):
     """
     Applies priority rules to determine which vehicle must yield.
 
+    Within 1 second the movement and right-hand rules decide, looked up in
+    `PRIORITY_TABLE`; otherwise the vehicle that arrives later must yield.
+
     Args:
         vehicle1 (Vehicle): First vehicle.
         vehicle2 (Vehicle): Second vehicle.
@@ -344,63 +413,12 @@ def apply_priority_rules(vehicle1, vehicle2):
     Returns:
         tuple: (decision message, vehicle priorities dictionary)
     """
-    if log:
-        print(f"Applying priority rules between Vehicle {vehicle1.vehicle_id} and Vehicle {vehicle2.vehicle_id}")
-    time_difference = abs(vehicle1.time_to_intersection - vehicle2.time_to_intersection)
-    if log:
-        print(f"Time difference: {time_difference:.2f}s")
-    priority = {}
-    if time_difference <= 1.0:
-        if log:
-            print("Vehicles arrive within 1 second of each other")
-        # 1. Straight over turn
-        if vehicle1.movement_type == 'straight' and vehicle2.movement_type != 'straight':
-            if log:
-                print(f"Vehicle {vehicle1.vehicle_id} is going straight, Vehicle {vehicle2.vehicle_id} is turning")
-            decision = f"Potential conflict: Vehicle {vehicle2.vehicle_id} must yield to Vehicle {vehicle1.vehicle_id}"
-            priority = {vehicle1.vehicle_id: 1, vehicle2.vehicle_id: 2}
-        elif vehicle2.movement_type == 'straight' and vehicle1.movement_type != 'straight':
-            if log:
-                print(f"Vehicle {vehicle2.vehicle_id} is going straight, Vehicle {vehicle1.vehicle_id} is turning")
-            decision = f"Potential conflict: Vehicle {vehicle1.vehicle_id} must yield to Vehicle {vehicle2.vehicle_id}"
-            priority = {vehicle2.vehicle_id: 1, vehicle1.vehicle_id: 2}
-        # 2. Right turn over left turn
-        elif vehicle1.movement_type == 'right' and vehicle2.movement_type == 'left':
-            if log:
-                print(f"Vehicle {vehicle1.vehicle_id} is turning right, Vehicle {vehicle2.vehicle_id} is turning left")
-            decision = f"Potential conflict: Vehicle {vehicle2.vehicle_id} must yield to Vehicle {vehicle1.vehicle_id}"
-            priority = {vehicle1.vehicle_id: 1, vehicle2.vehicle_id: 2}
-        elif vehicle2.movement_type == 'right' and vehicle1.movement_type == 'left':
-            if log:
-                print(f"Vehicle {vehicle2.vehicle_id} is turning right, Vehicle {vehicle1.vehicle_id} is turning left")
-            decision = f"Potential conflict: Vehicle {vehicle1.vehicle_id} must yield to Vehicle {vehicle2.vehicle_id}"
-            priority = {vehicle2.vehicle_id: 1, vehicle1.vehicle_id: 2}
-        # 3. Right-hand rule
-        else:
-            if is_vehicle_on_right(vehicle1, vehicle2):
-                if log:
-                    print(f"Vehicle {vehicle2.vehicle_id} is on the right of Vehicle {vehicle1.vehicle_id}")
-                decision = f"Potential conflict: Vehicle {vehicle1.vehicle_id} must yield to Vehicle {vehicle2.vehicle_id}"
-                priority = {vehicle2.vehicle_id: 1, vehicle1.vehicle_id: 2}
-            else:
-                if log:
-                    print(f"Vehicle {vehicle1.vehicle_id} is on the right of Vehicle {vehicle2.vehicle_id}")
-                decision = f"Potential conflict: Vehicle {vehicle2.vehicle_id} must yield to Vehicle {vehicle1.vehicle_id}"
-                priority = {vehicle1.vehicle_id: 1, vehicle2.vehicle_id: 2}
+    if priority_winner(vehicle1, vehicle2):
+        first, second = vehicle2, vehicle1
     else:
-        # Vehicle that arrives later must yield
-        if vehicle1.time_to_intersection > vehicle2.time_to_intersection:
-            if log:
-                print(f"Vehicle {vehicle1.vehicle_id} arrives later than Vehicle {vehicle2.vehicle_id}")
-            decision = f"Potential conflict: Vehicle {vehicle1.vehicle_id} must yield to Vehicle {vehicle2.vehicle_id}"
-            priority = {vehicle2.vehicle_id: 1, vehicle1.vehicle_id: 2}
-        else:
-            if log:
-                print(f"Vehicle {vehicle2.vehicle_id} arrives later than Vehicle {vehicle1.vehicle_id}")
-            decision = f"Potential conflict: Vehicle {vehicle2.vehicle_id} must yield to Vehicle {vehicle1.vehicle_id}"
-            priority = {vehicle1.vehicle_id: 1, vehicle2.vehicle_id: 2}
-    if log:
-        print(f"Decision: {decision}")
+        first, second = vehicle1, vehicle2
+    decision = f"Potential conflict: Vehicle {second.vehicle_id} must yield to Vehicle {first.vehicle_id}"
+    priority = {first.vehicle_id: 1, second.vehicle_id: 2}
     return decision, priority
 
 
@@ -408,6 +426,12 @@ def compute_waiting_times(vehicles, priorities):
     """
     Computes the waiting time for each vehicle based on priority and arrival times.
 
+    Each vehicle waits until every vehicle with a higher priority (lower
+    number) has cleared the intersection. Only the latest arrival among the
+    higher priority vehicles matters, so the vehicles are grouped by priority
+    level once instead of being searched for every pair. To schedule a whole
+    scenario use `scheduling.schedule_intersection`.
+
     Args:
         vehicles (list of Vehicle): List of Vehicle objects.
         priorities (dict): Dictionary mapping vehicle IDs to their priority levels.
@@ -415,40 +439,212 @@ def compute_waiting_times(vehicles, priorities):
     Returns:
         dict: Dictionary mapping vehicle IDs to their waiting times.
     """
-    # The vehicle with higher priority (lower number) proceeds first.
-    # Waiting time is the difference in arrival times if lower priority vehicle arrives earlier.
+    vehicles_by_id = {}
+    for vehicle in vehicles:
+        vehicles_by_id.setdefault(vehicle.vehicle_id, vehicle)
+
+    # Latest arrival at each priority level, then the latest over all higher levels
+    latest_at_level = {}
+    for vehicle_id, priority in priorities.items():
+        vehicle = vehicles_by_id.get(vehicle_id)
+        if vehicle is not None:
+            latest_at_level[priority] = max(latest_at_level.get(priority, -math.inf), vehicle.time_to_intersection)
+        else:
+            latest_at_level.setdefault(priority, -math.inf)
+    latest_before_level = {}
+    latest = -math.inf
+    for priority in sorted(latest_at_level):
+        latest_before_level[priority] = latest
+        latest = max(latest, latest_at_level[priority])
+
     waiting_times = {}
     for vehicle_id, priority in priorities.items():
-        vehicle = next((v for v in vehicles if v.vehicle_id == vehicle_id), None)
+        vehicle = vehicles_by_id.get(vehicle_id)
         if vehicle is None:
             continue
         # Vehicles with priority 1 have zero waiting time
-        if priority == 1:
+        latest_higher = latest_before_level[priority]
+        if priority == 1 or latest_higher == -math.inf:
             waiting_times[vehicle_id] = 0
         else:
-            # Find the vehicle(s) with higher priority
-            higher_priority_vehicles = [v_id for v_id, p in priorities.items() if p < priority]
-            max_wait = 0
-            for hp_vehicle_id in higher_priority_vehicles:
-                hp_vehicle = next((v for v in vehicles if v.vehicle_id == hp_vehicle_id), None)
-                if hp_vehicle:
-                    # Calculate the additional waiting time needed
-                    traversal_time = 2  # Assume it takes 2 seconds to clear the intersection
-                    wait_time = max(0, (hp_vehicle.time_to_intersection + traversal_time) - vehicle.time_to_intersection)
-                    max_wait = max(max_wait, wait_time)
-            waiting_times[vehicle_id] = math.ceil(max_wait)
+            wait_time = max(0, (latest_higher + TRAVERSAL_TIME) - vehicle.time_to_intersection)
+            waiting_times[vehicle_id] = math.ceil(wait_time)
     return waiting_times
 
 
-def detect_conflicts(vehicles):
+class ConflictRecord:
+    """
+    Compact record of a conflict between two vehicles.
+
+    Only the vehicle indices, the winner and the wait are stored. The fields
+    of the dictionary format of `detect_conflicts` ('vehicle1_id', 'decision',
+    'priority_order', ...) are built on access, so records can be read like
+    those dictionaries.
+
+    Attributes:
+        vehicles (list of Vehicle): Vehicles of the scenario (shared, not copied).
+        index1 (int): Index of the first vehicle in `vehicles`.
+        index2 (int): Index of the second vehicle in `vehicles`.
+        winner (int): 0 if the first vehicle has priority, 1 if the second has.
+        wait (int): Waiting time in whole seconds of the vehicle that must yield.
+    """
+
+    __slots__ = ('vehicles', 'index1', 'index2', 'winner', 'wait')
+
+    KEYS = ('vehicle1_id', 'vehicle2_id', 'decision', 'place', 'priority_order', 'waiting_times')
+
+    def __init__(self, vehicles, index1, index2, winner, wait):
+        self.vehicles = vehicles
+        self.index1 = index1
+        self.index2 = index2
+        self.winner = winner
+        self.wait = wait
+
+    @classmethod
+    def evaluate(cls, vehicles, index1, index2):
+        """
+        Builds the record of a conflict between two vehicles whose paths cross
+        and whose arrival times are close.
+
+        Args:
+            vehicles (sequence of Vehicle): Vehicles of the scenario.
+            index1 (int): Index of the first vehicle.
+            index2 (int): Index of the second vehicle.
+
+        Returns:
+            ConflictRecord: The conflict, with the same winner and wait as
+                `apply_priority_rules` and `compute_waiting_times`.
+        """
+        vehicle1 = vehicles[index1]
+        vehicle2 = vehicles[index2]
+        winner = priority_winner(vehicle1, vehicle2)
+        if winner:
+            wait = vehicle2.time_to_intersection + TRAVERSAL_TIME - vehicle1.time_to_intersection
+        else:
+            wait = vehicle1.time_to_intersection + TRAVERSAL_TIME - vehicle2.time_to_intersection
+        return cls(vehicles, index1, index2, winner, math.ceil(max(0, wait)))
+
+    @property
+    def vehicle1_id(self):
+        return self.vehicles[self.index1].vehicle_id
+
+    @property
+    def vehicle2_id(self):
+        return self.vehicles[self.index2].vehicle_id
+
+    @property
+    def place(self):
+        return 'intersection'
+
+    def _ordered_ids(self):
+        """
+        Returns the IDs of the vehicle with priority and of the yielding vehicle.
+        """
+        if self.winner:
+            return self.vehicle2_id, self.vehicle1_id
+        return self.vehicle1_id, self.vehicle2_id
+
+    @property
+    def decision(self):
+        first, second = self._ordered_ids()
+        return f"Potential conflict: Vehicle {second} must yield to Vehicle {first}"
+
+    @property
+    def priority_order(self):
+        first, second = self._ordered_ids()
+        return {first: 1, second: 2}
+
+    @property
+    def waiting_times(self):
+        first, second = self._ordered_ids()
+        return {first: 0, second: self.wait}
+
+    def keys(self):
+        return self.KEYS
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self.KEYS else default
+
+    def to_dict(self):
+        """
+        Returns the conflict in the dictionary format of `detect_conflicts`.
+
+        Returns:
+            dict: The conflict dictionary.
+        """
+        return {key: getattr(self, key) for key in self.KEYS}
+
+    def __eq__(self, other):
+        if isinstance(other, ConflictRecord):
+            other = other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return (f"ConflictRecord({self.vehicle1_id!r}, {self.vehicle2_id!r}, "
+                f"winner={self.winner}, wait={self.wait})")
+
+
+def sweep_candidate_pairs(vehicles, threshold=ARRIVAL_TIME_THRESHOLD):
+    """
+    Finds the pairs of vehicles whose arrival times are within the threshold.
+
+    Vehicles are sorted by time to intersection and each one is only compared
+    with the following vehicles inside the threshold window, which costs
+    O(n log n + k) for k candidate pairs. Vehicles whose time to intersection
+    is not finite (zero or NaN speeds and distances) are excluded, since
+    `arrival_time_close` never matches them and NaN would break the ordering.
+
+    Args:
+        vehicles (list of Vehicle): List of Vehicle objects.
+        threshold (float): Time difference threshold in seconds.
+
+    Returns:
+        list of tuple: Index pairs (i, j) with i < j, in the order of the
+            pairwise loop of `detect_conflicts`.
+    """
+    arrivals = sorted(
+        (vehicle.time_to_intersection, index)
+        for index, vehicle in enumerate(vehicles)
+        if math.isfinite(vehicle.time_to_intersection)
+    )
+    pairs = []
+    n = len(arrivals)
+    for a in range(n):
+        time_a, index_a = arrivals[a]
+        b = a + 1
+        # Same expression as arrival_time_close; the difference grows with b
+        while b < n and arrivals[b][0] - time_a <= threshold:
+            index_b = arrivals[b][1]
+            pairs.append((index_a, index_b) if index_a < index_b else (index_b, index_a))
+            b += 1
+    pairs.sort()
+    return pairs
+
+
+def detect_conflicts(vehicles, sweep=False, records=False):
     """
     Detects conflicts between vehicles approaching an intersection.
 
     Args:
         vehicles (list of Vehicle): List of Vehicle objects.
+        sweep (bool): If True, only evaluate the pairs found by `sweep_candidate_pairs`
+            instead of all n * (n - 1) / 2 pairs. The result is identical; this
+            pays off for scenarios with many vehicles.
+        records (bool): If True, return ConflictRecord objects instead of dictionaries.
+            The decision message and the dictionaries are then only built when read.
 
     Returns:
-        list of dict: List of conflicts detected. Each conflict is a dictionary containing:
+        list of dict: List of conflicts detected (ConflictRecord objects if `records`
+            is True). Each conflict is a dictionary containing:
             - 'vehicle1_id': ID of the first vehicle.
             - 'vehicle2_id': ID of the second vehicle.
             - 'decision': Conflict decision message.
@@ -458,30 +654,27 @@ def detect_conflicts(vehicles):
     """
     conflicts = []
     n = len(vehicles)
-    for i in range(n):
-        for j in range(i + 1, n):
-            vehicle1 = vehicles[i]
-            vehicle2 = vehicles[j]
-            if log:
-                print(f"\nEvaluating vehicles {vehicle1.vehicle_id} and {vehicle2.vehicle_id}")
-            if paths_cross(vehicle1, vehicle2):
-                if arrival_time_close(vehicle1, vehicle2):
-                    decision, priority = apply_priority_rules(vehicle1, vehicle2)
-                    waiting_times = compute_waiting_times([vehicle1, vehicle2], priority)
-                    conflicts.append({
-                        'vehicle1_id': vehicle1.vehicle_id,
-                        'vehicle2_id': vehicle2.vehicle_id,
-                        'decision': decision,
-                        'place': 'intersection',
-                        'priority_order': priority,
-                        'waiting_times': waiting_times
-                    })
-                else:
-                    if log:
-                        print("Vehicles do not arrive close in time; no conflict.")
-            else:
-                if log:
-                    print("Vehicles paths do not cross; no conflict.")
+    if sweep:
+        pairs = sweep_candidate_pairs(vehicles)
+    else:
+        pairs = ((i, j) for i in range(n) for j in range(i + 1, n))
+    for i, j in pairs:
+        vehicle1 = vehicles[i]
+        vehicle2 = vehicles[j]
+        if paths_cross(vehicle1, vehicle2) and arrival_time_close(vehicle1, vehicle2):
+            if records:
+                conflicts.append(ConflictRecord.evaluate(vehicles, i, j))
+                continue
+            decision, priority = apply_priority_rules(vehicle1, vehicle2)
+            waiting_times = compute_waiting_times([vehicle1, vehicle2], priority)
+            conflicts.append({
+                'vehicle1_id': vehicle1.vehicle_id,
+                'vehicle2_id': vehicle2.vehicle_id,
+                'decision': decision,
+                'place': 'intersection',
+                'priority_order': priority,
+                'waiting_times': waiting_times
+            })
 
     return conflicts
 
@@ -490,10 +683,10 @@ def output_conflicts(conflicts):
     """
     Outputs the conflicts detected.
 
+    Does nothing unless tracing is enabled (see `src.instrumentation`), which
+    records the decision of each conflict in the trace.
+
     Args:
         conflicts (list of dict): List of conflict dictionaries.
     """
-    for conflict in conflicts:
-        if log:
-            print(conflict['decision'])
-        pass
+    pass
@@ -11,39 +11,67 @@ Date: YYYY-MM-DD
 """
 
 import json
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 import random
-import math
 from .conflict_detection import (
     parse_vehicles,
     detect_conflicts,
     parse_intersection_layout,
 )
+from .intersection_layout import CompiledIntersectionLayout
+from .scheduling import schedule_intersection
+from .batch_detection import detect_conflicts_batch
+from .scenario_generator import (
+    generate_scenarios,
+    generate_conflict_free_scenarios,
+    generate_near_threshold_scenarios,
+)
 
-def generate_vehicle_scenario(num_vehicles, intersection_layout, fixed_vehicle_count=True):
+def generate_vehicle_scenario(num_vehicles, intersection_layout, fixed_vehicle_count=True, id_namespace=None):
     """
     Generates a random vehicle scenario.
 
+    To generate many scenarios at once, use `scenario_generator.generate_scenarios`.
+
     Args:
         num_vehicles (int): Number of vehicles in the scenario.
         intersection_layout (dict): The intersection layout.
         fixed_vehicle_count (bool): If True, use num_vehicles; else, randomly choose between 2 and num_vehicles.
+        id_namespace (VehicleIdNamespace, optional): Namespace to allocate vehicle IDs from, without
+            retries; by default, IDs are 'V1000' to 'V9999'.
 
     Returns:
         dict: A vehicle scenario containing a list of vehicles.
+
+    Raises:
+        ValueError: If the scenario cannot have that many distinct vehicle IDs.
     """
     if not fixed_vehicle_count:
         num_vehicles = random.randint(2, num_vehicles)
 
+    allocated_ids = None
+    if id_namespace is not None:
+        # Seeded from `random`, so seeding `random` keeps scenarios reproducible
+        rng = np.random.default_rng(random.getrandbits(64))
+        allocated_ids = id_namespace.vehicle_ids(id_namespace.allocate(rng, [num_vehicles]))
+    elif num_vehicles > 9000:
+        raise ValueError("At most 9000 vehicles per scenario are supported; pass an id_namespace for more.")
+
     vehicles = []
     vehicle_ids = set()
-    for _ in range(num_vehicles):
+    for index in range(num_vehicles):
         # Generate unique vehicle ID
-        while True:
-            vehicle_id = f"V{random.randint(1000, 9999)}"
-            if vehicle_id not in vehicle_ids:
-                vehicle_ids.add(vehicle_id)
-                break
+        if allocated_ids is not None:
+            vehicle_id = allocated_ids[index]
+        else:
+            while True:
+                vehicle_id = f"V{random.randint(1000, 9999)}"
+                if vehicle_id not in vehicle_ids:
+                    vehicle_ids.add(vehicle_id)
+                    break
 
         # Choose a random direction
         direction = random.choice(['north', 'east', 'south', 'west'])
@@ -73,129 +101,362 @@ def generate_vehicle_scenario(num_vehicles, intersection_layout, fixed_vehicle_c
     return scenario
 
 
-def generate_dataset(total_records=50000, num_vehicles=5, fixed_vehicle_count=True):
+# Records per independently seeded chunk of a dataset
+DEFAULT_CHUNK_SIZE = 10000
+
+# Candidate scenarios screened at a time in stratified generation
+SCREEN_CHUNK_SIZE = 1024
+
+# Below this share of conflict-free candidates, stratified generation constructs them instead
+MIN_SCREENED_RATE = 0.01
+
+# Ways of drawing candidate scenarios: uniformly, or with crossing vehicles near the decision thresholds
+SAMPLERS = {
+    'uniform': generate_scenarios,
+    'near_threshold': generate_near_threshold_scenarios,
+}
+
+# Layout used for generated datasets
+INTERSECTION_LAYOUT_JSON = '''
+{
+    "intersection_layout": {
+        "north": {
+            "1": ["F", "H"],
+            "2": ["E", "D", "C"]
+        },
+        "east": {
+            "3": ["H", "B"],
+            "4": ["G", "E", "F"]
+        },
+        "south": {
+            "5": ["B", "D"],
+            "6": ["A", "G", "H"]
+        },
+        "west": {
+            "7": ["D", "F"],
+            "8": ["B", "C", "A"]
+        }
+    }
+}
+'''
+
+
+def build_record(scenario, vehicles, conflicts):
+    """
+    Builds the dataset record of a parsed scenario.
+
+    Args:
+        scenario (dict): The vehicle scenario.
+        vehicles (list of Vehicle): Its parsed vehicles.
+        conflicts (list): Its conflicts as returned by `detect_conflicts`.
+
+    Returns:
+        dict: The record, with the columns of `generate_dataset`.
+    """
+    number_of_conflicts = len(conflicts)
+    places_of_conflicts = ['intersection' for _ in conflicts]  # All conflicts are at the intersection
+
+    # Extract conflict_vehicles and decisions
+    conflict_vehicles = []
+    decisions = []
+    all_conflict_vehicle_ids = set()
+    for conflict in conflicts:
+        conflict_vehicle_ids = set([conflict['vehicle1_id'], conflict['vehicle2_id']])
+        all_conflict_vehicle_ids.update(conflict_vehicle_ids)
+        conflict_vehicles.append({
+            'vehicle1_id': conflict['vehicle1_id'],
+            'vehicle2_id': conflict['vehicle2_id']
+        })
+        decisions.append(conflict['decision'])
+
+    # Now, for all vehicles involved in conflicts, recompute priority orders and waiting times
+    # Build a list of vehicles involved in conflicts
+    conflicting_vehicles = [v for v in vehicles if v.vehicle_id in all_conflict_vehicle_ids]
+
+    # Release order and waiting times of all conflicting vehicles together
+    overall_priority_order, overall_waiting_times = schedule_intersection(conflicting_vehicles)
+
+    # For vehicles not involved in conflicts, set priority and waiting time to default values
+    non_conflicting_vehicles = [v for v in vehicles if v.vehicle_id not in all_conflict_vehicle_ids]
+    for vehicle in non_conflicting_vehicles:
+        overall_priority_order[vehicle.vehicle_id] = None  # No priority needed
+        overall_waiting_times[vehicle.vehicle_id] = 0  # No waiting time
+
+    return {
+        'scenario': json.dumps(scenario),
+        'is_conflict': 'yes' if conflicts else 'no',
+        'number_of_conflicts': number_of_conflicts,
+        'places_of_conflicts': places_of_conflicts,
+        'conflict_vehicles': conflict_vehicles,
+        'decisions': decisions,
+        'priority_order': overall_priority_order,
+        'waiting_times': overall_waiting_times
+    }
+
+
+def _random_scenarios(compiled_layout, num_vehicles, fixed_vehicle_count, rng, chunk_size, sample):
+    """
+    Yields (number generated, scenario dicts) for chunks of random scenarios, endlessly.
+    """
+    while True:
+        yield chunk_size, sample(chunk_size, compiled_layout, num_vehicles, fixed_vehicle_count, rng).to_dicts()
+
+
+def _screened_scenarios(compiled_layout, num_vehicles, fixed_vehicle_count, rng, remaining, sample):
+    """
+    Yields (number generated, scenario dicts) for the classes that still have a quota.
+
+    Candidates are generated and classified in vectorized chunks, so the
+    scenarios of full classes are dropped before any per-scenario work.
+    Conflict-free scenarios are constructed directly when they are too rare
+    among the candidates. `remaining` is read before each chunk; a chunk never
+    yields more scenarios of a class than its remaining quota.
+    """
+    while any(remaining.values()):
+        candidates = sample(SCREEN_CHUNK_SIZE, compiled_layout, num_vehicles, fixed_vehicle_count, rng)
+        conflict_counts = detect_conflicts_batch(candidates.speed, candidates.distance, candidates.direction,
+                                                 candidates.movement, candidates.offsets).counts
+        conflicting = np.flatnonzero(conflict_counts > 0)[:remaining['yes']]
+        conflict_free = np.flatnonzero(conflict_counts == 0)[:remaining['no']]
+        yield len(candidates), candidates.select(np.sort(np.concatenate([conflicting, conflict_free]))).to_dicts()
+
+        # The consumer has taken the chunk's scenarios by now
+        missing = remaining['no']
+        if missing > 0 and np.mean(conflict_counts == 0) < MIN_SCREENED_RATE:
+            attempted = min(missing, SCREEN_CHUNK_SIZE)
+            constructed = generate_conflict_free_scenarios(attempted, compiled_layout, num_vehicles,
+                                                           fixed_vehicle_count, rng)
+            yield attempted, constructed.to_dicts()
+
+
+def generate_shard(quotas, num_vehicles, fixed_vehicle_count, seed, balance='reject', sampler='uniform'):
+    """
+    Generates the records of one shard of a dataset.
+
+    The shard holds exactly `quotas['yes']` conflict and `quotas['no']`
+    conflict-free records. With `balance='reject'`, every scenario is fully
+    evaluated and those of a class that already has its quota are skipped.
+    With `balance='stratified'`, candidates are screened with the vectorized
+    detector first (see `_screened_scenarios`), so only scenarios that are
+    kept are fully evaluated. `sampler` picks how candidate scenarios are
+    drawn (see SAMPLERS). The result only depends on the arguments.
+
+    Args:
+        quotas (dict): Number of records per class ('yes' and 'no').
+        num_vehicles (int): Maximum number of vehicles in each scenario.
+        fixed_vehicle_count (bool): If True, use num_vehicles; else, randomly choose between 2 and num_vehicles.
+        seed (np.random.SeedSequence or int): Seed of the shard's random stream.
+        balance (str): 'reject' or 'stratified'.
+        sampler (str): 'uniform' or 'near_threshold'.
+
+    Returns:
+        tuple: (list of record dicts in generation order, dictionary of counts: 'generated'
+            scenarios, 'evaluated' scenarios that went through `detect_conflicts` and 'accepted' records,
+            plus the 'rng_state' the shard's bit generator ended in)
+    """
+    if balance not in ('reject', 'stratified'):
+        raise ValueError(f"Unknown balance mode: {balance}")
+    if sampler not in SAMPLERS:
+        raise ValueError(f"Unknown sampler: {sampler}")
+    sample = SAMPLERS[sampler]
+    intersection_layout = parse_intersection_layout(json.loads(INTERSECTION_LAYOUT_JSON))
+    compiled_layout = CompiledIntersectionLayout(intersection_layout)
+    total_records = sum(quotas.values())
+    remaining = dict(quotas)
+    rng = np.random.default_rng(seed)
+    stats = {'generated': 0, 'evaluated': 0, 'accepted': 0}
+
+    if balance == 'stratified':
+        chunks = _screened_scenarios(compiled_layout, num_vehicles, fixed_vehicle_count, rng, remaining, sample)
+    else:
+        chunks = _random_scenarios(compiled_layout, num_vehicles, fixed_vehicle_count, rng,
+                                   max(1, min(total_records, 1024)), sample)
+
+    data = []
+    for generated, scenarios in chunks:
+        if len(data) >= total_records:
+            break
+        stats['generated'] += generated
+        for scenario in scenarios:
+            if len(data) >= total_records:
+                break
+            try:
+                vehicles = parse_vehicles(scenario, compiled_layout)
+            except ValueError as e:
+                continue  # Skip scenarios with invalid data
+
+            # Records defer building decision strings until a scenario is kept
+            conflicts = detect_conflicts(vehicles, records=True)
+            stats['evaluated'] += 1
+
+            # Balance the dataset
+            is_conflict = 'yes' if conflicts else 'no'
+            if not remaining[is_conflict]:
+                continue  # Skip to balance the dataset
+            remaining[is_conflict] -= 1
+
+            data.append(build_record(scenario, vehicles, conflicts))
+    stats['accepted'] = len(data)
+    stats['rng_state'] = rng.bit_generator.state
+    return data, stats
+
+
+def chunk_quotas(total_records, chunk_size):
+    """
+    Splits a dataset into chunks and their class quotas.
+
+    Every chunk holds `chunk_size` records except possibly the last. Half of
+    all records (rounded up) have conflicts, and each chunk is balanced to
+    within one record.
+
+    Args:
+        total_records (int): Total number of records.
+        chunk_size (int): Number of records per chunk.
+
+    Returns:
+        list of dict: Number of records per class ('yes' and 'no') of each chunk.
+    """
+    quotas = []
+    for start in range(0, total_records, chunk_size):
+        end = min(start + chunk_size, total_records)
+        # Conflict records up to the end of each chunk, rounded up as for the whole dataset
+        yes = (end + 1) // 2 - (start + 1) // 2
+        quotas.append({'yes': yes, 'no': end - start - yes})
+    return quotas
+
+
+def combine_generation_stats(shard_stats):
+    """
+    Sums the counts of several shards and computes the acceptance rate.
+
+    Args:
+        shard_stats (iterable of dict): Counts as returned by `generate_shard`.
+
+    Returns:
+        dict: 'generated', 'evaluated' and 'accepted' scenarios and the 'acceptance_rate',
+            the share of evaluated scenarios that were kept.
+    """
+    stats = {'generated': 0, 'evaluated': 0, 'accepted': 0}
+    for counts in shard_stats:
+        for key in stats:
+            stats[key] += counts[key]
+    stats['acceptance_rate'] = stats['accepted'] / stats['evaluated'] if stats['evaluated'] else 1.0
+    return stats
+
+
+def _run_shards(shards, workers):
+    """
+    Yields the results of `generate_shard` for every shard, in order.
+
+    With several workers, at most two shards per worker are in flight, so
+    memory does not grow with the number of shards.
+    """
+    if workers == 1:
+        for shard in shards:
+            yield generate_shard(*shard)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for shard in shards:
+            pending.append(executor.submit(generate_shard, *shard))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def chunk_seeds(seed, num_chunks):
+    """
+    Returns the seed sequences of the chunks of a dataset.
+
+    Args:
+        seed (int): Seed of the dataset.
+        num_chunks (int): Number of chunks.
+
+    Returns:
+        list of np.random.SeedSequence: One independent seed per chunk.
+    """
+    return np.random.SeedSequence(seed).spawn(num_chunks)
+
+
+def iter_dataset_chunks(total_records=50000, num_vehicles=5, fixed_vehicle_count=True, workers=1, seed=None,
+                        balance='reject', chunk_size=DEFAULT_CHUNK_SIZE, start_chunk=0, sampler='uniform'):
+    """
+    Generates a dataset as a stream of DataFrame chunks.
+
+    Each chunk is a shard with its own class quotas (see `chunk_quotas`) and
+    its own random stream spawned from `seed`, so the dataset only depends on
+    the arguments other than `workers`, and at most a few chunks are held in
+    memory at a time. Each chunk carries its counts in
+    `chunk.attrs['generation_stats']` and the state its random stream ended
+    in in `chunk.attrs['rng_state']`.
+
+    Args:
+        total_records (int): Total number of records to generate.
+        num_vehicles (int): Maximum number of vehicles in each scenario.
+        fixed_vehicle_count (bool): If True, use num_vehicles; else, randomly choose between 2 and num_vehicles.
+        workers (int): Number of worker processes (1 generates in this process).
+        seed (int, optional): Seed of the dataset. If omitted, it is drawn from `random`,
+            so seeding `random` still makes runs reproducible.
+        balance (str): 'reject' to skip scenarios of full classes after evaluating them, or
+            'stratified' to only evaluate scenarios of classes that are still needed.
+        chunk_size (int): Number of records per chunk.
+        start_chunk (int): Index of the first chunk to generate; earlier chunks are skipped
+            without generating them.
+        sampler (str): 'uniform' to draw scenarios uniformly, or 'near_threshold' to put
+            crossing vehicles near the decision thresholds (see SAMPLERS).
+
+    Yields:
+        pd.DataFrame: The next chunk of records.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    if seed is None:
+        seed = random.getrandbits(64)
+
+    quotas = chunk_quotas(total_records, chunk_size)
+    shards = [(chunk_quota, num_vehicles, fixed_vehicle_count, chunk_seed, balance, sampler)
+              for chunk_quota, chunk_seed in zip(quotas, chunk_seeds(seed, len(quotas)))][start_chunk:]
+    for records, stats in _run_shards(shards, workers):
+        chunk = pd.DataFrame(records)
+        chunk.attrs['generation_stats'] = combine_generation_stats([stats])
+        chunk.attrs['rng_state'] = stats['rng_state']
+        yield chunk
+
+
+def generate_dataset(total_records=50000, num_vehicles=5, fixed_vehicle_count=True, workers=1, seed=None,
+                     balance='reject', chunk_size=DEFAULT_CHUNK_SIZE, sampler='uniform'):
     """
     Generates a dataset containing vehicle scenario data.
 
+    Half of the records (rounded up) have conflicts. The dataset is the
+    concatenation of the chunks of `iter_dataset_chunks`, which are generated
+    by `workers` processes; a given seed and chunk size always produce the
+    same dataset, whatever the number of workers.
+
+    Generation counts are stored in `dataset.attrs['generation_stats']`
+    (see `combine_generation_stats`).
+
     Args:
         total_records (int): Total number of records to generate.
         num_vehicles (int): Maximum number of vehicles in each scenario.
         fixed_vehicle_count (bool): If True, use num_vehicles; else, randomly choose between 2 and num_vehicles.
+        workers (int): Number of worker processes (1 generates in this process).
+        seed (int, optional): Seed of the dataset. If omitted, it is drawn from `random`,
+            so seeding `random` still makes runs reproducible.
+        balance (str): 'reject' to skip scenarios of full classes after evaluating them, or
+            'stratified' to only evaluate scenarios of classes that are still needed.
+        chunk_size (int): Number of records per independently seeded chunk.
+        sampler (str): 'uniform' to draw scenarios uniformly, or 'near_threshold' to put
+            crossing vehicles near the decision thresholds (see SAMPLERS).
 
     Returns:
         pd.DataFrame: A pandas DataFrame containing the dataset.
     """
-    data = []
-    conflict_counts = {'yes': 0, 'no': 0}
-
-    # Load the intersection layout
-    intersection_layout_json = '''
-    {
-        "intersection_layout": {
-            "north": {
-                "1": ["F", "H"],
-                "2": ["E", "D", "C"]
-            },
-            "east": {
-                "3": ["H", "B"],
-                "4": ["G", "E", "F"]
-            },
-            "south": {
-                "5": ["B", "D"],
-                "6": ["A", "G", "H"]
-            },
-            "west": {
-                "7": ["D", "F"],
-                "8": ["B", "C", "A"]
-            }
-        }
-    }
-    '''
-    intersection_layout_data = json.loads(intersection_layout_json)
-    intersection_layout = parse_intersection_layout(intersection_layout_data)
-
-    while len(data) < total_records:
-        scenario = generate_vehicle_scenario(num_vehicles, intersection_layout, fixed_vehicle_count)
-        try:
-            vehicles = parse_vehicles(scenario, intersection_layout)
-        except ValueError as e:
-            continue  # Skip scenarios with invalid data
-
-        conflicts = detect_conflicts(vehicles)
-
-        is_conflict = 'yes' if conflicts else 'no'
-
-        # Balance the dataset
-        if conflict_counts[is_conflict] >= total_records / 2:
-            continue  # Skip to balance the dataset
-        conflict_counts[is_conflict] += 1
-
-        number_of_conflicts = len(conflicts)
-        places_of_conflicts = ['intersection' for _ in conflicts]  # All conflicts are at the intersection
-
-        # Extract conflict_vehicles and decisions
-        conflict_vehicles = []
-        decisions = []
-        all_conflict_vehicle_ids = set()
-        for conflict in conflicts:
-            conflict_vehicle_ids = set([conflict['vehicle1_id'], conflict['vehicle2_id']])
-            all_conflict_vehicle_ids.update(conflict_vehicle_ids)
-            conflict_vehicles.append({
-                'vehicle1_id': conflict['vehicle1_id'],
-                'vehicle2_id': conflict['vehicle2_id']
-            })
-            decisions.append(conflict['decision'])
-
-        # Now, for all vehicles involved in conflicts, recompute priority orders and waiting times
-        # Build a list of vehicles involved in conflicts
-        conflicting_vehicles = [v for v in vehicles if v.vehicle_id in all_conflict_vehicle_ids]
-
-        # Apply priority rules to all conflicting vehicles
-        overall_priority_order = {}
-        overall_waiting_times = {}
-
-        if conflicting_vehicles:
-            # Sort vehicles based on their time to intersection
-            sorted_vehicles = sorted(conflicting_vehicles, key=lambda v: v.time_to_intersection)
-
-            # Assign priorities based on arrival times
-            for idx, vehicle in enumerate(sorted_vehicles):
-                overall_priority_order[vehicle.vehicle_id] = idx + 1  # Priority 1 is highest
-
-            # Compute waiting times
-            traversal_time = 2  # Time to clear the intersection in seconds
-            vehicle_arrival_times = {v.vehicle_id: v.time_to_intersection for v in conflicting_vehicles}
-            for idx, vehicle in enumerate(sorted_vehicles):
-                if idx == 0:
-                    # First vehicle doesn't wait
-                    overall_waiting_times[vehicle.vehicle_id] = 0
-                else:
-                    # Wait until the previous vehicle has cleared the intersection
-                    prev_vehicle = sorted_vehicles[idx - 1]
-                    required_arrival_time = vehicle_arrival_times[prev_vehicle.vehicle_id] + traversal_time
-                    wait_time = max(0, required_arrival_time - vehicle_arrival_times[vehicle.vehicle_id])
-                    overall_waiting_times[vehicle.vehicle_id] = math.ceil(wait_time)
-                    # Update the vehicle's arrival time after waiting
-                    vehicle_arrival_times[vehicle.vehicle_id] += wait_time
-
-        # For vehicles not involved in conflicts, set priority and waiting time to default values
-        non_conflicting_vehicles = [v for v in vehicles if v.vehicle_id not in all_conflict_vehicle_ids]
-        for vehicle in non_conflicting_vehicles:
-            overall_priority_order[vehicle.vehicle_id] = None  # No priority needed
-            overall_waiting_times[vehicle.vehicle_id] = 0  # No waiting time
-
-        record = {
-            'scenario': json.dumps(scenario),
-            'is_conflict': is_conflict,
-            'number_of_conflicts': number_of_conflicts,
-            'places_of_conflicts': places_of_conflicts,
-            'conflict_vehicles': conflict_vehicles,
-            'decisions': decisions,
-            'priority_order': overall_priority_order,
-            'waiting_times': overall_waiting_times
-        }
-        data.append(record)
-
-    dataset = pd.DataFrame(data)
+    chunks = list(iter_dataset_chunks(total_records, num_vehicles, fixed_vehicle_count, workers, seed, balance,
+                                      chunk_size, sampler=sampler))
+    dataset = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+    dataset.attrs['generation_stats'] = combine_generation_stats(chunk.attrs['generation_stats'] for chunk in chunks)
     return dataset
-
@@ -0,0 +1,278 @@
+# src/dataset_split.py
+
+"""
+Dataset Split Module
+
+This module removes duplicate scenarios from a dataset and splits it into
+train, validation and test sets in one streaming pass. Each scenario is
+reduced to a canonical form (vehicles sorted, speed and distance quantized,
+vehicle IDs dropped in favour of positions) and hashed to 64 bits. A hash
+seen before marks a duplicate, which is dropped, so near-identical scenarios
+can never leak across splits. Kept scenarios are split stratified by their
+'is_conflict' label: every class is divided in the given proportions.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import hashlib
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+from .dataset_writer import ChunkWriter
+
+SPLITS = ('train', 'val', 'test')
+DEFAULT_FRACTIONS = {'train': 0.8, 'val': 0.1, 'test': 0.1}
+
+# Quantization steps of the canonical form
+DEFAULT_SPEED_STEP = 1.0       # km/h
+DEFAULT_DISTANCE_STEP = 1.0    # m
+
+
+def canonical_scenario(scenario, speed_step=DEFAULT_SPEED_STEP, distance_step=DEFAULT_DISTANCE_STEP):
+    """
+    Reduces a scenario to a canonical string.
+
+    Vehicle IDs are dropped, speed and distance are rounded to multiples of
+    the steps and the vehicles are sorted, so scenarios that only differ in
+    vehicle IDs, vehicle order or sub-step kinematics share a canonical form.
+
+    Args:
+        scenario (dict or str): Scenario dict or its JSON string.
+        speed_step (float): Speed quantization step in km/h.
+        distance_step (float): Distance quantization step in meters.
+
+    Returns:
+        str: The canonical form.
+    """
+    if isinstance(scenario, str):
+        scenario = json.loads(scenario)
+    vehicles = sorted(
+        (vehicle['direction'].lower(), str(vehicle['lane']), vehicle['destination'],
+         round(vehicle['speed'] / speed_step), round(vehicle['distance_to_intersection'] / distance_step))
+        for vehicle in scenario['vehicles_scenario']
+    )
+    return ';'.join('%s,%s,%s,%d,%d' % vehicle for vehicle in vehicles)
+
+
+def scenario_hashes(scenarios, speed_step=DEFAULT_SPEED_STEP, distance_step=DEFAULT_DISTANCE_STEP):
+    """
+    Hashes the canonical forms of scenarios to 64 bits.
+
+    Args:
+        scenarios (iterable): Scenario dicts or JSON strings.
+        speed_step (float): Speed quantization step in km/h.
+        distance_step (float): Distance quantization step in meters.
+
+    Returns:
+        np.ndarray: Hashes (uint64).
+    """
+    digests = b''.join(
+        hashlib.blake2b(canonical_scenario(scenario, speed_step, distance_step).encode(), digest_size=8).digest()
+        for scenario in scenarios
+    )
+    return np.frombuffer(digests, dtype='<u8').copy()
+
+
+class HashSet:
+    """
+    Exact set of 64-bit hashes.
+    """
+
+    def __init__(self):
+        self._hashes = set()
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def add_many(self, hashes):
+        """
+        Adds distinct hashes and reports which were already present.
+
+        Args:
+            hashes (np.ndarray): Distinct hashes (uint64).
+
+        Returns:
+            np.ndarray: True for hashes that were present before.
+        """
+        values = hashes.tolist()
+        present = np.fromiter((value in self._hashes for value in values), dtype=bool, count=len(values))
+        self._hashes.update(values)
+        return present
+
+
+class BloomFilter:
+    """
+    Probabilistic set of 64-bit hashes with a fixed memory budget.
+
+    Membership tests have no false negatives; false positives (a new hash
+    reported as present) occur at about `error_rate` while at most
+    `capacity` hashes were added. The filter uses about
+    1.44 * log2(1 / error_rate) bits per hash of capacity.
+    """
+
+    def __init__(self, capacity, error_rate=1e-6):
+        """
+        Allocates an empty filter.
+
+        Args:
+            capacity (int): Expected number of distinct hashes.
+            error_rate (float): Target false positive rate.
+        """
+        self.num_bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / max(capacity, 1) * math.log(2)))
+        self._bits = np.zeros((self.num_bits + 7) // 8, dtype=np.uint8)
+
+    @property
+    def nbytes(self):
+        """
+        int: Memory used by the bit array.
+        """
+        return self._bits.nbytes
+
+    def add_many(self, hashes):
+        """
+        Adds distinct hashes and reports which were (probably) already present.
+
+        Args:
+            hashes (np.ndarray): Distinct hashes (uint64).
+
+        Returns:
+            np.ndarray: True for hashes that were probably present before.
+        """
+        # Double hashing: bit i of a hash is (low + i * high) mod num_bits
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = (hashes >> np.uint64(32)) | np.uint64(1)
+        positions = (low[:, None] + np.arange(self.num_hashes, dtype=np.uint64) * high[:, None]) \
+            % np.uint64(self.num_bits)
+        byte_index = (positions >> np.uint64(3)).astype(np.intp)
+        masks = np.left_shift(1, (positions & np.uint64(7)).astype(np.uint8)).astype(np.uint8)
+        present = ((self._bits[byte_index] & masks) != 0).all(axis=1)
+        np.bitwise_or.at(self._bits, byte_index.ravel(), masks.ravel())
+        return present
+
+
+class StratifiedSplitter:
+    """
+    Assigns records to splits in fixed proportions within every class.
+
+    The n-th record of a class goes to the n-th entry of a fixed sequence of
+    splits, in which split s takes its j-th place at (j - 0.5) / fraction[s].
+    After any number of records, every split of every class is therefore
+    within about one record of its share, also for small or rare classes.
+    The assignment depends only on the order of the records of a class, not
+    on how they are chunked.
+    """
+
+    def __init__(self, fractions=None):
+        """
+        Creates a splitter with no records assigned.
+
+        Args:
+            fractions (dict, optional): Share of each of SPLITS (default: DEFAULT_FRACTIONS).
+        """
+        fractions = fractions or DEFAULT_FRACTIONS
+        shares = np.array([fractions[split] for split in SPLITS], dtype=np.float64)
+        if (shares < 0).any() or shares.sum() <= 0:
+            raise ValueError("Split fractions must be non-negative and not all zero.")
+        self.fractions = shares / shares.sum()
+        self.counts = {}
+
+    def _next_splits(self, counts, size):
+        """
+        Returns the next `size` entries of the split sequence of a class with `counts` records per split.
+        """
+        splits = []
+        places = []
+        for code, fraction in enumerate(self.fractions):
+            if fraction > 0:
+                # A split gets at most about fraction * size + 1 of the next `size` places
+                place = np.arange(counts[code] + 1, counts[code] + math.ceil(fraction * size) + 3)
+                places.append((place - 0.5) / fraction)
+                splits.append(np.full(len(place), code, dtype=np.int8))
+        splits = np.concatenate(splits)
+        return splits[np.lexsort((splits, np.concatenate(places)))[:size]]
+
+    def assign(self, labels):
+        """
+        Assigns the next records to splits.
+
+        Args:
+            labels (array-like): Class of each record, in order.
+
+        Returns:
+            np.ndarray: Index into SPLITS of each record (int8).
+        """
+        codes, classes = pd.factorize(np.asarray(labels, dtype=object), use_na_sentinel=False)
+        result = np.empty(len(codes), dtype=np.int8)
+        for code, label in enumerate(classes):
+            rows = np.flatnonzero(codes == code)
+            counts = self.counts.setdefault(label, np.zeros(len(SPLITS), dtype=np.int64))
+            splits = self._next_splits(counts, len(rows))
+            result[rows] = splits
+            counts += np.bincount(splits, minlength=len(SPLITS))
+        return result
+
+
+def split_dataset(chunks, output_directory, fractions=None, seen=None, speed_step=DEFAULT_SPEED_STEP,
+                  distance_step=DEFAULT_DISTANCE_STEP, file_format='csv'):
+    """
+    Removes duplicate scenarios and writes train, validation and test sets.
+
+    The first occurrence of every canonical scenario is kept; later ones are
+    dropped. Kept records are split stratified by 'is_conflict' (see
+    `StratifiedSplitter`) and appended to '<split>_set.<format>' files in
+    `output_directory`, chunk by chunk.
+
+    Args:
+        chunks (pd.DataFrame or iterable of pd.DataFrame): Records with a 'scenario' column,
+            e.g. `pd.read_csv(path, chunksize=...)`.
+        output_directory (str): Directory of the split files.
+        fractions (dict, optional): Share of each of SPLITS (default: DEFAULT_FRACTIONS).
+        seen (HashSet or BloomFilter, optional): Set of seen hashes (default: an exact HashSet).
+        speed_step (float): Speed quantization step in km/h.
+        distance_step (float): Distance quantization step in meters.
+        file_format (str): Format of the split files (see `dataset_writer.FORMATS`).
+
+    Returns:
+        dict: Report with the number of 'records', 'duplicates', the 'duplicate_rate' and the
+            records per split and class under 'splits'.
+    """
+    if isinstance(chunks, pd.DataFrame):
+        chunks = [chunks]
+    seen = seen if seen is not None else HashSet()
+    splitter = StratifiedSplitter(fractions)
+    os.makedirs(output_directory, exist_ok=True)
+    writers = {split: ChunkWriter(os.path.join(output_directory, f'{split}_set.{file_format}'), file_format)
+               for split in SPLITS}
+    report = {'records': 0, 'duplicates': 0, 'duplicate_rate': 0.0,
+              'splits': {split: {'records': 0, 'yes': 0, 'no': 0} for split in SPLITS}}
+    try:
+        for chunk in chunks:
+            hashes = scenario_hashes(chunk['scenario'], speed_step, distance_step)
+            unique, first, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+            inverse = inverse.ravel()
+            duplicate = (np.arange(len(hashes)) != first[inverse]) | seen.add_many(unique)[inverse]
+            # Without labels, all records form one class
+            kept = chunk[~duplicate]
+            splits = splitter.assign(kept['is_conflict'] if 'is_conflict' in kept else np.zeros(len(kept)))
+
+            report['records'] += len(chunk)
+            report['duplicates'] += int(duplicate.sum())
+            for code, split in enumerate(SPLITS):
+                part = kept[splits == code]
+                writers[split].write(part)
+                counts = report['splits'][split]
+                counts['records'] += len(part)
+                if 'is_conflict' in part:
+                    for label, count in part['is_conflict'].value_counts().items():
+                        counts[label] = counts.get(label, 0) + int(count)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    report['duplicate_rate'] = report['duplicates'] / report['records'] if report['records'] else 0.0
+    return report
@@ -0,0 +1,196 @@
+# src/dataset_writer.py
+
+"""
+Dataset Writer Module
+
+This module writes generated datasets to disk chunk by chunk, so that
+memory stays flat however many records are generated. Chunks are appended
+to a CSV, JSON Lines or Parquet file as soon as they are generated.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import json
+import os
+
+import pandas as pd
+
+from .data_generation import iter_dataset_chunks, combine_generation_stats
+
+FORMATS = ('csv', 'jsonl', 'parquet')
+
+# Columns of generate_dataset records, in order
+RECORD_COLUMNS = ('scenario', 'is_conflict', 'number_of_conflicts', 'places_of_conflicts', 'conflict_vehicles',
+                  'decisions', 'priority_order', 'waiting_times')
+
+# Columns holding lists or dicts; Parquet stores them as JSON strings, since the
+# keys of 'priority_order' and 'waiting_times' differ from record to record
+NESTED_COLUMNS = ('places_of_conflicts', 'conflict_vehicles', 'decisions', 'priority_order', 'waiting_times')
+
+_EXTENSIONS = {'.csv': 'csv', '.jsonl': 'jsonl', '.json': 'jsonl', '.parquet': 'parquet'}
+
+
+def infer_format(path):
+    """
+    Infers the file format from the file extension.
+
+    Args:
+        path (str): Output path.
+
+    Returns:
+        str: One of FORMATS.
+
+    Raises:
+        ValueError: If the extension is not recognized.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in _EXTENSIONS:
+        raise ValueError(f"Cannot infer the dataset format of '{path}'; use one of {', '.join(FORMATS)}.")
+    return _EXTENSIONS[extension]
+
+
+class ChunkWriter:
+    """
+    Appends DataFrame chunks to one output file.
+
+    Use as a context manager, or call `close` when done. The CSV header is
+    written with the first chunk only, even if that chunk is empty. Call
+    `write_empty` to give a file without chunks the record columns.
+    """
+
+    def __init__(self, path, file_format=None):
+        """
+        Opens the output file.
+
+        Args:
+            path (str): Output path; an existing file is overwritten.
+            file_format (str, optional): One of FORMATS (default: inferred from the extension).
+        """
+        self.path = path
+        self.file_format = file_format or infer_format(path)
+        if self.file_format not in FORMATS:
+            raise ValueError(f"Unknown dataset format: {self.file_format}")
+        self.records = 0
+        self.chunks = 0
+        self._file = None
+        self._parquet_writer = None
+        if self.file_format == 'parquet':
+            # Optional dependency, only needed for Parquet output
+            import pyarrow
+            import pyarrow.parquet
+            self._pyarrow = pyarrow
+            self._parquet = pyarrow.parquet
+        else:
+            self._file = open(path, 'w', newline='', encoding='utf-8')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, chunk):
+        """
+        Appends a chunk of records.
+
+        Args:
+            chunk (pd.DataFrame): Records with the columns of `generate_dataset`.
+        """
+        if chunk.empty and (self.chunks or self.file_format != 'csv'):
+            return
+        if self.file_format == 'csv':
+            chunk.to_csv(self._file, header=self.chunks == 0, index=False)
+        elif self.file_format == 'jsonl':
+            for record in chunk.to_dict(orient='records'):
+                self._file.write(json.dumps(record) + '\n')
+        else:
+            chunk = chunk.copy()
+            for column in NESTED_COLUMNS:
+                if column in chunk:
+                    chunk[column] = [json.dumps(value) for value in chunk[column]]
+            table = self._pyarrow.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet_writer is None:
+                self._parquet_writer = self._parquet.ParquetWriter(self.path, table.schema)
+            self._parquet_writer.write_table(table)
+        self.records += len(chunk)
+        self.chunks += 1
+
+    def write_empty(self):
+        """
+        Writes the record columns without records, if no chunk was written.
+
+        A CSV gets the RECORD_COLUMNS header and a Parquet file their schema,
+        so an empty dataset can be read back; a JSON Lines file stays empty.
+        """
+        if self.chunks:
+            return
+        if self.file_format == 'parquet':
+            schema = self._pyarrow.schema([(column, self._pyarrow.int64() if column == 'number_of_conflicts'
+                                            else self._pyarrow.string()) for column in RECORD_COLUMNS])
+            self._parquet.write_table(schema.empty_table(), self.path)
+        else:
+            self.write(pd.DataFrame(columns=list(RECORD_COLUMNS)))
+
+    def close(self):
+        """
+        Flushes and closes the output file.
+        """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+
+def write_chunks(chunks, path, file_format=None):
+    """
+    Writes a stream of DataFrame chunks to one file.
+
+    Without chunks, the file still gets the record columns (see `ChunkWriter.write_empty`).
+
+    Args:
+        chunks (iterable of pd.DataFrame): Chunks to write, in order.
+        path (str): Output path; an existing file is overwritten.
+        file_format (str, optional): One of FORMATS (default: inferred from the extension).
+
+    Returns:
+        int: Number of records written.
+    """
+    with ChunkWriter(path, file_format) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+        writer.write_empty()
+    return writer.records
+
+
+def write_dataset(path, total_records=50000, num_vehicles=5, fixed_vehicle_count=True, file_format=None,
+                  **generation_options):
+    """
+    Generates a dataset and streams it to a file.
+
+    Only a few chunks are in memory at a time (see `iter_dataset_chunks`),
+    and the file holds the same records as `generate_dataset` with the same
+    arguments.
+
+    Args:
+        path (str): Output path; an existing file is overwritten.
+        total_records (int): Total number of records to generate.
+        num_vehicles (int): Maximum number of vehicles in each scenario.
+        fixed_vehicle_count (bool): If True, use num_vehicles; else, randomly choose between 2 and num_vehicles.
+        file_format (str, optional): One of FORMATS (default: inferred from the extension).
+        **generation_options: `workers`, `seed`, `balance`, `chunk_size` and `sampler` of `iter_dataset_chunks`.
+
+    Returns:
+        dict: Generation counts (see `combine_generation_stats`).
+    """
+    shard_stats = []
+
+    def chunks():
+        for chunk in iter_dataset_chunks(total_records, num_vehicles, fixed_vehicle_count, **generation_options):
+            shard_stats.append(chunk.attrs['generation_stats'])
+            yield chunk
+
+    write_chunks(chunks(), path, file_format)
+    return combine_generation_stats(shard_stats)
@@ -0,0 +1,285 @@
+# src/finetune_shards.py
+
+"""
+Fine-Tuning Shards Module
+
+This module builds GPT chat or Llama 3 fine-tuning data from large datasets
+as a directory of numbered JSON Lines shards and a `manifest.json`. The
+input (CSV, JSON Lines or columnar) is read in chunks of one shard each, and
+a pool of worker processes renders the prompts of every chunk with the
+prompt renderer and writes its shard, optionally gzip-compressed. At most
+two chunks per worker are in flight, so memory stays flat however large the
+dataset is, and the shards hold the records in input order.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from .checkpointing import _write_json
+from .columnar_dataset import META_FILE, load_columnar
+from .dataset_writer import infer_format
+from .prompt_renderer import (
+    gpt_conversations,
+    llama_texts,
+    render_columnar,
+    render_user_prompts,
+    user_prompt_template,
+)
+from .relabel import read_chunks
+
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+
+# Fine-tuning formats: 'gpt' writes {"messages": [...]} lines, 'llama' writes {"text": ...} lines
+MODELS = ('gpt', 'llama')
+
+DEFAULT_RECORDS_PER_SHARD = 50000
+DEFAULT_COMPRESSION_LEVEL = 6
+
+
+def shard_file_name(index, compress=False):
+    """
+    Returns the file name of a shard.
+
+    Args:
+        index (int): Index of the shard.
+        compress (bool): Whether the shard is gzip-compressed.
+
+    Returns:
+        str: The file name, e.g. 'shard-00003.jsonl.gz'.
+    """
+    return f"shard-{index:05d}.jsonl" + ('.gz' if compress else '')
+
+
+def _source_format(source):
+    """
+    Returns 'dataframe', 'columnar', 'csv' or 'jsonl' for a builder input.
+    """
+    if isinstance(source, pd.DataFrame):
+        return 'dataframe'
+    if os.path.isdir(source) and os.path.exists(os.path.join(source, META_FILE)):
+        return 'columnar'
+    return infer_format(source)
+
+
+def _iter_chunks(source, source_format, records_per_shard):
+    """
+    Yields the input of each shard: a DataFrame chunk, or a (path, start, stop) range of a columnar dataset.
+    """
+    if source_format == 'dataframe':
+        for start in range(0, len(source), records_per_shard):
+            yield source.iloc[start:start + records_per_shard][['scenario', 'is_conflict']]
+    elif source_format == 'columnar':
+        num_scenarios = len(load_columnar(source))
+        for start in range(0, num_scenarios, records_per_shard):
+            yield source, start, min(start + records_per_shard, num_scenarios)
+    elif source_format == 'csv':
+        # Only the two rendered columns are parsed
+        yield from pd.read_csv(source, chunksize=records_per_shard, usecols=['scenario', 'is_conflict'])
+    else:
+        for chunk in read_chunks(source, records_per_shard, source_format):
+            yield chunk[['scenario', 'is_conflict']]
+
+
+@lru_cache(maxsize=4)
+def _open_columnar(path):
+    """
+    Opens a columnar dataset once per process.
+    """
+    return load_columnar(path)
+
+
+def render_lines(chunk, model, instruction, style=None):
+    """
+    Renders the JSON Lines of one chunk of records.
+
+    Args:
+        chunk (pd.DataFrame or tuple): Records with 'scenario' and 'is_conflict' columns,
+            or a (path, start, stop) range of a columnar dataset.
+        model (str): One of MODELS.
+        instruction (str): System instruction (GPT) or system prompt (Llama).
+        style (str, optional): Scenario style of `prompt_renderer.STYLES` (default: the style of the model).
+
+    Returns:
+        str: One JSON line per record, each ending with a newline.
+    """
+    if isinstance(chunk, tuple):
+        dataset = _open_columnar(chunk[0])
+        start, stop = chunk[1:]
+        template = user_prompt_template(model, style)
+        user_messages = [template % scenario for scenario in render_columnar(dataset, style or model, start, stop)]
+        labels = np.where(dataset.is_conflict[start:stop], 'yes', 'no').tolist()
+    else:
+        user_messages = render_user_prompts(chunk, model, style)
+        labels = chunk['is_conflict'].tolist()
+    if model == 'gpt':
+        lines = map(json.dumps, gpt_conversations(user_messages, labels, instruction))
+    else:
+        lines = (json.dumps({"text": text}) for text in llama_texts(user_messages, labels, instruction))
+    return ''.join(line + '\n' for line in lines)
+
+
+def _write_shard(chunk, model, instruction, style, path, compress, compression_level):
+    """
+    Renders one chunk and writes its shard atomically.
+
+    Returns:
+        dict: The manifest entry of the shard.
+    """
+    text = render_lines(chunk, model, instruction, style)
+    data = text.encode('utf-8')
+    entry = {'file': os.path.basename(path), 'records': text.count('\n'),
+             'sha256': hashlib.sha256(data).hexdigest()}
+    if compress:
+        # mtime=0 keeps the compressed bytes reproducible
+        buffer = io.BytesIO()
+        with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=compression_level, mtime=0) as f:
+            f.write(data)
+        data = buffer.getvalue()
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'wb') as f:
+        f.write(data)
+    os.replace(temporary_path, path)
+    entry['bytes'] = len(data)
+    return entry
+
+
+def _write_shards(tasks, workers):
+    """
+    Yields the manifest entry of every shard task, in order.
+
+    With several workers, at most two shards per worker are in flight.
+    """
+    if workers == 1:
+        for task in tasks:
+            yield _write_shard(*task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for task in tasks:
+            pending.append(executor.submit(_write_shard, *task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def build_jsonl_shards(source, output_directory, model, instruction, workers=1,
+                       records_per_shard=DEFAULT_RECORDS_PER_SHARD, compress=False,
+                       compression_level=DEFAULT_COMPRESSION_LEVEL, style=None):
+    """
+    Builds fine-tuning JSON Lines shards from a dataset.
+
+    The lines are those of `prepare_chat_jsonl_file` (GPT) or
+    `create_finetune_dataset` (Llama), in input order. Shards are named by
+    `shard_file_name`; `manifest.json` lists them in order, with their record
+    counts, sizes and the SHA-256 of their uncompressed contents, and is
+    written last, so a directory with a manifest is complete.
+
+    Args:
+        source (str or pd.DataFrame): CSV or JSON Lines file, columnar dataset directory or DataFrame,
+            with 'scenario' and 'is_conflict' columns.
+        output_directory (str): Directory of the shards; the shards of an earlier build are replaced.
+        model (str): One of MODELS.
+        instruction (str): System instruction (GPT) or system prompt (Llama).
+        workers (int): Number of worker processes (1 builds in this process).
+        records_per_shard (int): Number of records per shard (the last shard may hold fewer).
+        compress (bool): Whether to gzip the shards.
+        compression_level (int): gzip compression level, from 1 (fastest) to 9 (smallest).
+        style (str, optional): Scenario style of `prompt_renderer.STYLES` (default: the style of the model);
+            'compact' and 'eta' take fewer tokens.
+
+    Returns:
+        dict: The manifest, with the 'elapsed' seconds and 'records_per_second'.
+
+    Raises:
+        ValueError: If the model, style, worker count or shard size is invalid.
+    """
+    if model not in MODELS:
+        raise ValueError(f"Unknown model: {model}; use one of {', '.join(MODELS)}.")
+    user_prompt_template(model, style)
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    if records_per_shard < 1:
+        raise ValueError("records_per_shard must be at least 1.")
+
+    start = time.perf_counter()
+    source_format = _source_format(source)
+    if source_format == 'columnar':
+        source = os.path.abspath(source)
+    os.makedirs(output_directory, exist_ok=True)
+    manifest_path = os.path.join(output_directory, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    tasks = ((chunk, model, instruction, style, os.path.join(output_directory, shard_file_name(index, compress)),
+              compress, compression_level)
+             for index, chunk in enumerate(_iter_chunks(source, source_format, records_per_shard)))
+    shards = list(_write_shards(tasks, workers))
+    # Remove the shards of an earlier, larger build
+    names = {shard['file'] for shard in shards}
+    for name in os.listdir(output_directory):
+        if name.startswith('shard-') and name not in names:
+            os.remove(os.path.join(output_directory, name))
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'model': model,
+        'style': style or model,
+        'compressed': compress,
+        'records_per_shard': records_per_shard,
+        'records': sum(shard['records'] for shard in shards),
+        'shards': shards,
+    }
+    _write_json(manifest_path, manifest)
+
+    elapsed = time.perf_counter() - start
+    return dict(manifest, elapsed=elapsed, records_per_second=manifest['records'] / elapsed if elapsed else 0.0)
+
+
+def load_shard_manifest(directory):
+    """
+    Reads the manifest of a shard directory.
+
+    Args:
+        directory (str): Shard directory.
+
+    Returns:
+        dict: The manifest.
+
+    Raises:
+        FileNotFoundError: If the directory has no manifest, e.g. because the build did not finish.
+    """
+    with open(os.path.join(directory, MANIFEST_FILE)) as f:
+        return json.load(f)
+
+
+def read_shards(directory):
+    """
+    Reads the records of all shards of a directory, in order.
+
+    Args:
+        directory (str): Shard directory.
+
+    Yields:
+        dict: The next fine-tuning record.
+    """
+    manifest = load_shard_manifest(directory)
+    for shard in manifest['shards']:
+        path = os.path.join(directory, shard['file'])
+        with (gzip.open(path, 'rt', encoding='utf-8') if manifest['compressed']
+              else open(path, encoding='utf-8')) as f:
+            for line in f:
+                yield json.loads(line)
@@ -0,0 +1,269 @@
+# src/instrumentation.py
+
+"""
+Instrumentation Module
+
+This module records per-stage timings and rule-hit counters of the conflict
+detection pipeline. Tracing is off by default and then costs nothing: the
+pipeline functions are only swapped for timing wrappers while tracing is
+enabled, and the originals are put back when it is disabled.
+
+Stages:
+    parse: `parse_vehicles` (includes classify)
+    classify: `Vehicle.get_movement_type`
+    pair_check: `paths_cross` and `arrival_time_close`
+    priority: `priority_winner` (used by `apply_priority_rules` and conflict records)
+    wait: `compute_waiting_times` and `schedule_intersection`
+
+While tracing, `output_conflicts` records the decisions it is given in the
+trace instead of doing nothing.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+
+from . import conflict_detection
+from . import scheduling
+
+STAGES = ('parse', 'classify', 'pair_check', 'priority', 'wait')
+
+# (module, function name, stage) of every traced function
+TRACED_FUNCTIONS = (
+    (conflict_detection, 'parse_vehicles', 'parse'),
+    (conflict_detection, 'paths_cross', 'pair_check'),
+    (conflict_detection, 'arrival_time_close', 'pair_check'),
+    (conflict_detection, 'priority_winner', 'priority'),
+    (conflict_detection, 'compute_waiting_times', 'wait'),
+    (scheduling, 'schedule_intersection', 'wait'),
+)
+
+_active_trace = None
+_patches = []
+
+
+class Trace:
+    """
+    Timings and counters collected while tracing is enabled.
+
+    Attributes:
+        calls (dict): Number of calls per stage.
+        seconds (dict): Total wall time in seconds per stage.
+        counters (dict): Counter name -> {outcome: count}. 'paths_cross' counts the
+            rule that decided each pair (see PATH_RULES), 'arrival_time_close' counts
+            'close' / 'not_close' and 'priority' counts 'movement_rules' / 'arrival_order'.
+        decisions (list of str): Decisions of the conflicts passed to `output_conflicts`.
+    """
+
+    def __init__(self):
+        self.calls = dict.fromkeys(STAGES, 0)
+        self.seconds = dict.fromkeys(STAGES, 0.0)
+        self.counters = {}
+        self.decisions = []
+
+    def reset(self):
+        """
+        Clears all timings and counters.
+        """
+        self.__init__()
+
+    def count(self, counter, outcome):
+        """
+        Increments the count of an outcome.
+
+        Args:
+            counter (str): Counter name.
+            outcome (str): Outcome to count.
+        """
+        outcomes = self.counters.setdefault(counter, {})
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    def to_dict(self):
+        """
+        Returns the collected data.
+
+        Returns:
+            dict: 'stages' (calls, total and mean seconds per stage), 'counters' and 'decisions'.
+        """
+        stages = {}
+        for stage in STAGES:
+            calls = self.calls[stage]
+            stages[stage] = {
+                'calls': calls,
+                'total_seconds': self.seconds[stage],
+                'mean_seconds': self.seconds[stage] / calls if calls else 0.0,
+            }
+        return {
+            'stages': stages,
+            'counters': {name: dict(sorted(outcomes.items())) for name, outcomes in sorted(self.counters.items())},
+            'decisions': list(self.decisions),
+        }
+
+    def to_json(self, path=None, indent=2):
+        """
+        Exports the collected data as JSON.
+
+        Args:
+            path (str, optional): File to write the JSON to.
+            indent (int): Indentation of the JSON output.
+
+        Returns:
+            str: The JSON document.
+        """
+        document = json.dumps(self.to_dict(), indent=indent)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(document)
+        return document
+
+
+def _timed(function, stage, trace, counter=None):
+    """
+    Wraps a function so that its wall time is added to `stage`; `counter`
+    is called with the arguments and result to record an outcome.
+    """
+    perf_counter = time.perf_counter
+
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        result = function(*args, **kwargs)
+        trace.seconds[stage] += perf_counter() - start
+        trace.calls[stage] += 1
+        if counter is not None:
+            counter(trace, result, *args)
+        return result
+
+    wrapper.__name__ = function.__name__
+    wrapper.__doc__ = function.__doc__
+    wrapper.__wrapped__ = function
+    return wrapper
+
+
+def _count_path_rule(trace, result, vehicle1, vehicle2, *args):
+    trace.count('paths_cross', conflict_detection.path_rule(vehicle1, vehicle2))
+
+
+def _count_arrival(trace, result, *args):
+    trace.count('arrival_time_close', 'close' if result else 'not_close')
+
+
+def _count_priority(trace, result, vehicle1, vehicle2, *args):
+    time_difference = abs(vehicle1.time_to_intersection - vehicle2.time_to_intersection)
+    trace.count('priority', 'movement_rules' if time_difference <= conflict_detection.PRIORITY_TIME_THRESHOLD
+                else 'arrival_order')
+
+
+_COUNTERS = {
+    'paths_cross': _count_path_rule,
+    'arrival_time_close': _count_arrival,
+    'priority_winner': _count_priority,
+}
+
+
+def _decision_recorder(trace):
+    """
+    Returns a replacement of `output_conflicts` that records the decisions in `trace`.
+    """
+    def output_conflicts(conflicts):
+        trace.decisions.extend(conflict['decision'] for conflict in conflicts)
+
+    output_conflicts.__doc__ = conflict_detection.output_conflicts.__doc__
+    return output_conflicts
+
+
+def _patch(owner, name, replacement):
+    _patches.append((owner, name, owner.__dict__[name]))
+    setattr(owner, name, replacement)
+
+
+def _patch_references(modules, original, replacement):
+    """
+    Replaces every module attribute bound to `original`.
+    """
+    for module in modules:
+        for attribute, value in list(vars(module).items()):
+            if value is original:
+                _patch(module, attribute, replacement)
+
+
+def enable_tracing(trace=None):
+    """
+    Starts recording timings and counters.
+
+    Every module of this package that imported a traced function by name
+    gets the wrapper as well, so calls through those modules are recorded too.
+    Tracing is process-wide and not thread-safe.
+
+    Args:
+        trace (Trace, optional): Trace to add to; a new one is created if omitted.
+
+    Returns:
+        Trace: The trace being recorded.
+
+    Raises:
+        RuntimeError: If tracing is already enabled.
+    """
+    global _active_trace
+    if _active_trace is not None:
+        raise RuntimeError("Tracing is already enabled.")
+    trace = trace if trace is not None else Trace()
+
+    package_prefix = __package__ + '.'
+    modules = [module for module_name, module in list(sys.modules.items())
+               if module is not None and (module_name == __package__ or module_name.startswith(package_prefix))]
+    for owner, name, stage in TRACED_FUNCTIONS:
+        original = getattr(owner, name)
+        _patch_references(modules, original, _timed(original, stage, trace, _COUNTERS.get(name)))
+    _patch_references(modules, conflict_detection.output_conflicts, _decision_recorder(trace))
+
+    vehicle = conflict_detection.Vehicle
+    _patch(vehicle, 'get_movement_type', _timed(vehicle.get_movement_type, 'classify', trace))
+    _active_trace = trace
+    return trace
+
+
+def disable_tracing():
+    """
+    Stops recording and restores the original functions.
+
+    Returns:
+        Trace: The trace that was recorded, or None if tracing was not enabled.
+    """
+    global _active_trace
+    while _patches:
+        owner, name, original = _patches.pop()
+        setattr(owner, name, original)
+    trace, _active_trace = _active_trace, None
+    return trace
+
+
+def active_trace():
+    """
+    Returns the trace being recorded.
+
+    Returns:
+        Trace: The active trace, or None if tracing is disabled.
+    """
+    return _active_trace
+
+
+@contextmanager
+def tracing(trace=None):
+    """
+    Context manager that records a trace for the duration of the block.
+
+    Args:
+        trace (Trace, optional): Trace to add to.
+
+    Yields:
+        Trace: The trace being recorded.
+    """
+    trace = enable_tracing(trace)
+    try:
+        yield trace
+    finally:
+        disable_tracing()
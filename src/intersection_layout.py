@@ -0,0 +1,266 @@
+# src/intersection_layout.py
+
+"""
+Compiled Intersection Layout Module
+
+This module contains CompiledIntersectionLayout, which validates an
+intersection layout once and resolves every (direction, lane, destination)
+combination to a movement type up front. Vehicles can then be classified
+with a single dictionary lookup, or whole arrays of vehicles at once with a
+dense NumPy lookup table.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import numpy as np
+
+from .conflict_detection import DIRECTION_CODES, MOVEMENT_CODES
+
+# Movement order of the destinations listed for a through lane
+THROUGH_LANE_MOVEMENTS = ['right', 'straight', 'left']
+
+
+class CompiledIntersectionLayout:
+    """
+    Read-only, precomputed form of an intersection layout.
+
+    By default the first lane listed for each direction is a through lane
+    whose destinations are, in order, reached by turning right, going
+    straight and turning left; every further lane of the direction is a
+    dedicated left-turn lane. For the default 8-lane layout this is the same
+    classification as `Vehicle.get_movement_type`. Other conventions can be
+    given explicitly with `lane_movements`.
+
+    Instances are immutable and can be shared between threads; they pickle by
+    their source layout, so they can also be sent to worker processes.
+
+    Attributes:
+        directions (tuple of str): Directions present in the layout.
+        lanes (tuple of str): Lane names; a lane code is an index into this tuple.
+        destinations (tuple of str): Destination names; a destination code is an index into this tuple.
+        movement_table (np.ndarray): Movement codes indexed by
+            [direction code, lane code, destination code]; MOVEMENT_CODES['unknown']
+            for combinations that are not in the layout.
+        lane_table (np.ndarray): True where [direction code, lane code] is a lane of the layout.
+        route_table (np.ndarray): True where [direction code, lane code, destination code]
+            is a destination listed for that lane.
+    """
+
+    def __init__(self, intersection_layout, lane_movements=None):
+        """
+        Validates and compiles an intersection layout.
+
+        Args:
+            intersection_layout (dict): Layout as returned by `parse_intersection_layout`.
+            lane_movements (dict, optional): Maps lane names to a movement type for all of
+                the lane's destinations, or to a list with one movement type per destination.
+
+        Raises:
+            ValueError: If the layout is malformed.
+        """
+        lane_movements = {str(lane): movement for lane, movement in (lane_movements or {}).items()}
+        layout, movements = self._validate(intersection_layout, lane_movements)
+
+        lanes = []
+        destinations = []
+        for direction_lanes in layout.values():
+            for lane, lane_destinations in direction_lanes.items():
+                if lane not in lanes:
+                    lanes.append(lane)
+                for destination in lane_destinations:
+                    if destination not in destinations:
+                        destinations.append(destination)
+        lane_codes = {lane: code for code, lane in enumerate(lanes)}
+        destination_codes = {destination: code for code, destination in enumerate(destinations)}
+
+        unknown = MOVEMENT_CODES['unknown']
+        movement_table = np.full((len(DIRECTION_CODES), max(len(lanes), 1), max(len(destinations), 1)),
+                                 unknown, dtype=np.int8)
+        lane_table = np.zeros((len(DIRECTION_CODES), max(len(lanes), 1)), dtype=bool)
+        route_table = np.zeros(movement_table.shape, dtype=bool)
+        movement_lookup = {}
+        for (direction, lane, destination), movement_type in movements.items():
+            direction_code = DIRECTION_CODES[direction]
+            movement_table[direction_code, lane_codes[lane], destination_codes[destination]] = \
+                MOVEMENT_CODES[movement_type]
+            lane_table[direction_code, lane_codes[lane]] = True
+            route_table[direction_code, lane_codes[lane], destination_codes[destination]] = True
+            movement_lookup[(direction, lane, destination)] = movement_type
+        movement_table.setflags(write=False)
+        lane_table.setflags(write=False)
+        route_table.setflags(write=False)
+
+        source_layout = {direction: {lane: list(lane_destinations)
+                                     for lane, lane_destinations in direction_lanes.items()}
+                         for direction, direction_lanes in layout.items()}
+        object.__setattr__(self, '_source', (source_layout, lane_movements))
+        object.__setattr__(self, '_layout', layout)
+        object.__setattr__(self, '_movement_lookup', movement_lookup)
+        object.__setattr__(self, '_lane_codes', lane_codes)
+        object.__setattr__(self, '_destination_codes', destination_codes)
+        object.__setattr__(self, 'directions', tuple(layout))
+        object.__setattr__(self, 'lanes', tuple(lanes))
+        object.__setattr__(self, 'destinations', tuple(destinations))
+        object.__setattr__(self, 'movement_table', movement_table)
+        object.__setattr__(self, 'lane_table', lane_table)
+        object.__setattr__(self, 'route_table', route_table)
+
+    @staticmethod
+    def _validate(intersection_layout, lane_movements):
+        """
+        Checks the layout and resolves the movement type of every destination.
+
+        Returns:
+            tuple: (normalized layout with tuple destinations, dict mapping
+                (direction, lane, destination) to movement type)
+        """
+        if not isinstance(intersection_layout, dict) or not intersection_layout:
+            raise ValueError("Intersection layout must be a non-empty dictionary.")
+
+        layout = {}
+        movements = {}
+        for direction, direction_lanes in intersection_layout.items():
+            if direction not in DIRECTION_CODES:
+                raise ValueError(f"Intersection layout has invalid direction '{direction}'.")
+            if not isinstance(direction_lanes, dict) or not direction_lanes:
+                raise ValueError(f"Direction '{direction}' must map lanes to destinations.")
+            layout[direction] = {}
+            for position, (lane, lane_destinations) in enumerate(direction_lanes.items()):
+                lane = str(lane)
+                if isinstance(lane_destinations, str) or not lane_destinations:
+                    raise ValueError(f"Lane '{lane}' of direction '{direction}' must list its destinations.")
+                if len(set(lane_destinations)) != len(lane_destinations):
+                    raise ValueError(f"Lane '{lane}' of direction '{direction}' lists a destination twice.")
+
+                if lane in lane_movements:
+                    lane_movement = lane_movements[lane]
+                    if isinstance(lane_movement, str):
+                        lane_movement = [lane_movement] * len(lane_destinations)
+                    if len(lane_movement) != len(lane_destinations):
+                        raise ValueError(f"Lane '{lane}' needs one movement type per destination.")
+                elif position == 0:
+                    lane_movement = THROUGH_LANE_MOVEMENTS[:len(lane_destinations)]
+                    lane_movement += ['unknown'] * (len(lane_destinations) - len(lane_movement))
+                else:
+                    lane_movement = ['left'] * len(lane_destinations)
+
+                for destination, movement_type in zip(lane_destinations, lane_movement):
+                    if movement_type not in MOVEMENT_CODES:
+                        raise ValueError(f"Invalid movement type '{movement_type}' for lane '{lane}'.")
+                    movements[(direction, lane, destination)] = movement_type
+                layout[direction][lane] = tuple(lane_destinations)
+        return layout, movements
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CompiledIntersectionLayout is read-only")
+
+    def __reduce__(self):
+        return (self.__class__, self._source)
+
+    def as_dict(self):
+        """
+        Returns a fresh copy of the layout in the `parse_intersection_layout` format.
+
+        Returns:
+            dict: Directions mapping lanes to lists of destinations.
+        """
+        return {direction: {lane: list(destinations) for lane, destinations in direction_lanes.items()}
+                for direction, direction_lanes in self._layout.items()}
+
+    def lanes_for(self, direction):
+        """
+        Returns the lanes of a direction.
+
+        Args:
+            direction (str): Direction of approach.
+
+        Returns:
+            list of str: Lane names, or an empty list for an unknown direction.
+        """
+        return list(self._layout.get(direction, {}))
+
+    def destinations_for(self, direction, lane):
+        """
+        Returns the destinations reachable from a lane.
+
+        Args:
+            direction (str): Direction of approach.
+            lane (str): Lane name.
+
+        Returns:
+            list of str: Destinations, or an empty list for an unknown lane.
+        """
+        return list(self._layout.get(direction, {}).get(str(lane), ()))
+
+    def movement_type(self, direction, lane, destination):
+        """
+        Resolves the movement type of a single vehicle.
+
+        Args:
+            direction (str): Direction of approach.
+            lane (str): Lane name.
+            destination (str): Destination road.
+
+        Returns:
+            str: Movement type ('straight', 'left', 'right', or 'unknown').
+        """
+        return self._movement_lookup.get((direction, lane, destination), 'unknown')
+
+    def lane_codes(self, lanes):
+        """
+        Encodes lane names as lane codes.
+
+        Args:
+            lanes (iterable of str): Lane names.
+
+        Returns:
+            np.ndarray: Lane codes (int16), -1 for lanes not in the layout.
+        """
+        codes = self._lane_codes
+        return np.array([codes.get(str(lane), -1) for lane in lanes], dtype=np.int16)
+
+    def destination_codes(self, destinations):
+        """
+        Encodes destination names as destination codes.
+
+        Args:
+            destinations (iterable of str): Destination names.
+
+        Returns:
+            np.ndarray: Destination codes (int16), -1 for destinations not in the layout.
+        """
+        codes = self._destination_codes
+        return np.array([codes.get(destination, -1) for destination in destinations], dtype=np.int16)
+
+    def classify(self, direction, lane, destination):
+        """
+        Classifies the movements of whole arrays of vehicles.
+
+        Args:
+            direction (array-like): Direction codes (see DIRECTION_CODES).
+            lane (array-like): Lane codes (see `lane_codes`), -1 for unknown lanes.
+            destination (array-like): Destination codes (see `destination_codes`), -1 for unknown.
+
+        Returns:
+            np.ndarray: Movement codes (int8, see MOVEMENT_CODES).
+        """
+        direction = np.asarray(direction, dtype=np.intp)
+        lane = np.asarray(lane, dtype=np.intp)
+        destination = np.asarray(destination, dtype=np.intp)
+        known = (lane >= 0) & (destination >= 0)
+        movement = self.movement_table[direction, np.where(known, lane, 0), np.where(known, destination, 0)]
+        return np.where(known, movement, MOVEMENT_CODES['unknown']).astype(np.int8)
+
+    def has_lane(self, direction, lane):
+        """
+        Checks whether a direction has the given lane.
+
+        Args:
+            direction (str): Direction of approach.
+            lane (str): Lane name.
+
+        Returns:
+            bool: True if the lane exists for that direction.
+        """
+        return str(lane) in self._layout.get(direction, {})
@@ -0,0 +1,383 @@
+# src/prompt_renderer.py
+
+"""
+Prompt Renderer Module
+
+This module turns vehicle scenarios into the text descriptions and prompts
+used for fine-tuning and evaluating language models, many scenarios at a
+time. Each vehicle sentence is filled into the precompiled %-template of
+its style. Scenario JSON strings are parsed once each. Columnar scenarios
+(GeneratedScenarios or ColumnarDataset) are rendered straight from their
+arrays, with the speeds and distances of all vehicles formatted at once.
+
+Styles:
+    'gpt' and 'llama': the wording of the fine-tuning data, vehicles joined by spaces.
+    'readable': the wording of `utils.parse_scenario_to_string`, one vehicle per line.
+    'compact': a table of one row per vehicle, with speeds and distances rounded to units.
+    'eta': a table with the seconds each vehicle needs to reach the intersection
+        instead of its speed and distance.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import json
+import re
+
+import numpy as np
+
+from .conflict_detection import DIRECTION_CODES
+
+# Vehicle sentences, filled with (vehicle_id, lane, direction, speed, distance, destination)
+FINETUNING_VEHICLE_TEMPLATE = (
+    "Vehicle %s is in lane %s, moving %s at a speed of %.2f km/h, and is %.2f meters away from the intersection, "
+    "heading towards %s."
+)
+READABLE_VEHICLE_TEMPLATE = (
+    "Vehicle %s is in lane %s, approaching from the %s, traveling at %.2f km/h, and is %.2f meters away from the "
+    "intersection, heading towards %s."
+)
+
+# Table rows: 'compact' keeps whole km/h and meters, 'eta' replaces speed and distance by the
+# seconds to the intersection, filled with (vehicle_id, lane, direction, destination, eta)
+COMPACT_VEHICLE_TEMPLATE = "%s,%s,%s,%.0f,%.0f,%s"
+ETA_VEHICLE_TEMPLATE = "%s,%s,%s,%s,%.1f"
+
+# Style -> (vehicle template, separator between vehicles, table header or None)
+STYLES = {
+    'gpt': (FINETUNING_VEHICLE_TEMPLATE, ' ', None),
+    'llama': (FINETUNING_VEHICLE_TEMPLATE, ' ', None),
+    'readable': (READABLE_VEHICLE_TEMPLATE, '\n', None),
+    'compact': (COMPACT_VEHICLE_TEMPLATE, '\n', "id,lane,from,kmh,m,to"),
+    'eta': (ETA_VEHICLE_TEMPLATE, '\n', "id,lane,from,to,eta_s"),
+}
+
+# Styles rendered as tables; pair them with `compact_system_instruction`
+TABLE_STYLES = tuple(style for style, (_, _, header) in STYLES.items() if header is not None)
+
+# Model -> user message around a rendered scenario
+USER_PROMPT_TEMPLATES = {
+    'gpt': "Analyze the following scenario and determine if there is a conflict "
+           "(Respond only with 'yes' or 'no'): %s",
+    'llama': "Analyze the following scenario and determine if there is a conflict "
+             "(Respond only with 'Yes' or 'No'):\n%s",
+}
+
+# Model -> user message around a table style scenario; the system instruction explains the table
+TABLE_USER_PROMPT_TEMPLATES = {
+    'gpt': "Conflict? yes/no\n%s",
+    'llama': "Conflict? Yes/No\n%s",
+}
+
+COMPACT_SYSTEM_INSTRUCTION = (
+    "You detect traffic conflicts at a four-way intersection. Lanes by approach: %s. "
+    "Each table row is a vehicle: id, lane, approach direction (from), then speed in km/h and distance to the "
+    "intersection in m, or the seconds until it reaches the intersection (eta_s), and destination (to). "
+    "Answer only yes or no."
+)
+
+# Llama 3 chat format of a fine-tuning example, filled with (system prompt, user message, answer)
+LLAMA3_TEXT_TEMPLATE = (
+    "<|begin_of_text|><|start_header_id|>system<|end_header_id|>\n\n%s<|eot_id|>"
+    "<|start_header_id|>user<|end_header_id|>\n\n%s<|eot_id|>"
+    "<|start_header_id|>assistant<|end_header_id|>\n\n%s<|eot_id|>"
+)
+
+DIRECTION_NAMES = sorted(DIRECTION_CODES, key=DIRECTION_CODES.get)
+
+VEHICLE_FIELDS = ('vehicle_id', 'lane', 'direction', 'speed', 'distance_to_intersection', 'destination')
+
+# Style -> (vehicle template with its %.Nf fields as %s, decimals of those fields), for preformatted numbers
+_STRING_TEMPLATES = {
+    style: (re.sub(r'%\.\df', '%s', template), [int(digits) for digits in re.findall(r'%\.(\d)f', template)])
+    for style, (template, _, _) in STYLES.items()
+}
+
+# Scaled values below this are rounded with np.rint; near ties are at least one ulp away from .5
+_MAX_SCALED = 2.0 ** 32
+_TIE_TOLERANCE = 1e-6
+
+
+def _style(style):
+    """
+    Returns the vehicle template, separator and header of a style.
+    """
+    if style not in STYLES:
+        raise ValueError(f"Unknown style: {style}; use one of {', '.join(STYLES)}.")
+    return STYLES[style]
+
+
+def _eta_fields(vehicle_id, lane, direction, speed, distance, destination):
+    """
+    Returns the fields of an 'eta' row; a stopped vehicle never arrives.
+    """
+    return vehicle_id, lane, direction, destination, distance * 3.6 / speed if speed else float('inf')
+
+
+def _vehicle_renderer(style):
+    """
+    Returns a function rendering the (vehicle_id, lane, direction, speed, distance, destination)
+    fields of one vehicle in a style.
+    """
+    vehicle_template = _style(style)[0]
+    if style == 'eta':
+        return lambda vehicle: vehicle_template % _eta_fields(*vehicle)
+    return vehicle_template.__mod__
+
+
+def compact_system_instruction(intersection_layout):
+    """
+    Builds a short system instruction for the 'compact' and 'eta' styles.
+
+    Args:
+        intersection_layout (dict): Parsed intersection layout.
+
+    Returns:
+        str: The instruction, listing the destinations of every lane.
+    """
+    lanes = '; '.join(
+        f"{direction} " + ', '.join(f"{lane}->{'/'.join(destinations)}"
+                                    for lane, destinations in direction_lanes.items())
+        for direction, direction_lanes in intersection_layout.items()
+    )
+    return COMPACT_SYSTEM_INSTRUCTION % lanes
+
+
+def _render_rows(scenarios, style):
+    """
+    Renders an iterable of scenario JSON strings or dicts; missing vehicle fields are 'Unknown'.
+    """
+    _, separator, header = _style(style)
+    render_vehicle = _vehicle_renderer(style)
+    join = separator.join
+    rendered = [
+        join([render_vehicle(tuple(vehicle.get(field, "Unknown") for field in VEHICLE_FIELDS))
+              for vehicle in scenario.get("vehicles_scenario", [])])
+        for scenario in (json.loads(scenario) if isinstance(scenario, (str, bytes)) else scenario
+                         for scenario in scenarios)
+    ]
+    if header is not None:
+        rendered = [header + separator + text if text else header for text in rendered]
+    return rendered
+
+
+def _format_fixed(values, decimals):
+    """
+    Formats numbers as `'%.<decimals>f' % value` does, all at once.
+
+    Values are scaled and rounded with NumPy, and each distinct integer part is
+    formatted once. Negative, non-finite and very large values, and values
+    whose scaled form is too close to a rounding tie to round the same way as
+    the exact decimal value, are formatted one by one instead.
+
+    Returns:
+        list of str: The formatted values.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    scale = 10 ** decimals
+    scaled = values * scale
+    exact = np.signbit(values) | ~(np.abs(scaled) < _MAX_SCALED)
+    scaled[exact] = 0.0
+    exact |= np.abs(scaled - np.floor(scaled) - 0.5) < _TIE_TOLERANCE
+    whole, fraction = np.divmod(np.rint(scaled).astype(np.int64), scale)
+    uniques, inverse = np.unique(whole, return_inverse=True)
+    if decimals:
+        heads = np.array([f"{value}." for value in uniques.tolist()], dtype=object)
+        tails = np.array([f"{value:0{decimals}d}" for value in range(scale)], dtype=object)
+        text = heads[inverse.ravel()] + tails[fraction]
+    else:
+        text = np.array([str(value) for value in uniques.tolist()], dtype=object)[inverse.ravel()]
+    positions = np.flatnonzero(exact)
+    template = f"%.{decimals}f"
+    text[positions] = [template % value for value in values[positions].tolist()]
+    return text.tolist()
+
+
+def _render_columns(offsets, vehicle_ids, lanes, directions, speeds, distances, destinations, style):
+    """
+    Renders scenarios from per-vehicle columns; scenario `s` is rows `offsets[s]:offsets[s + 1]`.
+    Speeds and distances are arrays; the other columns are lists of strings.
+    """
+    _, separator, header = _style(style)
+    template, decimals = _STRING_TEMPLATES[style]
+    speeds = np.asarray(speeds, dtype=np.float64)
+    distances = np.asarray(distances, dtype=np.float64)
+    if style == 'eta':
+        # Same arithmetic as _eta_fields, including NaN speeds; a stopped vehicle never arrives
+        with np.errstate(divide='ignore', invalid='ignore'):
+            etas = np.where(speeds != 0, distances * 3.6 / speeds, np.inf)
+        fields = zip(vehicle_ids, lanes, directions, destinations, _format_fixed(etas, decimals[0]))
+    else:
+        fields = zip(vehicle_ids, lanes, directions, _format_fixed(speeds, decimals[0]),
+                     _format_fixed(distances, decimals[1]), destinations)
+    sentences = list(map(template.__mod__, fields))
+    bounds = offsets.tolist()
+    join = separator.join
+    if header is not None:
+        return [join([header] + sentences[begin:end]) for begin, end in zip(bounds, bounds[1:])]
+    return [join(sentences[begin:end]) for begin, end in zip(bounds, bounds[1:])]
+
+
+def render_columnar(dataset, style='gpt', start=0, stop=None):
+    """
+    Renders a range of the scenarios of a columnar dataset.
+
+    Args:
+        dataset (ColumnarDataset): The dataset.
+        style (str): One of STYLES.
+        start (int): First scenario.
+        stop (int, optional): End of the range (default: all scenarios).
+
+    Returns:
+        list of str: One description per scenario.
+    """
+    stop = len(dataset) if stop is None else stop
+    offsets = dataset.vehicle_offsets[start:stop + 1]
+    rows = slice(offsets[0], offsets[-1])
+    vehicle_ids = dataset.vehicle_ids
+    return _render_columns(
+        offsets - offsets[0], [vehicle_ids[code] for code in dataset.vehicle_id[rows].tolist()],
+        np.take(np.array(dataset.lanes, dtype=object), dataset.lane[rows]).tolist(),
+        np.take(DIRECTION_NAMES, dataset.direction[rows]).tolist(), dataset.speed[rows], dataset.distance[rows],
+        np.take(np.array(dataset.destinations, dtype=object), dataset.destination[rows]).tolist(),
+        style,
+    )
+
+
+def render_scenarios(scenarios, style='gpt'):
+    """
+    Renders scenarios as text descriptions.
+
+    Args:
+        scenarios: A DataFrame with a 'scenario' column, an iterable of scenario JSON strings
+            or dicts, a GeneratedScenarios or a ColumnarDataset. Columnar datasets store
+            speeds and distances as float32, which can move a rounded value by 0.01.
+        style (str): One of STYLES.
+
+    Returns:
+        list of str: One description per scenario.
+    """
+    _style(style)
+    if hasattr(scenarios, 'vehicle_number'):
+        # GeneratedScenarios
+        return _render_columns(
+            scenarios.offsets, scenarios.id_namespace.vehicle_ids(scenarios.vehicle_number),
+            np.take(scenarios.layout.lanes, scenarios.lane).tolist(),
+            np.take(DIRECTION_NAMES, scenarios.direction).tolist(), scenarios.speed, scenarios.distance,
+            np.take(scenarios.layout.destinations, scenarios.destination).tolist(),
+            style,
+        )
+    if hasattr(scenarios, 'vehicle_offsets'):
+        # ColumnarDataset
+        return render_columnar(scenarios, style)
+    if hasattr(scenarios, 'columns'):
+        scenarios = scenarios['scenario']
+    if hasattr(scenarios, 'tolist'):
+        scenarios = scenarios.tolist()
+    return _render_rows(scenarios, style)
+
+
+def user_prompt_template(model, style=None):
+    """
+    Returns the user message template of a model for scenarios rendered in a style.
+
+    Args:
+        model (str): 'gpt' or 'llama'.
+        style (str, optional): One of STYLES (default: the style of the model).
+
+    Returns:
+        str: A template with one %s for the rendered scenario.
+    """
+    table = _style(style or model)[2] is not None
+    return (TABLE_USER_PROMPT_TEMPLATES if table else USER_PROMPT_TEMPLATES)[model]
+
+
+def render_user_prompts(scenarios, model='gpt', style=None):
+    """
+    Renders the user messages that ask a model to classify scenarios.
+
+    Args:
+        scenarios: Scenarios in any form accepted by `render_scenarios`.
+        model (str): 'gpt' or 'llama'.
+        style (str, optional): One of STYLES (default: the style of the model). The table
+            styles 'compact' and 'eta' take fewer tokens; pair them with
+            `compact_system_instruction`.
+
+    Returns:
+        list of str: One user message per scenario.
+    """
+    template = user_prompt_template(model, style)
+    return [template % scenario for scenario in render_scenarios(scenarios, style or model)]
+
+
+def render_gpt_conversations(records, system_instruction, style=None):
+    """
+    Renders records as GPT chat fine-tuning examples.
+
+    Args:
+        records (pd.DataFrame): Records with 'scenario' and 'is_conflict' columns.
+        system_instruction (str): Content of the system message.
+        style (str, optional): One of STYLES (default: 'gpt').
+
+    Returns:
+        list of dict: One {'messages': [...]} conversation per record; the assistant
+            message holds the label in lower case.
+    """
+    return gpt_conversations(render_user_prompts(records, 'gpt', style), records['is_conflict'].tolist(),
+                             system_instruction)
+
+
+def render_llama_texts(records, system_prompt, style=None):
+    """
+    Renders records as Llama 3 fine-tuning texts.
+
+    Args:
+        records (pd.DataFrame): Records with 'scenario' and 'is_conflict' columns.
+        system_prompt (str): The system prompt.
+        style (str, optional): One of STYLES (default: 'llama').
+
+    Returns:
+        list of str: One chat-formatted text per record.
+    """
+    return llama_texts(render_user_prompts(records, 'llama', style), records['is_conflict'].tolist(),
+                       system_prompt)
+
+
+def gpt_conversations(user_messages, labels, system_instruction):
+    """
+    Assembles GPT chat fine-tuning examples from rendered user messages.
+
+    Args:
+        user_messages (list of str): User messages from `render_user_prompts`.
+        labels (list of str): 'yes' or 'no' labels, in any case and padding.
+        system_instruction (str): Content of the system message.
+
+    Returns:
+        list of dict: One {'messages': [...]} conversation per message.
+    """
+    return [
+        {
+            "messages": [
+                {"role": "system", "content": system_instruction},
+                {"role": "user", "content": user_message},
+                {"role": "assistant", "content": label.strip().lower()}
+            ]
+        }
+        for user_message, label in zip(user_messages, labels)
+    ]
+
+
+def llama_texts(user_messages, labels, system_prompt):
+    """
+    Assembles Llama 3 fine-tuning texts from rendered user messages.
+
+    Args:
+        user_messages (list of str): User messages from `render_user_prompts`.
+        labels (list of str): Labels, kept in their case without padding.
+        system_prompt (str): The system prompt.
+
+    Returns:
+        list of str: One chat-formatted text per message.
+    """
+    return [LLAMA3_TEXT_TEMPLATE % (system_prompt, user_message, label.strip())
+            for user_message, label in zip(user_messages, labels)]
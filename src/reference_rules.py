@@ -0,0 +1,272 @@
+# src/reference_rules.py
+
+"""
+Reference Rules Module
+
+This module keeps the original branch-by-branch formulation of the path
+crossing and priority rules. The conflict detection code does not call these
+functions directly; they are the source from which the precompiled lookup
+tables in `rule_tables.py` are generated (see `generate_rule_tables.py`) and
+against which those tables are tested.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+from .conflict_detection import DIRECTION_CODES, MOVEMENT_CODES, OPPOSITE_DIRECTIONS
+
+DIRECTION_ORDER = sorted(DIRECTION_CODES, key=DIRECTION_CODES.get)
+MOVEMENT_ORDER = [movement for movement in sorted(MOVEMENT_CODES, key=MOVEMENT_CODES.get)
+                  if movement != 'unknown']
+
+
+# Names of the path crossing rules, in the order they are checked
+PATH_RULES = (
+    'unknown_movement',
+    'same_vehicle',
+    'same_direction',
+    'opposite_straight',
+    'opposite_left',
+    'opposite_right',
+    'adjacent_right',
+    'perpendicular_straight',
+    'left_turn',
+    'right_vs_straight',
+    'default',
+)
+
+
+def paths_cross_rule_reference(vehicle1, vehicle2):
+    """
+    Determines if the paths of two vehicles cross and which rule decided it.
+
+    Args:
+        vehicle1 (Vehicle): First vehicle.
+        vehicle2 (Vehicle): Second vehicle.
+
+    Returns:
+        tuple: (True if paths cross, name of the deciding rule from PATH_RULES)
+    """
+    if 'unknown' in [vehicle1.movement_type, vehicle2.movement_type]:
+        return False, 'unknown_movement'
+    if vehicle1.vehicle_id == vehicle2.vehicle_id:
+        return False, 'same_vehicle'
+
+    # Same direction
+    if vehicle1.direction == vehicle2.direction:
+        return False, 'same_direction'
+
+    # Vehicles going straight from opposite directions do not conflict
+    if vehicle1.movement_type == 'straight' and vehicle2.movement_type == 'straight' and \
+       OPPOSITE_DIRECTIONS[vehicle1.direction] == vehicle2.direction:
+        return False, 'opposite_straight'
+
+    # Opposite left turns do not conflict
+    if vehicle1.movement_type == 'left' and vehicle2.movement_type == 'left' and \
+       OPPOSITE_DIRECTIONS[vehicle1.direction] == vehicle2.direction:
+        return False, 'opposite_left'
+
+    # Right turns from opposite directions do not conflict
+    if vehicle1.movement_type == 'right' and vehicle2.movement_type == 'right' and \
+       OPPOSITE_DIRECTIONS[vehicle1.direction] == vehicle2.direction:
+        return False, 'opposite_right'
+
+    # Right turns from adjacent directions do not conflict
+    if vehicle1.movement_type == 'right' and vehicle2.movement_type == 'right' and \
+       vehicle1.direction != vehicle2.direction and \
+       OPPOSITE_DIRECTIONS[vehicle1.direction] != vehicle2.direction:
+        return False, 'adjacent_right'
+
+    # Vehicles going straight from perpendicular directions conflict
+    if vehicle1.movement_type == 'straight' and vehicle2.movement_type == 'straight' and \
+       (vehicle1.direction != vehicle2.direction) and \
+       (OPPOSITE_DIRECTIONS[vehicle1.direction] != vehicle2.direction):
+        return True, 'perpendicular_straight'
+
+    # Left turn conflicts
+    if vehicle1.movement_type == 'left' or vehicle2.movement_type == 'left':
+        return True, 'left_turn'
+
+    # Right turn vs straight from adjacent directions conflict
+    if (vehicle1.movement_type == 'right' and vehicle2.movement_type == 'straight' and \
+        (vehicle1.direction != vehicle2.direction) and \
+        (OPPOSITE_DIRECTIONS[vehicle1.direction] != vehicle2.direction)) or \
+       (vehicle2.movement_type == 'right' and vehicle1.movement_type == 'straight' and \
+        (vehicle1.direction != vehicle2.direction) and \
+        (OPPOSITE_DIRECTIONS[vehicle2.direction] != vehicle1.direction)):
+        return True, 'right_vs_straight'
+
+    # For all other cases, assume paths do not cross
+    return False, 'default'
+
+
+def paths_cross_reference(vehicle1, vehicle2):
+    """
+    Determines if the paths of two vehicles cross.
+
+    Args:
+        vehicle1 (Vehicle): First vehicle.
+        vehicle2 (Vehicle): Second vehicle.
+
+    Returns:
+        bool: True if paths cross, False otherwise.
+    """
+    return paths_cross_rule_reference(vehicle1, vehicle2)[0]
+
+
+def is_vehicle_on_right_reference(vehicle1, vehicle2):
+    """
+    Determines if vehicle2 is on the right of vehicle1 based on their directions.
+
+    Args:
+        vehicle1 (Vehicle): First vehicle.
+        vehicle2 (Vehicle): Second vehicle.
+
+    Returns:
+        bool: True if vehicle2 is on the right of vehicle1, False otherwise.
+    """
+    idx1 = DIRECTION_ORDER.index(vehicle1.direction)
+    idx2 = DIRECTION_ORDER.index(vehicle2.direction)
+    return (idx2 - idx1) % 4 == 1
+
+
+def apply_priority_rules_reference(vehicle1, vehicle2):
+    """
+    Applies priority rules to determine which vehicle must yield.
+
+    Args:
+        vehicle1 (Vehicle): First vehicle.
+        vehicle2 (Vehicle): Second vehicle.
+
+    Returns:
+        tuple: (decision message, vehicle priorities dictionary)
+    """
+    time_difference = abs(vehicle1.time_to_intersection - vehicle2.time_to_intersection)
+    if time_difference <= 1.0:
+        # 1. Straight over turn
+        if vehicle1.movement_type == 'straight' and vehicle2.movement_type != 'straight':
+            first, second = vehicle1, vehicle2
+        elif vehicle2.movement_type == 'straight' and vehicle1.movement_type != 'straight':
+            first, second = vehicle2, vehicle1
+        # 2. Right turn over left turn
+        elif vehicle1.movement_type == 'right' and vehicle2.movement_type == 'left':
+            first, second = vehicle1, vehicle2
+        elif vehicle2.movement_type == 'right' and vehicle1.movement_type == 'left':
+            first, second = vehicle2, vehicle1
+        # 3. Right-hand rule
+        elif is_vehicle_on_right_reference(vehicle1, vehicle2):
+            first, second = vehicle2, vehicle1
+        else:
+            first, second = vehicle1, vehicle2
+    else:
+        # Vehicle that arrives later must yield
+        if vehicle1.time_to_intersection > vehicle2.time_to_intersection:
+            first, second = vehicle2, vehicle1
+        else:
+            first, second = vehicle1, vehicle2
+    decision = f"Potential conflict: Vehicle {second.vehicle_id} must yield to Vehicle {first.vehicle_id}"
+    priority = {first.vehicle_id: 1, second.vehicle_id: 2}
+    return decision, priority
+
+
+class RuleProbe:
+    """
+    Minimal stand-in for a Vehicle carrying only the attributes the rules read.
+    """
+
+    def __init__(self, vehicle_id, direction, movement_type, time_to_intersection=0.0):
+        self.vehicle_id = vehicle_id
+        self.direction = direction
+        self.movement_type = movement_type
+        self.time_to_intersection = time_to_intersection
+
+
+def build_rule_tables():
+    """
+    Evaluates the reference rules for every combination of direction and movement.
+
+    Classes are numbered `direction_index * 3 + movement_index` following
+    DIRECTION_ORDER and MOVEMENT_ORDER, giving 12 classes and 12 x 12 pairs.
+
+    Returns:
+        dict: 'CONFLICT_TABLE' (1 if the paths cross), 'PATH_RULE_TABLE' (index into
+            PATH_RULES of the rule that decided), 'PRIORITY_TABLE' (0 if the
+            first vehicle has priority when both arrive at the same time, 1 if the
+            second has) and 'RIGHT_OF_TABLE' (4 x 4, 1 if the second direction is
+            on the right of the first).
+    """
+    first_probes = [RuleProbe(f"A{direction}{movement}", direction, movement)
+                    for direction in DIRECTION_ORDER for movement in MOVEMENT_ORDER]
+    second_probes = [RuleProbe(f"B{direction}{movement}", direction, movement)
+                     for direction in DIRECTION_ORDER for movement in MOVEMENT_ORDER]
+
+    conflict_table = []
+    path_rule_table = []
+    priority_table = []
+    for probe1 in first_probes:
+        conflict_row = []
+        path_rule_row = []
+        priority_row = []
+        for probe2 in second_probes:
+            crosses, rule = paths_cross_rule_reference(probe1, probe2)
+            conflict_row.append(int(crosses))
+            path_rule_row.append(PATH_RULES.index(rule))
+            # Equal arrival times select the movement and right-hand rules
+            _, priority = apply_priority_rules_reference(probe1, probe2)
+            priority_row.append(0 if priority[probe1.vehicle_id] == 1 else 1)
+        conflict_table.append(tuple(conflict_row))
+        path_rule_table.append(tuple(path_rule_row))
+        priority_table.append(tuple(priority_row))
+
+    right_of_table = []
+    for direction1 in DIRECTION_ORDER:
+        right_of_table.append(tuple(
+            int(is_vehicle_on_right_reference(RuleProbe('A', direction1, 'straight'),
+                                              RuleProbe('B', direction2, 'straight')))
+            for direction2 in DIRECTION_ORDER
+        ))
+
+    return {
+        'CONFLICT_TABLE': tuple(conflict_table),
+        'PATH_RULE_TABLE': tuple(path_rule_table),
+        'PRIORITY_TABLE': tuple(priority_table),
+        'RIGHT_OF_TABLE': tuple(right_of_table),
+    }
+
+
+def render_rule_tables_module(tables):
+    """
+    Renders the source code of `src/rule_tables.py` for the given tables.
+
+    Args:
+        tables (dict): Tables as returned by `build_rule_tables`.
+
+    Returns:
+        str: Python source of the module.
+    """
+    lines = [
+        "# src/rule_tables.py",
+        "",
+        '"""',
+        "Precompiled Rule Tables",
+        "",
+        "Lookup tables for the path crossing and priority rules, indexed by",
+        "vehicle class `direction_code * 3 + movement_code` (north, east, south, west",
+        "x straight, left, right). Generated from `src/reference_rules.py` by",
+        "`python generate_rule_tables.py`; do not edit by hand.",
+        '"""',
+        "",
+        "NUM_MOVEMENTS = 3",
+        "",
+        "PATH_RULES = (",
+    ]
+    lines.extend(f"    {rule!r}," for rule in PATH_RULES)
+    lines.append(")")
+    lines.append("")
+    for name in ('CONFLICT_TABLE', 'PATH_RULE_TABLE', 'PRIORITY_TABLE', 'RIGHT_OF_TABLE'):
+        lines.append(f"{name} = (")
+        for row in tables[name]:
+            lines.append(f"    ({', '.join(str(value) for value in row)}),")
+        lines.append(")")
+        lines.append("")
+    return "\n".join(lines)
@@ -0,0 +1,259 @@
+# src/relabel.py
+
+"""
+Relabel Module
+
+This module reruns the rule engine over an existing dataset, so that
+changes to the thresholds, rules or intersection layout do not require
+generating the data again. The dataset is streamed in chunks. Each chunk's
+scenarios are parsed in bulk and screened with the vectorized detector;
+only scenarios with conflicts go through `detect_conflicts` to build their
+records. Chunks are relabeled by a pool of worker processes, and the labels
+are compared with the old ones to report how many changed.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import itertools
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from .batch_detection import detect_conflicts_batch
+from .bulk_parser import parse_scenarios
+from .columnar_dataset import ColumnarDatasetWriter, _decode
+from .conflict_detection import (
+    parse_intersection_layout,
+    parse_vehicles,
+    detect_conflicts,
+)
+from .data_generation import INTERSECTION_LAYOUT_JSON, build_record
+from .dataset_writer import RECORD_COLUMNS, ChunkWriter, infer_format
+from .intersection_layout import CompiledIntersectionLayout
+
+# Columns derived by the rule engine, compared with the old labels
+LABEL_COLUMNS = RECORD_COLUMNS[1:]
+
+INPUT_FORMATS = ('csv', 'jsonl')
+OUTPUT_FORMATS = ('csv', 'jsonl', 'parquet', 'columnar')
+
+DEFAULT_RELABEL_CHUNK_SIZE = 10000
+
+
+def read_chunks(path, chunk_size=DEFAULT_RELABEL_CHUNK_SIZE, file_format=None):
+    """
+    Reads a dataset file as a stream of DataFrame chunks.
+
+    CSV cells hold the Python literals written by `DataFrame.to_csv`; JSON
+    Lines records hold lists and dicts.
+
+    Args:
+        path (str): CSV or JSON Lines file.
+        chunk_size (int): Number of records per chunk.
+        file_format (str, optional): One of INPUT_FORMATS (default: inferred from the extension).
+
+    Yields:
+        pd.DataFrame: The next chunk of records.
+    """
+    file_format = file_format or infer_format(path)
+    if file_format not in INPUT_FORMATS:
+        raise ValueError(f"Cannot relabel '{path}'; input must be one of {', '.join(INPUT_FORMATS)}.")
+    if file_format == 'csv':
+        yield from pd.read_csv(path, chunksize=chunk_size)
+        return
+    with open(path, encoding='utf-8') as f:
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                return
+            yield pd.DataFrame([json.loads(line) for line in lines if line.strip()])
+
+
+def _conflict_free_record(scenario_json, vehicle_ids):
+    """
+    Builds the record of a scenario without conflicts, as `build_record` would.
+    """
+    return {
+        'scenario': scenario_json,
+        'is_conflict': 'no',
+        'number_of_conflicts': 0,
+        'places_of_conflicts': [],
+        'conflict_vehicles': [],
+        'decisions': [],
+        'priority_order': dict.fromkeys(vehicle_ids),
+        'waiting_times': dict.fromkeys(vehicle_ids, 0),
+    }
+
+
+def _changed(old_values, new_values, column):
+    """
+    Returns a list telling for each record whether a label differs from the old one.
+    """
+    if column == 'is_conflict':
+        return [old != new for old, new in zip(old_values, new_values)]
+    if column == 'number_of_conflicts':
+        return [int(old) != new for old, new in zip(old_values, new_values)]
+    # CSV cells hold str() of the values, so equal text means equal labels without parsing the literal
+    return [not (isinstance(old, str) and old == str(new)) and _decode(old) != new
+            for old, new in zip(old_values, new_values)]
+
+
+def relabel_records(records, intersection_layout):
+    """
+    Recomputes the labels of a chunk of records.
+
+    Scenarios that `parse_vehicles` would reject cannot be labeled and are
+    dropped; they are counted as 'invalid'. Columns other than RECORD_COLUMNS
+    are not kept.
+
+    Args:
+        records (pd.DataFrame): Records with a 'scenario' column of JSON strings and,
+            optionally, old labels to compare with.
+        intersection_layout (dict): Parsed intersection layout.
+
+    Returns:
+        tuple: (pd.DataFrame of relabeled records, dictionary of counts: 'records' read,
+            'relabeled' and 'invalid' records, 'changed_records' with any changed label,
+            'changed' per label column, 'flips' of is_conflict and the new 'class_counts')
+    """
+    compiled_layout = CompiledIntersectionLayout(intersection_layout)
+    parsed = parse_scenarios(records['scenario'], compiled_layout)
+    batch, valid = parsed.valid_batch()
+    conflict_counts = detect_conflicts_batch(batch.speed, batch.distance, batch.direction, batch.movement,
+                                             batch.offsets).counts
+
+    scenarios = records['scenario'].tolist()
+    relabeled = []
+    for index, count, begin, end in zip(valid.tolist(), conflict_counts.tolist(), batch.offsets.tolist(),
+                                        batch.offsets[1:].tolist()):
+        scenario = scenarios[index]
+        if count:
+            # Only scenarios with conflicts need the full rule engine
+            scenario = json.loads(scenario) if isinstance(scenario, str) else scenario
+            vehicles = parse_vehicles(scenario, compiled_layout)
+            relabeled.append(build_record(scenario, vehicles, detect_conflicts(vehicles, records=True)))
+        else:
+            scenario = scenario if isinstance(scenario, str) else json.dumps(scenario)
+            vehicle_ids = [batch.vehicle_ids[code] for code in batch.vehicle_id[begin:end].tolist()]
+            relabeled.append(_conflict_free_record(scenario, vehicle_ids))
+    relabeled = pd.DataFrame(relabeled, columns=list(RECORD_COLUMNS))
+
+    stats = {
+        'records': len(records),
+        'relabeled': len(relabeled),
+        'invalid': len(records) - len(relabeled),
+        'changed_records': 0,
+        'changed': {},
+        'flips': {'no_to_yes': 0, 'yes_to_no': 0},
+        'class_counts': {'yes': 0, 'no': 0},
+    }
+    any_changed = [False] * len(relabeled)
+    for column in LABEL_COLUMNS:
+        if column not in records:
+            continue
+        changed = _changed(records[column].iloc[valid].tolist(), relabeled[column].tolist(), column)
+        stats['changed'][column] = sum(changed)
+        any_changed = [before or now for before, now in zip(any_changed, changed)]
+    stats['changed_records'] = sum(any_changed)
+    if 'is_conflict' in records:
+        for old, new in zip(records['is_conflict'].iloc[valid].tolist(), relabeled['is_conflict'].tolist()):
+            if old != new:
+                stats['flips'][f'{old}_to_{new}'] = stats['flips'].get(f'{old}_to_{new}', 0) + 1
+    for label, count in relabeled['is_conflict'].value_counts().items():
+        stats['class_counts'][label] += int(count)
+    return relabeled, stats
+
+
+def combine_relabel_stats(chunk_stats):
+    """
+    Adds up the counts of `relabel_records` over chunks.
+
+    Args:
+        chunk_stats (iterable of dict): Counts of each chunk.
+
+    Returns:
+        dict: Total counts, with the 'changed_rate' of relabeled records.
+    """
+    total = {'records': 0, 'relabeled': 0, 'invalid': 0, 'changed_records': 0, 'changed': {},
+             'flips': {'no_to_yes': 0, 'yes_to_no': 0}, 'class_counts': {'yes': 0, 'no': 0}}
+    for stats in chunk_stats:
+        for key in ('records', 'relabeled', 'invalid', 'changed_records'):
+            total[key] += stats[key]
+        for key in ('changed', 'flips', 'class_counts'):
+            for name, count in stats[key].items():
+                total[key][name] = total[key].get(name, 0) + count
+    total['changed_rate'] = total['changed_records'] / total['relabeled'] if total['relabeled'] else 0.0
+    return total
+
+
+def _relabel_chunks(chunks, intersection_layout, workers):
+    """
+    Yields the results of `relabel_records` for every chunk, in order.
+
+    With several workers, at most two chunks per worker are in flight, so
+    memory does not grow with the size of the dataset.
+    """
+    if workers == 1:
+        for chunk in chunks:
+            yield relabel_records(chunk, intersection_layout)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(relabel_records, chunk, intersection_layout))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def relabel_dataset(input_path, output_path, intersection_layout=None, output_format=None, workers=1,
+                    chunk_size=DEFAULT_RELABEL_CHUNK_SIZE, input_format=None):
+    """
+    Relabels a dataset file with the current rule engine, chunk by chunk.
+
+    The output holds the records of the input in order, with recomputed
+    labels; invalid scenarios are dropped. Relabeling an unchanged dataset
+    with unchanged rules reproduces it.
+
+    Args:
+        input_path (str): CSV or JSON Lines dataset.
+        output_path (str): Output file, or directory for the columnar format.
+        intersection_layout (dict, optional): Intersection layout, raw or parsed
+            (default: the layout of `generate_dataset`).
+        output_format (str, optional): One of OUTPUT_FORMATS (default: the input format).
+        workers (int): Number of worker processes (1 relabels in this process).
+        chunk_size (int): Number of records per chunk.
+        input_format (str, optional): One of INPUT_FORMATS (default: inferred from the extension).
+
+    Returns:
+        dict: Counts of `combine_relabel_stats`, with the 'elapsed' seconds and 'records_per_second'.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1.")
+    input_format = input_format or infer_format(input_path)
+    output_format = output_format or input_format
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    if intersection_layout is None:
+        intersection_layout = json.loads(INTERSECTION_LAYOUT_JSON)
+    if 'intersection_layout' in intersection_layout:
+        intersection_layout = parse_intersection_layout(intersection_layout)
+
+    start = time.perf_counter()
+    chunks = read_chunks(input_path, chunk_size, input_format)
+    writer = ColumnarDatasetWriter(output_path) if output_format == 'columnar' \
+        else ChunkWriter(output_path, output_format)
+    chunk_stats = []
+    with writer:
+        for relabeled, stats in _relabel_chunks(chunks, intersection_layout, workers):
+            writer.write(relabeled)
+            chunk_stats.append(stats)
+    report = combine_relabel_stats(chunk_stats)
+    report['elapsed'] = time.perf_counter() - start
+    report['records_per_second'] = report['records'] / report['elapsed'] if report['elapsed'] else 0.0
+    return report
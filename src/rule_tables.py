@@ -0,0 +1,78 @@
+# src/rule_tables.py
+
+"""
+Precompiled Rule Tables
+
+Lookup tables for the path crossing and priority rules, indexed by
+vehicle class `direction_code * 3 + movement_code` (north, east, south, west
+x straight, left, right). Generated from `src/reference_rules.py` by
+`python generate_rule_tables.py`; do not edit by hand.
+"""
+
+NUM_MOVEMENTS = 3
+
+PATH_RULES = (
+    'unknown_movement',
+    'same_vehicle',
+    'same_direction',
+    'opposite_straight',
+    'opposite_left',
+    'opposite_right',
+    'adjacent_right',
+    'perpendicular_straight',
+    'left_turn',
+    'right_vs_straight',
+    'default',
+)
+
+CONFLICT_TABLE = (
+    (0, 0, 0, 1, 1, 1, 0, 1, 0, 1, 1, 1),
+    (0, 0, 0, 1, 1, 1, 1, 0, 1, 1, 1, 1),
+    (0, 0, 0, 1, 1, 0, 0, 1, 0, 1, 1, 0),
+    (1, 1, 1, 0, 0, 0, 1, 1, 1, 0, 1, 0),
+    (1, 1, 1, 0, 0, 0, 1, 1, 1, 1, 0, 1),
+    (1, 1, 0, 0, 0, 0, 1, 1, 0, 0, 1, 0),
+    (0, 1, 0, 1, 1, 1, 0, 0, 0, 1, 1, 1),
+    (1, 0, 1, 1, 1, 1, 0, 0, 0, 1, 1, 1),
+    (0, 1, 0, 1, 1, 0, 0, 0, 0, 1, 1, 0),
+    (1, 1, 1, 0, 1, 0, 1, 1, 1, 0, 0, 0),
+    (1, 1, 1, 1, 0, 1, 1, 1, 1, 0, 0, 0),
+    (1, 1, 0, 0, 1, 0, 1, 1, 0, 0, 0, 0),
+)
+
+PATH_RULE_TABLE = (
+    (2, 2, 2, 7, 8, 9, 3, 8, 10, 7, 8, 9),
+    (2, 2, 2, 8, 8, 8, 8, 4, 8, 8, 8, 8),
+    (2, 2, 2, 9, 8, 6, 10, 8, 5, 9, 8, 6),
+    (7, 8, 9, 2, 2, 2, 7, 8, 9, 3, 8, 10),
+    (8, 8, 8, 2, 2, 2, 8, 8, 8, 8, 4, 8),
+    (9, 8, 6, 2, 2, 2, 9, 8, 6, 10, 8, 5),
+    (3, 8, 10, 7, 8, 9, 2, 2, 2, 7, 8, 9),
+    (8, 4, 8, 8, 8, 8, 2, 2, 2, 8, 8, 8),
+    (10, 8, 5, 9, 8, 6, 2, 2, 2, 9, 8, 6),
+    (7, 8, 9, 3, 8, 10, 7, 8, 9, 2, 2, 2),
+    (8, 8, 8, 8, 4, 8, 8, 8, 8, 2, 2, 2),
+    (9, 8, 6, 10, 8, 5, 9, 8, 6, 2, 2, 2),
+)
+
+PRIORITY_TABLE = (
+    (0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0),
+    (1, 0, 1, 1, 1, 1, 1, 0, 1, 1, 0, 1),
+    (1, 0, 0, 1, 0, 1, 1, 0, 0, 1, 0, 0),
+    (0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0),
+    (1, 0, 1, 1, 0, 1, 1, 1, 1, 1, 0, 1),
+    (1, 0, 0, 1, 0, 0, 1, 0, 1, 1, 0, 0),
+    (0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0),
+    (1, 0, 1, 1, 0, 1, 1, 0, 1, 1, 1, 1),
+    (1, 0, 0, 1, 0, 0, 1, 0, 0, 1, 0, 1),
+    (1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0),
+    (1, 1, 1, 1, 0, 1, 1, 0, 1, 1, 0, 1),
+    (1, 0, 1, 1, 0, 0, 1, 0, 0, 1, 0, 0),
+)
+
+RIGHT_OF_TABLE = (
+    (0, 1, 0, 0),
+    (0, 0, 1, 0),
+    (0, 0, 0, 1),
+    (1, 0, 0, 0),
+)
@@ -10,7 +10,7 @@ Author: Your Name
 Date: YYYY-MM-DD
 """
 
-import json
+from .prompt_renderer import render_scenarios
 
 
 def parse_scenario_to_string(scenario_string):
@@ -23,27 +23,7 @@ def parse_scenario_to_string(scenario_string):
     Returns:
         str: Formatted text description of the scenario.
     """
-    scenario_data = json.loads(scenario_string)
-    vehicles = scenario_data.get("vehicles_scenario", [])
-    scenario_description = []
-
-    for vehicle in vehicles:
-        vehicle_id = vehicle.get("vehicle_id", "Unknown")
-        lane = vehicle.get("lane", "Unknown")
-        speed = vehicle.get("speed", "Unknown")
-        distance = vehicle.get("distance_to_intersection", "Unknown")
-        direction = vehicle.get("direction", "Unknown")
-        destination = vehicle.get("destination", "Unknown")
-
-        vehicle_description = (
-            f"Vehicle {vehicle_id} is in lane {lane}, approaching from the {direction}, "
-            f"traveling at {speed:.2f} km/h, and is {distance:.2f} meters away from the intersection, "
-            f"heading towards {destination}."
-        )
-        scenario_description.append(vehicle_description)
-
-    readable_string = "\n".join(scenario_description)
-    return readable_string
+    return render_scenarios([scenario_string], 'readable')[0]
 
 
 def parse_analysis_to_string(row):
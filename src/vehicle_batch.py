@@ -0,0 +1,302 @@
+# src/vehicle_batch.py
+
+"""
+Vehicle Batch Module
+
+This module contains a compact columnar container for large numbers of
+vehicles. Instead of one Vehicle object per vehicle, a VehicleBatch stores
+float64 kinematics and small integer codes for directions, lanes,
+destinations, movement types and interned vehicle IDs. Row views expose the
+same attributes as Vehicle, so existing code such as `detect_conflicts` keeps
+working on them.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+from array import array
+
+import numpy as np
+
+from .conflict_detection import (
+    Vehicle,
+    DIRECTION_CODES,
+    MOVEMENT_CODES,
+    parse_vehicles,
+)
+from .batch_detection import compute_times_to_intersection, detect_conflicts_batch
+
+DIRECTION_NAMES = sorted(DIRECTION_CODES, key=DIRECTION_CODES.get)
+MOVEMENT_NAMES = sorted(MOVEMENT_CODES, key=MOVEMENT_CODES.get)
+
+
+class VehicleView:
+    """
+    Read-only view of one row of a VehicleBatch with the Vehicle attribute API.
+    """
+
+    __slots__ = ('batch', 'index')
+
+    def __init__(self, batch, index):
+        self.batch = batch
+        self.index = index
+
+    @property
+    def vehicle_id(self):
+        return self.batch.vehicle_ids[self.batch.vehicle_id[self.index]]
+
+    @property
+    def lane(self):
+        return self.batch.lanes[self.batch.lane[self.index]]
+
+    @property
+    def speed(self):
+        return float(self.batch.speed[self.index])
+
+    @property
+    def distance_to_intersection(self):
+        return float(self.batch.distance[self.index])
+
+    @property
+    def direction(self):
+        return DIRECTION_NAMES[self.batch.direction[self.index]]
+
+    @property
+    def destination(self):
+        return self.batch.destinations[self.batch.destination[self.index]]
+
+    @property
+    def time_to_intersection(self):
+        return float(self.batch.time_to_intersection[self.index])
+
+    @property
+    def movement_type(self):
+        return MOVEMENT_NAMES[self.batch.movement[self.index]]
+
+    def __repr__(self):
+        return (f"VehicleView({self.vehicle_id!r}, lane={self.lane!r}, direction={self.direction!r}, "
+                f"movement_type={self.movement_type!r})")
+
+
+class _Interner:
+    """
+    Maps hashable values to dense integer codes in order of first appearance.
+    """
+
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+class VehicleBatch:
+    """
+    Columnar storage for the vehicles of many scenarios.
+
+    The vehicles of scenario `s` are the rows `offsets[s]:offsets[s + 1]`.
+
+    Attributes:
+        speed (np.ndarray): Speeds in km/h (float64).
+        distance (np.ndarray): Distances to intersection in meters (float64).
+        time_to_intersection (np.ndarray): Times to intersection in seconds (float64).
+        direction (np.ndarray): Direction codes (int8, see DIRECTION_CODES).
+        movement (np.ndarray): Movement codes (int8, see MOVEMENT_CODES).
+        lane (np.ndarray): Indices into `lanes` (int16).
+        destination (np.ndarray): Indices into `destinations` (int16).
+        vehicle_id (np.ndarray): Indices into `vehicle_ids` (int32).
+        offsets (np.ndarray): Start of each scenario in the vehicle arrays (int64).
+        lanes (list of str): Lane names.
+        destinations (list of str): Destination names.
+        vehicle_ids (list of str): Interned vehicle IDs.
+    """
+
+    def __init__(self, speed, distance, direction, movement, lane, destination, vehicle_id,
+                 offsets, lanes, destinations, vehicle_ids):
+        self.speed = np.asarray(speed, dtype=np.float64)
+        self.distance = np.asarray(distance, dtype=np.float64)
+        self.direction = np.asarray(direction, dtype=np.int8)
+        self.movement = np.asarray(movement, dtype=np.int8)
+        self.lane = np.asarray(lane, dtype=np.int16)
+        self.destination = np.asarray(destination, dtype=np.int16)
+        self.vehicle_id = np.asarray(vehicle_id, dtype=np.int32)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.lanes = list(lanes)
+        self.destinations = list(destinations)
+        self.vehicle_ids = list(vehicle_ids)
+        self.time_to_intersection = compute_times_to_intersection(self.speed, self.distance)
+
+    @classmethod
+    def from_vehicles(cls, vehicle_lists):
+        """
+        Builds a batch from lists of Vehicle objects (or objects with the same attributes).
+
+        Args:
+            vehicle_lists (iterable of list of Vehicle): Vehicles of each scenario.
+
+        Returns:
+            VehicleBatch: The batch.
+        """
+        speed = array('d')
+        distance = array('d')
+        direction = array('b')
+        movement = array('b')
+        lane = array('h')
+        destination = array('h')
+        vehicle_id = array('i')
+        offsets = array('q', [0])
+        lanes = _Interner()
+        destinations = _Interner()
+        vehicle_ids = _Interner()
+
+        for vehicles in vehicle_lists:
+            for vehicle in vehicles:
+                speed.append(vehicle.speed)
+                distance.append(vehicle.distance_to_intersection)
+                direction.append(DIRECTION_CODES[vehicle.direction])
+                movement.append(MOVEMENT_CODES[vehicle.movement_type])
+                lane.append(lanes.code(vehicle.lane))
+                destination.append(destinations.code(vehicle.destination))
+                vehicle_id.append(vehicle_ids.code(vehicle.vehicle_id))
+            offsets.append(len(speed))
+
+        return cls(
+            np.frombuffer(speed, dtype=np.float64), np.frombuffer(distance, dtype=np.float64),
+            np.frombuffer(direction, dtype=np.int8), np.frombuffer(movement, dtype=np.int8),
+            np.frombuffer(lane, dtype=np.int16), np.frombuffer(destination, dtype=np.int16),
+            np.frombuffer(vehicle_id, dtype=np.int32), np.frombuffer(offsets, dtype=np.int64),
+            lanes.values, destinations.values, vehicle_ids.values
+        )
+
+    @classmethod
+    def from_scenarios(cls, scenarios, intersection_layout):
+        """
+        Builds a batch from vehicle scenarios.
+
+        Each scenario is validated like `parse_vehicles`; the temporary Vehicle
+        objects are discarded as soon as their row has been stored.
+
+        Args:
+            scenarios (iterable of dict): Vehicle scenarios (each with a 'vehicles_scenario' list).
+            intersection_layout (dict or CompiledIntersectionLayout): Layout of the intersection.
+
+        Returns:
+            VehicleBatch: The batch.
+
+        Raises:
+            ValueError: If a scenario contains invalid vehicle data.
+        """
+        return cls.from_vehicles(parse_vehicles(scenario, intersection_layout) for scenario in scenarios)
+
+    def __len__(self):
+        return len(self.speed)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("VehicleBatch index out of range")
+        return VehicleView(self, index)
+
+    @property
+    def num_scenarios(self):
+        """
+        int: Number of scenarios in the batch.
+        """
+        return len(self.offsets) - 1
+
+    @property
+    def nbytes(self):
+        """
+        int: Memory used by the column arrays in bytes.
+        """
+        return sum(column.nbytes for column in (
+            self.speed, self.distance, self.time_to_intersection, self.direction, self.movement,
+            self.lane, self.destination, self.vehicle_id, self.offsets
+        ))
+
+    def scenario(self, scenario_index):
+        """
+        Returns the vehicles of one scenario as row views.
+
+        Args:
+            scenario_index (int): Index of the scenario.
+
+        Returns:
+            list of VehicleView: Vehicles of the scenario.
+        """
+        start, end = self.offsets[scenario_index], self.offsets[scenario_index + 1]
+        return [VehicleView(self, index) for index in range(start, end)]
+
+    def scenario_vehicle_ids(self, scenario_index):
+        """
+        Returns the vehicle IDs of one scenario.
+
+        Args:
+            scenario_index (int): Index of the scenario.
+
+        Returns:
+            list of str: Vehicle IDs of the scenario, in order.
+        """
+        start, end = self.offsets[scenario_index], self.offsets[scenario_index + 1]
+        return [self.vehicle_ids[code] for code in self.vehicle_id[start:end]]
+
+    def to_vehicles(self, scenario_index, intersection_layout):
+        """
+        Materializes the vehicles of one scenario as Vehicle objects.
+
+        Args:
+            scenario_index (int): Index of the scenario.
+            intersection_layout (dict): Layout of the intersection.
+
+        Returns:
+            list of Vehicle: Vehicles of the scenario.
+        """
+        return [
+            Vehicle(
+                vehicle_id=view.vehicle_id,
+                lane=view.lane,
+                speed=view.speed,
+                distance_to_intersection=view.distance_to_intersection,
+                direction=view.direction,
+                destination=view.destination,
+                intersection_layout=intersection_layout
+            )
+            for view in self.scenario(scenario_index)
+        ]
+
+    def classify_movements(self, compiled_layout):
+        """
+        Classifies the movements of all vehicles against a compiled layout at once.
+
+        Args:
+            compiled_layout (CompiledIntersectionLayout): Layout of the intersection.
+
+        Returns:
+            np.ndarray: Movement codes (int8, see MOVEMENT_CODES).
+        """
+        lane_codes = compiled_layout.lane_codes(self.lanes)
+        destination_codes = compiled_layout.destination_codes(self.destinations)
+        return compiled_layout.classify(self.direction, lane_codes[self.lane],
+                                        destination_codes[self.destination])
+
+    def detect_conflicts(self, **kwargs):
+        """
+        Runs `detect_conflicts_batch` on all scenarios of the batch.
+
+        Args:
+            **kwargs: Thresholds forwarded to `detect_conflicts_batch`.
+
+        Returns:
+            BatchConflicts: Ragged conflicts of every scenario.
+        """
+        return detect_conflicts_batch(self.speed, self.distance, self.direction, self.movement,
+                                      self.offsets, **kwargs)
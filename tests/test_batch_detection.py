@@ -0,0 +1,133 @@
+# tests/test_batch_detection.py
+
+"""
+Unit Tests for Batch Conflict Detection Module
+
+This module checks that the vectorized batch engine reproduces the results of
+the per-pair `detect_conflicts` implementation.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import json
+import random
+import warnings
+from src.conflict_detection import (
+    parse_vehicles,
+    detect_conflicts,
+    parse_intersection_layout,
+)
+from src.data_generation import generate_vehicle_scenario
+from src.batch_detection import encode_scenarios, detect_conflicts_batch
+from src.vehicle_batch import VehicleBatch
+
+
+class TestBatchDetection(unittest.TestCase):
+    """
+    Unit tests for the batch conflict detection engine.
+    """
+
+    def setUp(self):
+        with open('data/intersection_layout.json') as f:
+            self.intersection_layout = parse_intersection_layout(json.load(f))
+
+    def assert_matches_scalar(self, scenarios):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            arrays = encode_scenarios(scenarios, self.intersection_layout)
+            expected = [detect_conflicts(parse_vehicles(scenario, self.intersection_layout))
+                        for scenario in scenarios]
+        result = detect_conflicts_batch(arrays['speed'], arrays['distance'], arrays['direction'],
+                                        arrays['movement'], arrays['offsets'])
+        self.assertEqual(len(result), len(scenarios))
+        offsets = arrays['offsets']
+        for i, conflicts in enumerate(expected):
+            vehicle_ids = arrays['vehicle_ids'][offsets[i]:offsets[i + 1]]
+            self.assertEqual(result.conflicts_for(i, vehicle_ids), conflicts)
+
+    def test_random_scenarios_match_detect_conflicts(self):
+        """
+        Test random scenarios of varying sizes against the scalar implementation.
+        """
+        rng_state = random.getstate()
+        random.seed(42)
+        scenarios = [generate_vehicle_scenario(8, self.intersection_layout, fixed_vehicle_count=False)
+                     for _ in range(3000)]
+        random.setstate(rng_state)
+        self.assert_matches_scalar(scenarios)
+
+    def test_stopped_vehicles_and_unknown_lanes(self):
+        """
+        Test infinite arrival times, zero distances and unknown movements.
+        """
+        scenarios = [
+            {"vehicles_scenario": [
+                {"vehicle_id": "V1", "lane": 1, "speed": 0, "distance_to_intersection": 0, "direction": "north", "destination": "H"},
+                {"vehicle_id": "V2", "lane": 3, "speed": 0, "distance_to_intersection": 80, "direction": "east", "destination": "B"},
+                {"vehicle_id": "V3", "lane": 5, "speed": 40, "distance_to_intersection": 0, "direction": "south", "destination": "D"},
+                {"vehicle_id": "V4", "lane": 7, "speed": 40, "distance_to_intersection": 5, "direction": "west", "destination": "F"}
+            ]},
+            {"vehicles_scenario": [
+                {"vehicle_id": "V5", "lane": 9, "speed": 50, "distance_to_intersection": 100, "direction": "north", "destination": "A"},
+                {"vehicle_id": "V6", "lane": 3, "speed": 50, "distance_to_intersection": 100, "direction": "east", "destination": "B"}
+            ]},
+            {"vehicles_scenario": [
+                {"vehicle_id": "V7", "lane": 3, "speed": 50, "distance_to_intersection": 100, "direction": "east", "destination": "B"}
+            ]},
+            {"vehicles_scenario": []},
+        ]
+        self.assert_matches_scalar(scenarios)
+
+
+class TestVehicleBatch(unittest.TestCase):
+    """
+    Unit tests for the columnar vehicle batch.
+    """
+
+    def setUp(self):
+        with open('data/intersection_layout.json') as f:
+            self.intersection_layout = parse_intersection_layout(json.load(f))
+        rng_state = random.getstate()
+        random.seed(3)
+        self.scenarios = [generate_vehicle_scenario(6, self.intersection_layout, fixed_vehicle_count=False)
+                          for _ in range(200)]
+        random.setstate(rng_state)
+        self.batch = VehicleBatch.from_scenarios(self.scenarios, self.intersection_layout)
+
+    def test_row_views_match_vehicles(self):
+        """
+        Test that row views expose the same attributes as Vehicle objects.
+        """
+        attributes = ['vehicle_id', 'lane', 'speed', 'distance_to_intersection', 'direction',
+                      'destination', 'time_to_intersection', 'movement_type']
+        self.assertEqual(self.batch.num_scenarios, len(self.scenarios))
+        for i, scenario in enumerate(self.scenarios):
+            vehicles = parse_vehicles(scenario, self.intersection_layout)
+            views = self.batch.scenario(i)
+            self.assertEqual(len(views), len(vehicles))
+            for view, vehicle in zip(views, vehicles):
+                for attribute in attributes:
+                    self.assertEqual(getattr(view, attribute), getattr(vehicle, attribute))
+            self.assertEqual(detect_conflicts(views), detect_conflicts(vehicles))
+
+    def test_batch_detection(self):
+        """
+        Test batch detection on a VehicleBatch against the scalar implementation.
+        """
+        result = self.batch.detect_conflicts()
+        for i, scenario in enumerate(self.scenarios):
+            expected = detect_conflicts(parse_vehicles(scenario, self.intersection_layout))
+            self.assertEqual(result.conflicts_for(i, self.batch.scenario_vehicle_ids(i)), expected)
+
+    def test_vehicle_has_no_instance_dict(self):
+        """
+        Test that Vehicle uses __slots__.
+        """
+        vehicle = self.batch.to_vehicles(0, self.intersection_layout)[0]
+        self.assertFalse(hasattr(vehicle, '__dict__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
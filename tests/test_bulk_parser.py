@@ -0,0 +1,182 @@
+# tests/test_bulk_parser.py
+
+"""
+Unit Tests for the Bulk Parser
+
+This module checks that `parse_scenarios` accepts and rejects the same
+scenarios as `parse_vehicles`, reports the reason that `parse_vehicles`
+would raise or warn about, and classifies movements identically.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import json
+import math
+import random
+import warnings
+import pandas as pd
+from src.conflict_detection import parse_intersection_layout, parse_vehicles, MOVEMENT_CODES
+from src.bulk_parser import parse_scenarios, REASON_CODES, REASON_NAMES
+
+
+class TestBulkParser(unittest.TestCase):
+    """
+    Unit tests for the bulk parser.
+    """
+
+    def setUp(self):
+        with open('data/intersection_layout.json') as f:
+            self.intersection_layout = parse_intersection_layout(json.load(f))
+
+    def dirty_scenario(self, rng):
+        vehicles = []
+        for i in range(rng.randint(1, 6)):
+            direction = rng.choice(['north', 'east', 'south', 'west'])
+            lane = rng.choice(list(self.intersection_layout[direction]))
+            vehicle = {
+                "vehicle_id": f"V{rng.randint(1, 12)}",
+                "lane": lane,
+                "speed": rng.uniform(0, 80),
+                "distance_to_intersection": rng.uniform(0, 500),
+                "direction": direction,
+                "destination": rng.choice(self.intersection_layout[direction][lane])
+            }
+            fault = rng.random()
+            if fault < 0.03:
+                vehicle['speed'] = -rng.uniform(1, 10)
+            elif fault < 0.06:
+                vehicle['distance_to_intersection'] = -1
+            elif fault < 0.09:
+                vehicle['direction'] = rng.choice(['up', 'NORTH', 'West'])
+            elif fault < 0.12:
+                vehicle['vehicle_id'] = ''
+            elif fault < 0.15:
+                vehicle['lane'] = rng.choice(['9', 1, '3'])
+            elif fault < 0.18:
+                vehicle['destination'] = rng.choice(['Z', 'A', 'B'])
+            vehicles.append(vehicle)
+        return {"vehicles_scenario": vehicles}
+
+    def expected_reason(self, scenario):
+        """
+        Returns the reason name implied by parse_vehicles' exception or first warning.
+        """
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            try:
+                vehicles = parse_vehicles(scenario, self.intersection_layout)
+            except ValueError as e:
+                message = str(e)
+                for reason, text in (('duplicate_vehicle_id', 'Duplicate'), ('negative_speed', 'negative speed'),
+                                     ('negative_distance', 'negative distance'),
+                                     ('invalid_direction', 'invalid direction'), ('empty_vehicle_id', 'empty')):
+                    if text in message:
+                        return reason, None
+                raise
+        if not caught:
+            return 'ok', vehicles
+        message = str(caught[0].message)
+        if 'unknown lane' in message:
+            return 'unknown_lane', vehicles
+        if 'not accessible' in message:
+            return 'unreachable_destination', vehicles
+        return 'unknown_movement', vehicles
+
+    def test_matches_parse_vehicles(self):
+        """
+        Test reasons, error mask and movement types against parse_vehicles on dirty data.
+        """
+        rng = random.Random(17)
+        scenarios = [self.dirty_scenario(rng) for _ in range(400)]
+        parsed = parse_scenarios(scenarios, self.intersection_layout)
+        self.assertEqual(len(parsed), len(scenarios))
+        for index, scenario in enumerate(scenarios):
+            reason, vehicles = self.expected_reason(scenario)
+            with self.subTest(scenario=index):
+                self.assertEqual(parsed.reasons()[index], reason)
+                self.assertEqual(bool(parsed.error_mask[index]), vehicles is None)
+                if vehicles is not None:
+                    rows = range(parsed.offsets[index], parsed.offsets[index + 1])
+                    self.assertEqual([parsed.batch.movement[row] for row in rows],
+                                     [MOVEMENT_CODES[vehicle.movement_type] for vehicle in vehicles])
+        self.assertGreater(parsed.error_mask.sum(), 0)
+        self.assertLess(parsed.error_mask.sum(), len(scenarios))
+
+        batch, valid = parsed.valid_batch()
+        self.assertEqual(list(valid), [i for i in range(len(scenarios)) if not parsed.error_mask[i]])
+        for position, index in enumerate(valid[:20]):
+            self.assertEqual(batch.scenario_vehicle_ids(position),
+                             [vehicle['vehicle_id'] for vehicle in scenarios[index]['vehicles_scenario']])
+
+    def test_malformed_input(self):
+        """
+        Test scenarios and fields that parse_vehicles cannot handle at all.
+        """
+        vehicle = {"vehicle_id": "V1", "lane": "1", "speed": 50, "distance_to_intersection": 100,
+                   "direction": "north", "destination": "F"}
+        scenarios = pd.DataFrame({'scenario': [
+            json.dumps({"vehicles_scenario": [vehicle]}),
+            '{"vehicles_scenario": [',
+            json.dumps({"vehicles": []}),
+            json.dumps({"vehicles_scenario": [dict(vehicle, speed=None)]}),
+            json.dumps({"vehicles_scenario": [{k: v for k, v in vehicle.items() if k != 'lane'}]}),
+            json.dumps({"vehicles_scenario": [dict(vehicle, speed="fast")]}),
+            json.dumps({"vehicles_scenario": []}),
+        ]})
+        parsed = parse_scenarios(scenarios, self.intersection_layout)
+        self.assertEqual(parsed.reasons(), ['ok', 'malformed_scenario', 'malformed_scenario', 'missing_field',
+                                            'missing_field', 'invalid_number', 'ok'])
+        self.assertEqual(list(parsed.error_mask), [False, True, True, True, True, True, False])
+        self.assertEqual(parsed.summary(), {'ok': 2, 'malformed_scenario': 2, 'missing_field': 2,
+                                            'invalid_number': 1})
+        self.assertEqual(REASON_NAMES[REASON_CODES['unknown_lane']], 'unknown_lane')
+
+    def test_none_fields(self):
+        """
+        Test that the error mask matches parse_vehicles on fields that are None or absent.
+        """
+        vehicle = {"vehicle_id": "V1", "lane": "1", "speed": 50, "distance_to_intersection": 100,
+                   "direction": "north", "destination": "F"}
+        scenarios = [{"vehicles_scenario": [dict(vehicle, **{field: None})]} for field in vehicle]
+        scenarios.append({"vehicles_scenario": [dict(vehicle, lane=None, destination=None)]})
+        scenarios += [{"vehicles_scenario": [{k: v for k, v in vehicle.items() if k != field}]}
+                      for field in ('lane', 'destination')]
+        parsed = parse_scenarios(scenarios, self.intersection_layout)
+        for index, scenario in enumerate(scenarios):
+            with self.subTest(scenario=scenario):
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    try:
+                        vehicles = parse_vehicles(scenario, self.intersection_layout)
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        vehicles = None
+                self.assertEqual(bool(parsed.error_mask[index]), vehicles is None)
+                if vehicles is not None:
+                    self.assertEqual(vehicles[0].movement_type, 'unknown')
+                    self.assertEqual(parsed.batch.movement[parsed.offsets[index]], MOVEMENT_CODES['unknown'])
+        self.assertEqual(parsed.reasons(), ['missing_field', 'unknown_movement', 'missing_field', 'missing_field',
+                                            'missing_field', 'unknown_movement', 'unknown_movement',
+                                            'missing_field', 'missing_field'])
+
+    def test_nan_numbers(self):
+        """
+        Test that NaN speeds and distances are accepted, as parse_vehicles accepts them.
+        """
+        vehicle = {"vehicle_id": "V1", "lane": "1", "speed": 50, "distance_to_intersection": 100,
+                   "direction": "north", "destination": "F"}
+        scenarios = [
+            {"vehicles_scenario": [dict(vehicle, speed=float('nan'))]},
+            json.dumps({"vehicles_scenario": [dict(vehicle, distance_to_intersection=float('nan')),
+                                              dict(vehicle, vehicle_id="V2", speed="50")]}),
+        ]
+        parsed = parse_scenarios(scenarios, self.intersection_layout)
+        self.assertEqual(parsed.reasons(), ['ok', 'invalid_number'])
+        self.assertEqual(self.expected_reason(scenarios[0])[0], 'ok')
+        self.assertEqual(list(parsed.vehicle_reasons), [0, 0, REASON_CODES['invalid_number']])
+        self.assertTrue(math.isnan(parsed.batch.speed[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
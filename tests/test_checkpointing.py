@@ -0,0 +1,103 @@
+# tests/test_checkpointing.py
+
+"""
+Unit Tests for Checkpointed Generation
+
+This module checks that an interrupted checkpointed run, once resumed,
+produces the same dataset as an uninterrupted one.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import pandas as pd
+from src.checkpointing import generate_checkpointed, combine_chunks, load_manifest, MANIFEST_FILE
+from src.dataset_writer import RECORD_COLUMNS
+from src.dataset_writer import write_dataset
+
+
+class TestCheckpointing(unittest.TestCase):
+    """
+    Unit tests for checkpointed generation.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.options = dict(total_records=47, num_vehicles=5, fixed_vehicle_count=False, seed=13, chunk_size=10)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def read(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_resume(self):
+        for file_format in ('csv', 'jsonl'):
+            with self.subTest(file_format=file_format):
+                checkpoint = self.path(f'run-{file_format}')
+                manifest = generate_checkpointed(checkpoint, file_format=file_format, max_chunks=2, **self.options)
+                self.assertFalse(manifest['complete'])
+                self.assertEqual(len(manifest['completed_chunks']), 2)
+                self.assertEqual(manifest['class_counts'], {'yes': 10, 'no': 10})
+                self.assertNotEqual(manifest['completed_chunks'][0]['rng_state'],
+                                    manifest['completed_chunks'][1]['rng_state'])
+
+                # A chunk that was being written when the run died
+                with open(os.path.join(checkpoint, f'chunk-00002.{file_format}.tmp'), 'w') as f:
+                    f.write('partial')
+                manifest = generate_checkpointed(checkpoint, file_format=file_format, workers=2,
+                                                 **dict(self.options, seed=None))
+                self.assertTrue(manifest['complete'])
+                self.assertEqual(manifest['class_counts'], {'yes': 24, 'no': 23})
+                self.assertEqual(sorted(os.listdir(checkpoint)),
+                                 [f'chunk-{index:05d}.{file_format}' for index in range(5)] + ['manifest.json'])
+
+                expected = self.path(f'expected.{file_format}')
+                stats = write_dataset(expected, **self.options)
+                self.assertEqual(manifest['generation_stats'], stats)
+                self.assertEqual(combine_chunks(checkpoint, self.path(f'combined.{file_format}')), 47)
+                self.assertEqual(self.read(self.path(f'combined.{file_format}')), self.read(expected))
+
+    def test_mismatch(self):
+        checkpoint = self.path('run')
+        generate_checkpointed(checkpoint, max_chunks=1, **self.options)
+        with self.assertRaises(ValueError):
+            generate_checkpointed(checkpoint, **dict(self.options, total_records=48))
+        with self.assertRaises(ValueError):
+            generate_checkpointed(checkpoint, **dict(self.options, sampler='near_threshold'))
+        with self.assertRaises(ValueError):
+            combine_chunks(checkpoint, self.path('combined.csv'))
+        self.assertEqual(len(load_manifest(checkpoint)['completed_chunks']), 1)
+
+    def test_stale_rng_state(self):
+        checkpoint = self.path('run')
+        manifest = generate_checkpointed(checkpoint, max_chunks=2, **self.options)
+        # A chunk left over from a run whose generator drew differently
+        manifest['completed_chunks'][1]['rng_state'] = manifest['completed_chunks'][0]['rng_state']
+        with open(os.path.join(checkpoint, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f)
+        with self.assertRaises(ValueError):
+            generate_checkpointed(checkpoint, **self.options)
+
+    def test_empty(self):
+        checkpoint = self.path('run')
+        manifest = generate_checkpointed(checkpoint, **dict(self.options, total_records=0))
+        self.assertTrue(manifest['complete'])
+        self.assertEqual(combine_chunks(checkpoint, self.path('combined.csv')), 0)
+        combined = pd.read_csv(self.path('combined.csv'))
+        self.assertEqual((len(combined), tuple(combined.columns)), (0, RECORD_COLUMNS))
+        write_dataset(self.path('direct.csv'), 0)
+        with open(self.path('combined.csv'), 'rb') as f, open(self.path('direct.csv'), 'rb') as g:
+            self.assertEqual(f.read(), g.read())
+
+
+if __name__ == '__main__':
+    unittest.main()
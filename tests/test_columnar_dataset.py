@@ -0,0 +1,95 @@
+# tests/test_columnar_dataset.py
+
+"""
+Unit Tests for the Columnar Dataset Format
+
+This module checks that datasets written to the columnar format, directly
+or converted from CSV, load back into the same records.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import numpy as np
+from src.conflict_detection import parse_intersection_layout
+from src.batch_detection import detect_conflicts_batch
+from src.data_generation import generate_dataset, iter_dataset_chunks
+from src.columnar_dataset import write_columnar, load_columnar, convert_csv
+
+
+class TestColumnarDataset(unittest.TestCase):
+    """
+    Unit tests for the columnar dataset format.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.dataset = generate_dataset(60, num_vehicles=6, fixed_vehicle_count=False, seed=8, chunk_size=25)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def assertRecordsEqual(self, records, expected):
+        self.assertEqual(len(records), len(expected))
+        for record, expected_record in zip(records.to_dict(orient='records'), expected.to_dict(orient='records')):
+            scenario = json.loads(record.pop('scenario'))['vehicles_scenario']
+            expected_scenario = json.loads(expected_record.pop('scenario'))['vehicles_scenario']
+            self.assertEqual(record, expected_record)
+            for vehicle, expected_vehicle in zip(scenario, expected_scenario):
+                for field in ('speed', 'distance_to_intersection'):
+                    # Kinematics are stored as float32
+                    self.assertAlmostEqual(vehicle.pop(field), expected_vehicle.pop(field), places=4)
+                self.assertEqual(vehicle, expected_vehicle)
+
+    def test_round_trip(self):
+        written = write_columnar(iter_dataset_chunks(60, num_vehicles=6, fixed_vehicle_count=False, seed=8,
+                                                     chunk_size=25), self.path('dataset'))
+        self.assertEqual(written, 60)
+        dataset = load_columnar(self.path('dataset'))
+        self.assertEqual(len(dataset), 60)
+        self.assertIsInstance(dataset.speed, np.memmap)
+        self.assertEqual(dataset.speed.dtype, np.float32)
+        self.assertEqual(dataset.number_of_conflicts.tolist(), self.dataset['number_of_conflicts'].tolist())
+        self.assertRecordsEqual(dataset.to_dataframe(), self.dataset)
+        self.assertRecordsEqual(dataset.to_dataframe(10, 20), self.dataset.iloc[10:20])
+
+    def test_convert_csv(self):
+        self.dataset.to_csv(self.path('dataset.csv'), index=False)
+        self.assertEqual(convert_csv(self.path('dataset.csv'), self.path('dataset'), chunk_size=7), 60)
+        self.assertRecordsEqual(load_columnar(self.path('dataset')).to_dataframe(), self.dataset)
+
+    def test_vehicle_batch(self):
+        write_columnar(self.dataset, self.path('dataset'))
+        dataset = load_columnar(self.path('dataset'))
+        with open('data/intersection_layout.json') as f:
+            intersection_layout = parse_intersection_layout(json.load(f))
+        batch = dataset.to_vehicle_batch(intersection_layout)
+        conflicts = detect_conflicts_batch(batch.speed, batch.distance, batch.direction, batch.movement,
+                                           batch.offsets)
+        # float32 kinematics only move arrival times by micro-seconds; compare the labels
+        agreement = np.mean((conflicts.counts > 0) == dataset.is_conflict)
+        self.assertGreater(agreement, 0.95)
+
+    def test_invalid(self):
+        write_columnar(self.dataset.iloc[:0], self.path('empty'))
+        self.assertEqual(len(load_columnar(self.path('empty'))), 0)
+        write_columnar(self.dataset, self.path('dataset'))
+        with open(self.path('dataset/speed.bin'), 'ab') as f:
+            f.write(b'\0')
+        with self.assertRaises(ValueError):
+            load_columnar(self.path('dataset'))
+        records = self.dataset.copy()
+        records.at[records.index[records['number_of_conflicts'] > 0][0], 'decisions'] = ['Unknown']
+        with self.assertRaises(ValueError):
+            write_columnar(records, self.path('invalid'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,170 @@
+# tests/test_concurrent_evaluation.py
+
+"""
+Unit Tests for Concurrent Evaluation
+
+This module runs the concurrent evaluator against a local stand-in for the
+chat completions endpoint. The stand-in answers after a delay that varies
+by scenario and can be told to fail requests with 429, 5xx or 4xx
+statuses, so the tests check order preservation, concurrency, retries with
+backoff, the rate limit and error accounting. It also counts connections,
+to check that they are kept alive and reopened when the server drops them.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import json
+import threading
+import time
+import urllib.error
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.concurrent_evaluation import ChatCompletionsClient, TokenBucket, evaluate_chat_completions
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Answers 'yes' if the user message mentions a conflict and 'no' otherwise, after a
+    delay of `0.002 * (index % 5)` seconds, where the index is the number at the end of
+    the message. Statuses queued in `server.failures` are returned first, one per request.
+    Connections are kept alive unless `server.drop_connections` is set, in which case they
+    are closed after every response without telling the client.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, delayed ACKs stall kept-alive connections
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.close_connection = server.drop_connections
+        with server.lock:
+            server.requests += 1
+            server.ports.add(self.client_address[1])
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            status = server.failures.pop(0) if server.failures else 200
+            server.authorizations.add(self.headers.get('Authorization'))
+        try:
+            user_message = body['messages'][1]['content']
+            time.sleep(0.002 * (int(user_message.rsplit(' ', 1)[1]) % 5))
+            if status != 200:
+                self.send_response(status)
+                if status == 429:
+                    self.send_header('Retry-After', '0')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            answer = 'Yes ' if 'conflict' in user_message else 'No'
+            payload = json.dumps({'choices': [{'message': {'role': 'assistant', 'content': answer}}]}).encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+def conversation(index, conflict, label):
+    return {'messages': [
+        {'role': 'system', 'content': 'system'},
+        {'role': 'user', 'content': f"{'conflict' if conflict else 'clear'} scenario {index}"},
+        {'role': 'assistant', 'content': label},
+    ]}
+
+
+class TestConcurrentEvaluation(unittest.TestCase):
+    """
+    Unit tests for the concurrent evaluator.
+    """
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = self.server.in_flight = self.server.max_in_flight = 0
+        self.server.failures = []
+        self.server.authorizations = set()
+        self.server.ports = set()
+        self.server.drop_connections = False
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}/v1'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def client(self, **options):
+        return ChatCompletionsClient('model', 'key', base_url=self.base_url, backoff_base=0.001, **options)
+
+    def test_order_and_concurrency(self):
+        test_data = [conversation(index, index % 3 == 0, 'yes' if index % 3 == 0 else 'no') for index in range(60)]
+        test_data[7]['messages'][2]['content'] = 'yes'
+        with self.client() as client:
+            y_true, y_pred, stats = evaluate_chat_completions(test_data, client, concurrency=8)
+        self.assertEqual(y_pred, ['yes' if index % 3 == 0 else 'no' for index in range(60)])
+        self.assertEqual(y_true[7], 'yes')
+        self.assertEqual((stats['correct'], stats['errors'], stats['retries']), (59, 0, 0))
+        self.assertGreater(self.server.max_in_flight, 1)
+        self.assertEqual(self.server.authorizations, {'Bearer key'})
+        # One kept-alive connection per worker thread
+        self.assertLessEqual(client.connections_opened, 8)
+        self.assertEqual(len(self.server.ports), client.connections_opened)
+
+    def test_retries(self):
+        self.server.failures = [429, 500, 503, 429, 502]
+        test_data = [conversation(index, True, 'yes') for index in range(10)]
+        y_true, y_pred, stats = evaluate_chat_completions(test_data, self.client(), concurrency=4)
+        self.assertEqual(y_pred, ['yes'] * 10)
+        self.assertEqual((stats['retries'], stats['errors']), (5, 0))
+        self.assertEqual(self.server.requests, 15)
+
+    def test_errors(self):
+        # A client error is not retried; a server error past the retries is given up on
+        self.server.failures = [400]
+        y_true, y_pred, stats = evaluate_chat_completions([conversation(0, True, 'yes')], self.client(),
+                                                          concurrency=1)
+        self.assertEqual((y_pred, stats['errors'], stats['retries']), (['error'], 1, 0))
+        self.server.failures = [500] * 3
+        with self.assertRaises(urllib.error.HTTPError):
+            self.client(max_retries=2).complete(conversation(0, True, 'yes')['messages'][:2])
+        self.assertEqual(self.server.requests, 4)
+
+    def test_keep_alive(self):
+        messages = conversation(3, True, 'yes')['messages'][:2]
+        with self.client() as client:
+            for _ in range(10):
+                self.assertEqual(client.complete(messages, stop=['<|eot_id|>']), 'Yes ')
+            self.assertEqual((client.connections_opened, len(self.server.ports)), (1, 1))
+
+            # A connection the server dropped is reopened without a retry; the first of these
+            # requests still goes out on the open connection
+            self.server.drop_connections = True
+            for _ in range(5):
+                self.assertEqual(client.complete(messages), 'Yes ')
+            self.assertEqual((client.connections_opened, client.retries), (5, 0))
+        with self.assertRaises(ValueError):
+            ChatCompletionsClient('model', base_url='ftp://127.0.0.1/v1')
+
+    def test_rate_limit(self):
+        bucket = TokenBucket(rate=100, capacity=5)
+        test_data = [conversation(index, False, 'no') for index in range(25)]
+        start = time.monotonic()
+        evaluate_chat_completions(test_data, self.client(rate_limiter=bucket), concurrency=8)
+        # 5 requests pass at once, the other 20 wait for tokens at 100 per second
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -12,12 +12,14 @@ Date: YYYY-MM-DD
 
 import unittest
 import json
+import random
 import warnings
 from src.conflict_detection import (
     Vehicle,
     parse_vehicles,
     detect_conflicts,
     parse_intersection_layout,
+    ConflictRecord,
 )
 
 
@@ -1044,5 +1046,80 @@ class TestConflictDetection(unittest.TestCase):
 
         # Since V501 is not moving, no conflict should be detected
         self.assertEqual(len(conflicts), 0)
+
+    def test_sweep_matches_pairwise(self):
+        """
+        Test that sweep-line pair pruning gives the same conflicts as the full pairwise loop.
+        """
+        rng = random.Random(7)
+        for num_vehicles in (2, 5, 40, 300):
+            vehicles_scenario_data = {"vehicles_scenario": [
+                {
+                    "vehicle_id": f"V{i}",
+                    "lane": lane,
+                    "speed": rng.choice([0, rng.uniform(20, 80)]) if i % 9 == 0 else rng.uniform(20, 80),
+                    "distance_to_intersection": rng.uniform(0, 500),
+                    "direction": direction,
+                    "destination": rng.choice(self.intersection_layout[direction][lane])
+                }
+                for i in range(num_vehicles)
+                for direction in [rng.choice(['north', 'east', 'south', 'west'])]
+                for lane in [rng.choice(list(self.intersection_layout[direction]))]
+            ]}
+            vehicles = parse_vehicles(vehicles_scenario_data, self.intersection_layout)
+            self.assertEqual(detect_conflicts(vehicles, sweep=True), detect_conflicts(vehicles))
+
+    def test_sweep_matches_pairwise_non_finite(self):
+        """
+        Test that sweep-line pair pruning skips NaN and zero speeds and distances like the pairwise loop.
+        """
+        rng = random.Random(13)
+        for _ in range(100):
+            vehicles_scenario_data = {"vehicles_scenario": [
+                {
+                    "vehicle_id": f"V{i}",
+                    "lane": lane,
+                    "speed": rng.choice([float('nan'), 0, rng.uniform(20, 80)]) if rng.random() < 0.3
+                    else rng.uniform(20, 80),
+                    "distance_to_intersection": float('nan') if rng.random() < 0.05 else rng.uniform(0, 500),
+                    "direction": direction,
+                    "destination": rng.choice(self.intersection_layout[direction][lane])
+                }
+                for i in range(30)
+                for direction in [rng.choice(['north', 'east', 'south', 'west'])]
+                for lane in [rng.choice(list(self.intersection_layout[direction]))]
+            ]}
+            vehicles = parse_vehicles(vehicles_scenario_data, self.intersection_layout)
+            self.assertEqual(detect_conflicts(vehicles, sweep=True), detect_conflicts(vehicles))
+
+    def test_conflict_records_match_dictionaries(self):
+        """
+        Test that lazily rendered conflict records read the same as conflict dictionaries.
+        """
+        rng = random.Random(11)
+        for num_vehicles in (10, 60):
+            vehicles_scenario_data = {"vehicles_scenario": [
+                {
+                    "vehicle_id": f"V{i}",
+                    "lane": lane,
+                    "speed": rng.uniform(20, 80),
+                    "distance_to_intersection": rng.uniform(0, 200),
+                    "direction": direction,
+                    "destination": rng.choice(self.intersection_layout[direction][lane])
+                }
+                for i in range(num_vehicles)
+                for direction in [rng.choice(['north', 'east', 'south', 'west'])]
+                for lane in [rng.choice(list(self.intersection_layout[direction]))]
+            ]}
+            vehicles = parse_vehicles(vehicles_scenario_data, self.intersection_layout)
+            conflicts = detect_conflicts(vehicles)
+            records = detect_conflicts(vehicles, records=True, sweep=num_vehicles > 10)
+            self.assertTrue(conflicts)
+            self.assertEqual([record.to_dict() for record in records], conflicts)
+            for record, conflict in zip(records, conflicts):
+                self.assertIsInstance(record, ConflictRecord)
+                self.assertEqual(record['decision'], conflict['decision'])
+                self.assertEqual(record.waiting_times, conflict['waiting_times'])
+                self.assertEqual(vehicles[record.index1].vehicle_id, conflict['vehicle1_id'])
 if __name__ == '__main__':
     unittest.main()
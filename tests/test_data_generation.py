@@ -0,0 +1,83 @@
+# tests/test_data_generation.py
+
+"""
+Unit Tests for Dataset Generation
+
+This module checks that `generate_dataset` is exactly class-balanced and
+reproducible for a given seed and chunk size, whatever the worker count,
+in both balance modes and with both samplers.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import numpy as np
+import pandas as pd
+from src.data_generation import generate_dataset, generate_shard, chunk_quotas
+
+
+class TestDataGeneration(unittest.TestCase):
+    """
+    Unit tests for dataset generation.
+    """
+
+    def test_balanced(self):
+        for total_records, workers, chunk_size in ((101, 1, 10000), (101, 3, 15), (8, 8, 1)):
+            with self.subTest(total_records=total_records, workers=workers, chunk_size=chunk_size):
+                dataset = generate_dataset(total_records, num_vehicles=4, fixed_vehicle_count=False,
+                                           workers=workers, seed=11, chunk_size=chunk_size)
+                self.assertEqual(len(dataset), total_records)
+                counts = dataset['is_conflict'].value_counts().to_dict()
+                self.assertEqual(counts, {'yes': (total_records + 1) // 2, 'no': total_records // 2})
+
+    def test_reproducible(self):
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                first = generate_dataset(60, workers=workers, seed=3).to_csv(index=False)
+                second = generate_dataset(60, workers=workers, seed=3).to_csv(index=False)
+                self.assertEqual(first, second)
+        self.assertNotEqual(generate_dataset(60, seed=3).to_csv(index=False),
+                            generate_dataset(60, seed=4).to_csv(index=False))
+
+    def test_chunks_in_order(self):
+        dataset = generate_dataset(25, workers=2, seed=9, chunk_size=10)
+        quotas = chunk_quotas(25, 10)
+        self.assertEqual(quotas, [{'yes': 5, 'no': 5}, {'yes': 5, 'no': 5}, {'yes': 3, 'no': 2}])
+        seeds = np.random.SeedSequence(9).spawn(3)
+        chunks = [generate_shard(quota, 5, True, chunk_seed)[0] for quota, chunk_seed in zip(quotas, seeds)]
+        pd.testing.assert_frame_equal(dataset, pd.DataFrame(chunks[0] + chunks[1] + chunks[2]))
+        # The worker count does not change the dataset
+        pd.testing.assert_frame_equal(dataset, generate_dataset(25, workers=1, seed=9, chunk_size=10))
+
+    def test_stratified(self):
+        for num_vehicles in (2, 6, 14):
+            with self.subTest(num_vehicles=num_vehicles):
+                dataset = generate_dataset(51, num_vehicles=num_vehicles, workers=1, seed=5, balance='stratified')
+                self.assertEqual(dataset['is_conflict'].value_counts().to_dict(), {'yes': 26, 'no': 25})
+                self.assertTrue(((dataset['number_of_conflicts'] > 0) == (dataset['is_conflict'] == 'yes')).all())
+                stats = dataset.attrs['generation_stats']
+                self.assertEqual(stats['evaluated'], 51)
+                self.assertEqual(stats['acceptance_rate'], 1.0)
+                self.assertEqual(dataset.to_csv(index=False),
+                                 generate_dataset(51, num_vehicles=num_vehicles, seed=5,
+                                                  balance='stratified').to_csv(index=False))
+        with self.assertRaises(ValueError):
+            generate_dataset(10, balance='oversample')
+
+    def test_near_threshold_sampler(self):
+        for balance in ('reject', 'stratified'):
+            with self.subTest(balance=balance):
+                dataset = generate_dataset(41, num_vehicles=5, seed=8, balance=balance, sampler='near_threshold')
+                self.assertEqual(dataset['is_conflict'].value_counts().to_dict(), {'yes': 21, 'no': 20})
+                self.assertEqual(dataset.to_csv(index=False),
+                                 generate_dataset(41, num_vehicles=5, seed=8, balance=balance,
+                                                  sampler='near_threshold').to_csv(index=False))
+                self.assertNotEqual(dataset.to_csv(index=False),
+                                    generate_dataset(41, num_vehicles=5, seed=8, balance=balance).to_csv(index=False))
+        with self.assertRaises(ValueError):
+            generate_dataset(10, sampler='adversarial')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+# tests/test_dataset_split.py
+
+"""
+Unit Tests for the Dataset Split
+
+This module checks that renamed, reordered and slightly perturbed copies
+of scenarios are detected as duplicates, that no canonical scenario ends
+up in more than one split, and that every class is split in proportion.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import json
+import os
+import random
+import tempfile
+import numpy as np
+import pandas as pd
+from src.data_generation import generate_dataset
+from src.dataset_split import (
+    split_dataset,
+    canonical_scenario,
+    scenario_hashes,
+    BloomFilter,
+    HashSet,
+    StratifiedSplitter,
+    SPLITS,
+)
+
+
+def near_copy(scenario_json, rng):
+    """
+    Renames, shuffles and slightly perturbs the vehicles of a scenario.
+    """
+    vehicles = json.loads(scenario_json)['vehicles_scenario']
+    rng.shuffle(vehicles)
+    for vehicle in vehicles:
+        vehicle['vehicle_id'] = f"X{rng.randint(0, 10 ** 6)}"
+        # Stay within the quantization step
+        vehicle['speed'] = round(vehicle['speed']) + rng.uniform(-0.4, 0.4)
+    return json.dumps({'vehicles_scenario': vehicles})
+
+
+class TestDatasetSplit(unittest.TestCase):
+    """
+    Unit tests for the dataset split.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        rng = random.Random(0)
+        dataset = generate_dataset(300, fixed_vehicle_count=False, seed=17)
+        copies = dataset.sample(60, random_state=1).copy()
+        copies['scenario'] = [near_copy(scenario, rng) for scenario in copies['scenario']]
+        self.records = pd.concat([dataset, copies], ignore_index=True).sample(frac=1, random_state=2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_canonical_form(self):
+        scenario = self.records['scenario'].iloc[0]
+        self.assertEqual(canonical_scenario(scenario), canonical_scenario(near_copy(scenario, random.Random(5))))
+        self.assertNotEqual(canonical_scenario(scenario), canonical_scenario(self.records['scenario'].iloc[1]))
+        self.assertNotEqual(canonical_scenario(scenario), canonical_scenario(scenario, speed_step=0.1))
+
+    def test_split(self):
+        chunks = [self.records.iloc[start:start + 50] for start in range(0, len(self.records), 50)]
+        report = split_dataset(chunks, self.directory.name)
+        self.assertEqual(report['records'], 360)
+        self.assertGreaterEqual(report['duplicates'], 60)
+        self.assertAlmostEqual(report['duplicate_rate'], report['duplicates'] / 360)
+
+        hashes = {}
+        total = 0
+        for split in SPLITS:
+            part = pd.read_csv(os.path.join(self.directory.name, f'{split}_set.csv'))
+            self.assertEqual(len(part), report['splits'][split]['records'])
+            self.assertEqual(report['splits'][split]['yes'], int((part['is_conflict'] == 'yes').sum()))
+            split_hashes = set(scenario_hashes(part['scenario']).tolist())
+            self.assertEqual(len(split_hashes), len(part))
+            hashes[split] = split_hashes
+            total += len(part)
+        self.assertEqual(total, 360 - report['duplicates'])
+        self.assertFalse(hashes['train'] & hashes['val'] or hashes['train'] & hashes['test']
+                         or hashes['val'] & hashes['test'])
+        self.assertGreater(report['splits']['train']['records'], report['splits']['test']['records'])
+        for label in ('yes', 'no'):
+            counts = [report['splits'][split][label] for split in SPLITS]
+            self.assertTrue(np.allclose(counts, np.multiply(sum(counts), [0.8, 0.1, 0.1]), atol=1))
+
+        # Chunking and the set implementation do not change the result
+        other = os.path.join(self.directory.name, 'other')
+        self.assertEqual(split_dataset(self.records, other, seen=BloomFilter(1000)), report)
+        with open(os.path.join(self.directory.name, 'test_set.csv')) as f, \
+                open(os.path.join(other, 'test_set.csv')) as g:
+            self.assertEqual(f.read(), g.read())
+
+    def test_sets(self):
+        rng = np.random.default_rng(3)
+        hashes = rng.integers(0, 2 ** 63, size=5000, dtype=np.int64).astype(np.uint64)
+        for seen in (HashSet(), BloomFilter(10000)):
+            with self.subTest(seen=type(seen).__name__):
+                self.assertFalse(seen.add_many(hashes[:2500]).any())
+                self.assertTrue(seen.add_many(hashes[:100]).all())
+                self.assertLessEqual(seen.add_many(hashes[2500:]).sum(), 1)
+
+    def test_stratified_splitter(self):
+        # A rare class still reaches every split, whatever the chunking
+        labels = np.where(np.random.default_rng(4).random(1000) < 0.03, 'yes', 'no')
+        expected = StratifiedSplitter().assign(labels)
+        splitter = StratifiedSplitter()
+        self.assertEqual(np.concatenate([splitter.assign(labels[start:start + 7])
+                                         for start in range(0, 1000, 7)]).tolist(), expected.tolist())
+        for label in ('yes', 'no'):
+            counts = np.bincount(expected[labels == label], minlength=3)
+            self.assertTrue(np.allclose(counts, (labels == label).sum() * np.array([0.8, 0.1, 0.1]), atol=1))
+            self.assertTrue((counts > 0).all())
+        splits = StratifiedSplitter({'train': 0.5, 'val': 0.5, 'test': 0}).assign(['yes'] * 5 + [None] * 4)
+        self.assertEqual(np.bincount(splits, minlength=3).tolist(), [5, 4, 0])
+        with self.assertRaises(ValueError):
+            StratifiedSplitter({'train': 0, 'val': 0, 'test': 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
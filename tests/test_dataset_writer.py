@@ -0,0 +1,86 @@
+# tests/test_dataset_writer.py
+
+"""
+Unit Tests for the Dataset Writer
+
+This module checks that streamed datasets hold the same records as
+`generate_dataset` in every output format, and that an empty dataset can
+still be read back with the record columns.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import pandas as pd
+from src.data_generation import generate_dataset
+from src.dataset_writer import write_dataset, write_chunks, infer_format, NESTED_COLUMNS, RECORD_COLUMNS
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+
+class TestDatasetWriter(unittest.TestCase):
+    """
+    Unit tests for the dataset writer.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.dataset = generate_dataset(45, fixed_vehicle_count=False, seed=21, chunk_size=10)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def test_csv(self):
+        expected = self.path('expected.csv')
+        self.dataset.to_csv(expected, index=False)
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                stats = write_dataset(self.path('dataset.csv'), 45, fixed_vehicle_count=False, seed=21,
+                                      chunk_size=10, workers=workers)
+                self.assertEqual(stats, self.dataset.attrs['generation_stats'])
+                with open(expected, 'rb') as f, open(self.path('dataset.csv'), 'rb') as g:
+                    self.assertEqual(f.read(), g.read())
+
+    def test_jsonl(self):
+        write_dataset(self.path('dataset.jsonl'), 45, fixed_vehicle_count=False, seed=21, chunk_size=10)
+        with open(self.path('dataset.jsonl')) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records, self.dataset.to_dict(orient='records'))
+
+    @unittest.skipUnless(pyarrow, "pyarrow is not installed")
+    def test_parquet(self):
+        write_dataset(self.path('dataset.parquet'), 45, fixed_vehicle_count=False, seed=21, chunk_size=10)
+        loaded = pd.read_parquet(self.path('dataset.parquet'))
+        for column in NESTED_COLUMNS:
+            loaded[column] = [json.loads(value) for value in loaded[column]]
+        self.assertEqual(loaded.to_dict(orient='records'), self.dataset.to_dict(orient='records'))
+
+    def test_empty(self):
+        self.assertEqual(write_dataset(self.path('empty.csv'), 0)['accepted'], 0)
+        empty = pd.read_csv(self.path('empty.csv'))
+        self.assertEqual((len(empty), tuple(empty.columns)), (0, RECORD_COLUMNS))
+        write_dataset(self.path('empty.jsonl'), 0)
+        self.assertEqual(os.path.getsize(self.path('empty.jsonl')), 0)
+
+    def test_formats(self):
+        self.assertEqual(infer_format('out/data.CSV'), 'csv')
+        self.assertEqual(infer_format('data.jsonl'), 'jsonl')
+        with self.assertRaises(ValueError):
+            infer_format('data.xlsx')
+        self.assertEqual(write_chunks([self.dataset.iloc[:20], self.dataset.iloc[20:]], self.path('data.txt'),
+                                      file_format='csv'), 45)
+        self.assertEqual(len(pd.read_csv(self.path('data.txt'))), 45)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+# tests/test_finetune_shards.py
+
+"""
+Unit Tests for Fine-Tuning Shards
+
+This module checks that sharded builds from CSV, JSON Lines, columnar and
+DataFrame inputs hold the lines of the in-memory builders in order, with or
+without gzip and worker processes, and that the manifest describes the
+shards of the last build.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from src.columnar_dataset import load_columnar, write_columnar
+from src.data_generation import generate_dataset
+from src.dataset_writer import ChunkWriter
+from src.finetune_shards import build_jsonl_shards, load_shard_manifest, read_shards
+from src.prompt_renderer import render_gpt_conversations, render_llama_texts, render_user_prompts, llama_texts
+
+
+class TestFinetuneShards(unittest.TestCase):
+    """
+    Unit tests for fine-tuning shards.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dataset = generate_dataset(250, num_vehicles=5, fixed_vehicle_count=False, seed=13)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def write(self, name):
+        with ChunkWriter(self.path(name)) as writer:
+            writer.write(self.dataset)
+        return self.path(name)
+
+    def shard_bytes(self, directory):
+        manifest = load_shard_manifest(directory)
+        contents = []
+        for shard in manifest['shards']:
+            with open(os.path.join(directory, shard['file']), 'rb') as f:
+                data = f.read()
+            self.assertEqual(len(data), shard['bytes'])
+            data = gzip.decompress(data) if manifest['compressed'] else data
+            self.assertEqual(hashlib.sha256(data).hexdigest(), shard['sha256'])
+            contents.append(data)
+        return b''.join(contents)
+
+    def test_gpt_shards(self):
+        expected = ''.join(json.dumps(conversation) + '\n'
+                           for conversation in render_gpt_conversations(self.dataset, 'system')).encode()
+        source = self.write('dataset.csv')
+        for workers in (1, 2):
+            for compress in (False, True):
+                with self.subTest(workers=workers, compress=compress):
+                    output = self.path(f'gpt-{workers}-{compress}')
+                    report = build_jsonl_shards(source, output, 'gpt', 'system', workers=workers,
+                                                records_per_shard=60, compress=compress)
+                    self.assertEqual(report['records'], len(self.dataset))
+                    self.assertEqual([shard['records'] for shard in report['shards']], [60, 60, 60, 60, 10])
+                    self.assertEqual(self.shard_bytes(output), expected)
+
+    def test_llama_shards(self):
+        expected = [{"text": text} for text in render_llama_texts(self.dataset, 'prompt')]
+        for source in (self.dataset, self.write('dataset.jsonl')):
+            with self.subTest(source=type(source).__name__):
+                build_jsonl_shards(source, self.path('llama'), 'llama', 'prompt', records_per_shard=100, compress=True)
+                self.assertEqual(list(read_shards(self.path('llama'))), expected)
+
+    def test_columnar_shards(self):
+        write_columnar([self.dataset], self.path('columnar'))
+        dataset = load_columnar(self.path('columnar'))
+        labels = ['yes' if value else 'no' for value in dataset.is_conflict.tolist()]
+        expected = {style: [{"text": text} for text in llama_texts(render_user_prompts(dataset, 'llama', style),
+                                                                   labels, 'prompt')]
+                    for style in (None, 'eta')}
+        del dataset
+        for workers in (1, 2):
+            for style in (None, 'eta'):
+                with self.subTest(workers=workers, style=style):
+                    report = build_jsonl_shards(self.path('columnar'), self.path('llama'), 'llama', 'prompt',
+                                                workers=workers, records_per_shard=70, style=style)
+                    self.assertEqual(report['style'], style or 'llama')
+                    self.assertEqual(list(read_shards(self.path('llama'))), expected[style])
+
+    def test_rebuild(self):
+        source = self.write('dataset.csv')
+        output = self.path('shards')
+        build_jsonl_shards(source, output, 'gpt', 'system', records_per_shard=50)
+        report = build_jsonl_shards(source, output, 'gpt', 'system', records_per_shard=200)
+        self.assertEqual(sorted(name for name in os.listdir(output) if name.startswith('shard-')),
+                         [shard['file'] for shard in report['shards']])
+        self.assertEqual(load_shard_manifest(output)['records'], len(self.dataset))
+        with self.assertRaises(ValueError):
+            build_jsonl_shards(source, output, 'bert', 'system')
+        with self.assertRaises(ValueError):
+            build_jsonl_shards(source, output, 'gpt', 'system', style='xml')
+
+
+if __name__ == '__main__':
+    unittest.main()
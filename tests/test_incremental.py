@@ -0,0 +1,128 @@
+# tests/test_incremental.py
+
+"""
+Unit Tests for Incremental Conflict Detection
+
+This module checks that IncrementalConflictDetector keeps the same conflicts
+as `detect_conflicts` on the full vehicle set, and that its deltas add up.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import json
+import random
+from src.conflict_detection import parse_intersection_layout, detect_conflicts
+from src.incremental import IncrementalConflictDetector
+
+
+class TestIncrementalConflictDetector(unittest.TestCase):
+    """
+    Unit tests for the incremental conflict detector.
+    """
+
+    def setUp(self):
+        with open('data/intersection_layout.json') as f:
+            self.intersection_layout = parse_intersection_layout(json.load(f))
+
+    def random_vehicle(self, rng, vehicle_id, nan_share=0.0):
+        direction = rng.choice(['north', 'east', 'south', 'west'])
+        lane = rng.choice(list(self.intersection_layout[direction]))
+        vehicle_data = {
+            "vehicle_id": vehicle_id,
+            "lane": lane,
+            "speed": rng.choice([0, rng.uniform(20, 80)]) if rng.random() < 0.05 else rng.uniform(20, 80),
+            "distance_to_intersection": rng.uniform(0, 150),
+            "direction": direction,
+            "destination": rng.choice(self.intersection_layout[direction][lane])
+        }
+        if nan_share:
+            for field in ('speed', 'distance_to_intersection'):
+                if rng.random() < nan_share:
+                    vehicle_data[field] = float('nan')
+        return vehicle_data
+
+    def test_random_operations_match_full_detection(self):
+        """
+        Test that after every add, update and remove the conflicts match a full recomputation.
+        """
+        self.check_random_operations(random.Random(3))
+
+    def test_random_operations_with_nan(self):
+        """
+        Test random operations on vehicles with NaN speeds and distances, which are never in conflict.
+        """
+        self.check_random_operations(random.Random(5), nan_share=0.15)
+
+    def check_random_operations(self, rng, nan_share=0.0):
+        detector = IncrementalConflictDetector(self.intersection_layout)
+        tracked = {}
+        next_id = 0
+        for step in range(400):
+            operation = rng.random()
+            if len(detector) < 40 or operation < 0.2:
+                vehicle_data = self.random_vehicle(rng, f"V{next_id}", nan_share)
+                next_id += 1
+                delta = detector.add(vehicle_data)
+            elif operation < 0.8:
+                vehicle_id = rng.choice(detector.vehicles()).vehicle_id
+                vehicle_data = self.random_vehicle(rng, vehicle_id, nan_share)
+                if rng.random() < 0.7:
+                    # Position and speed update on the same lane
+                    delta = detector.update(vehicle_id, speed=vehicle_data['speed'],
+                                            distance_to_intersection=vehicle_data['distance_to_intersection'])
+                else:
+                    del vehicle_data['vehicle_id']
+                    delta = detector.update(vehicle_id, **vehicle_data)
+            else:
+                delta = detector.remove(rng.choice(detector.vehicles()).vehicle_id)
+
+            for record in delta.removed:
+                key = (record.vehicle1_id, record.vehicle2_id)
+                self.assertEqual(tracked.pop(key), record)
+            for record in delta.added:
+                key = (record.vehicle1_id, record.vehicle2_id)
+                self.assertNotIn(key, tracked)
+                tracked[key] = record.to_dict()
+
+            expected = detect_conflicts(detector.vehicles())
+            self.assertEqual(detector.conflicts(), expected)
+            self.assertEqual(tracked, {(conflict['vehicle1_id'], conflict['vehicle2_id']): conflict
+                                       for conflict in expected})
+
+    def test_unchanged_update_has_empty_delta(self):
+        """
+        Test that an update that does not change any conflict reports no delta.
+        """
+        detector = IncrementalConflictDetector(self.intersection_layout)
+        detector.add({"vehicle_id": "V1", "lane": "1", "speed": 50, "distance_to_intersection": 100,
+                      "direction": "north", "destination": "F"})
+        delta = detector.add({"vehicle_id": "V2", "lane": "3", "speed": 50, "distance_to_intersection": 100,
+                              "direction": "east", "destination": "B"})
+        self.assertEqual(len(delta.added), 1)
+        self.assertFalse(detector.update("V2", distance_to_intersection=100))
+        delta = detector.update("V2", distance_to_intersection=400)
+        self.assertEqual((len(delta.added), len(delta.removed)), (0, 1))
+
+    def test_invalid_operations(self):
+        """
+        Test that invalid operations raise and leave the detector unchanged.
+        """
+        detector = IncrementalConflictDetector(self.intersection_layout)
+        vehicle_data = {"vehicle_id": "V1", "lane": "1", "speed": 50, "distance_to_intersection": 100,
+                        "direction": "north", "destination": "F"}
+        detector.add(vehicle_data)
+        with self.assertRaises(ValueError):
+            detector.add(vehicle_data)
+        with self.assertRaises(ValueError):
+            detector.update("V1", speed=-5)
+        with self.assertRaises(ValueError):
+            detector.update("V1", movement_type="left")
+        with self.assertRaises(KeyError):
+            detector.remove("V9")
+        self.assertEqual(detector.vehicle("V1").speed, 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
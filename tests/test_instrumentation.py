@@ -0,0 +1,116 @@
+# tests/test_instrumentation.py
+
+"""
+Unit Tests for Instrumentation
+
+This module checks that tracing records stage timings and rule counters
+without changing results, and that disabling it restores the original
+functions.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import contextlib
+import io
+import json
+import random
+import src
+from src import conflict_detection, scheduling
+from src.conflict_detection import parse_intersection_layout
+from src.data_generation import generate_vehicle_scenario
+from src.instrumentation import (
+    STAGES,
+    TRACED_FUNCTIONS,
+    active_trace,
+    enable_tracing,
+    disable_tracing,
+    tracing,
+)
+from src.rule_tables import PATH_RULES
+from src.scheduling import schedule_intersection
+
+
+class TestInstrumentation(unittest.TestCase):
+    """
+    Unit tests for tracing.
+    """
+
+    def setUp(self):
+        with open('data/intersection_layout.json') as f:
+            self.intersection_layout = parse_intersection_layout(json.load(f))
+        random.seed(2)
+        self.scenarios = [generate_vehicle_scenario(6, self.intersection_layout) for _ in range(50)]
+
+    def tearDown(self):
+        disable_tracing()
+
+    def run_pipeline(self):
+        # Call through the modules: names imported into this test module are not traced
+        results = []
+        for scenario in self.scenarios:
+            vehicles = conflict_detection.parse_vehicles(scenario, self.intersection_layout)
+            results.append((conflict_detection.detect_conflicts(vehicles),
+                            scheduling.schedule_intersection(vehicles)))
+        return results
+
+    def test_trace_counts_and_results(self):
+        """
+        Test that tracing counts every stage and pair rule without changing results.
+        """
+        expected = self.run_pipeline()
+        with tracing() as trace:
+            self.assertIs(active_trace(), trace)
+            results = self.run_pipeline()
+        self.assertEqual(results, expected)
+
+        pairs = 50 * 15
+        data = json.loads(trace.to_json())
+        self.assertEqual(set(data['stages']), set(STAGES))
+        self.assertEqual(data['stages']['parse']['calls'], 50)
+        self.assertEqual(data['stages']['classify']['calls'], 300)
+        self.assertEqual(sum(data['counters']['paths_cross'].values()), pairs)
+        self.assertTrue(set(data['counters']['paths_cross']) <= set(PATH_RULES))
+        conflicts = sum(len(conflicts) for conflicts, _ in expected)
+        self.assertEqual(data['stages']['priority']['calls'], conflicts)
+        self.assertEqual(sum(data['counters']['priority'].values()), conflicts)
+        # One pairwise compute_waiting_times per conflict plus one schedule per scenario
+        self.assertEqual(data['stages']['wait']['calls'], conflicts + 50)
+        self.assertGreater(data['stages']['parse']['total_seconds'], 0)
+
+    def test_output_conflicts(self):
+        """
+        Test that output_conflicts is silent by default and records decisions while tracing.
+        """
+        conflicts = [{'decision': 'V1 yields to V2'}, {'decision': 'V3 yields to V2'}]
+        output_conflicts = conflict_detection.output_conflicts
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            output_conflicts(conflicts)
+            with tracing() as trace:
+                conflict_detection.output_conflicts(conflicts)
+        self.assertEqual(output.getvalue(), '')
+        self.assertEqual(json.loads(trace.to_json())['decisions'], ['V1 yields to V2', 'V3 yields to V2'])
+        self.assertIs(conflict_detection.output_conflicts, output_conflicts)
+
+    def test_disable_restores_originals(self):
+        """
+        Test that disabling tracing puts back the original functions everywhere.
+        """
+        originals = [getattr(owner, name) for owner, name, _ in TRACED_FUNCTIONS]
+        get_movement_type = conflict_detection.Vehicle.get_movement_type
+        trace = enable_tracing()
+        self.assertIsNot(conflict_detection.paths_cross, originals[1])
+        self.assertIsNot(src.paths_cross, originals[1])
+        with self.assertRaises(RuntimeError):
+            enable_tracing()
+        self.assertIs(disable_tracing(), trace)
+        self.assertEqual([getattr(owner, name) for owner, name, _ in TRACED_FUNCTIONS], originals)
+        self.assertIs(src.paths_cross, conflict_detection.paths_cross)
+        self.assertIs(scheduling.schedule_intersection, schedule_intersection)
+        self.assertIs(conflict_detection.Vehicle.get_movement_type, get_movement_type)
+        self.assertIsNone(active_trace())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+# tests/test_intersection_layout.py
+
+"""
+Unit Tests for the Compiled Intersection Layout
+
+This module checks that CompiledIntersectionLayout classifies movements like
+`Vehicle.get_movement_type`, also in vectorized form and for other layouts.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import json
+import pickle
+import warnings
+from src.conflict_detection import Vehicle, DIRECTION_CODES, MOVEMENT_CODES, parse_intersection_layout, parse_vehicles
+from src.intersection_layout import CompiledIntersectionLayout
+
+
+class TestCompiledIntersectionLayout(unittest.TestCase):
+    """
+    Unit tests for the compiled intersection layout.
+    """
+
+    def setUp(self):
+        with open('data/intersection_layout.json') as f:
+            self.intersection_layout = parse_intersection_layout(json.load(f))
+        self.compiled_layout = CompiledIntersectionLayout(self.intersection_layout)
+
+    def make_vehicle(self, direction, lane, destination, intersection_layout):
+        return Vehicle('V1', lane, 50, 100, direction, destination, intersection_layout)
+
+    def test_matches_dictionary_layout(self):
+        """
+        Test all direction, lane and destination combinations, including invalid ones.
+        """
+        lanes = [str(lane) for lane in range(0, 10)]
+        destinations = list('ABCDEFGHX')
+        for direction in DIRECTION_CODES:
+            for lane in lanes:
+                for destination in destinations:
+                    with warnings.catch_warnings(record=True) as expected_warnings:
+                        warnings.simplefilter('always')
+                        expected = self.make_vehicle(direction, lane, destination, self.intersection_layout)
+                    with warnings.catch_warnings(record=True) as compiled_warnings:
+                        warnings.simplefilter('always')
+                        compiled = self.make_vehicle(direction, lane, destination, self.compiled_layout)
+                    self.assertEqual(compiled.movement_type, expected.movement_type)
+                    self.assertEqual([str(w.message) for w in compiled_warnings],
+                                     [str(w.message) for w in expected_warnings])
+
+    def test_renumbered_lanes(self):
+        """
+        Test that parse_vehicles classifies a dictionary layout with other lane names like its compiled form.
+        """
+        # Through lanes '2', '4', ... and left-turn lanes '1', '3', ..., swapped from the default layout
+        swapped = {'1': '2', '2': '1', '3': '4', '4': '3', '5': '6', '6': '5', '7': '8', '8': '7'}
+        layout = {direction: {swapped[lane]: destinations for lane, destinations in lanes.items()}
+                  for direction, lanes in self.intersection_layout.items()}
+        compiled_layout = CompiledIntersectionLayout(layout)
+        scenario = {'vehicles_scenario': [
+            {'vehicle_id': f"V{len(direction)}{lane}{destination}", 'lane': lane, 'speed': 50,
+             'distance_to_intersection': 100, 'direction': direction, 'destination': destination}
+            for direction, direction_lanes in layout.items()
+            for lane, destinations in direction_lanes.items()
+            for destination in destinations
+        ]}
+        for dictionary, compiled in zip(parse_vehicles(scenario, layout), parse_vehicles(scenario, compiled_layout)):
+            self.assertEqual(dictionary.movement_type, compiled.movement_type)
+        through_lane, left_lane = layout['north']
+        movement_types = {(vehicle.lane, vehicle.destination): vehicle.movement_type
+                          for vehicle in parse_vehicles(scenario, layout) if vehicle.direction == 'north'}
+        self.assertEqual(movement_types[(through_lane, layout['north'][through_lane][0])], 'right')
+        self.assertEqual(movement_types[(left_lane, layout['north'][left_lane][0])], 'left')
+
+    def test_malformed_dictionary_layout(self):
+        """
+        Test that parse_vehicles warns about layouts that cannot be compiled instead of raising.
+        """
+        scenario = {'vehicles_scenario': [{'vehicle_id': 'V1', 'lane': '1', 'speed': 50,
+                                           'distance_to_intersection': 100, 'direction': 'north',
+                                           'destination': 'F'}]}
+        for layout in ({}, {'north': {}}, {'north': {'1': ['F', 'F']}}):
+            with self.subTest(layout=layout):
+                with warnings.catch_warnings(record=True) as caught:
+                    warnings.simplefilter('always')
+                    vehicles = parse_vehicles(scenario, layout)
+                self.assertEqual(vehicles[0].movement_type, 'right' if layout.get('north') else 'unknown')
+                if not layout.get('north'):
+                    self.assertTrue(caught)
+
+    def test_vectorized_classification(self):
+        """
+        Test that array classification agrees with the scalar lookup.
+        """
+        rows = [(direction, lane, destination)
+                for direction in DIRECTION_CODES
+                for lane in list(self.compiled_layout.lanes) + ['99']
+                for destination in list(self.compiled_layout.destinations) + ['Z']]
+        codes = self.compiled_layout.classify(
+            [DIRECTION_CODES[direction] for direction, _, _ in rows],
+            self.compiled_layout.lane_codes(lane for _, lane, _ in rows),
+            self.compiled_layout.destination_codes(destination for _, _, destination in rows)
+        )
+        for (direction, lane, destination), code in zip(rows, codes):
+            self.assertEqual(code, MOVEMENT_CODES[self.compiled_layout.movement_type(direction, lane, destination)])
+
+    def test_custom_layout(self):
+        """
+        Test a layout with three lanes per direction and explicit lane movements.
+        """
+        layout = {
+            direction: {f"{direction[0]}1": ["R"], f"{direction[0]}2": ["S1", "S2"], f"{direction[0]}3": ["L"]}
+            for direction in DIRECTION_CODES
+        }
+        lane_movements = {}
+        for direction in DIRECTION_CODES:
+            lane_movements[f"{direction[0]}1"] = 'right'
+            lane_movements[f"{direction[0]}2"] = 'straight'
+            lane_movements[f"{direction[0]}3"] = 'left'
+        compiled = CompiledIntersectionLayout(layout, lane_movements)
+        self.assertEqual(compiled.movement_type('north', 'n1', 'R'), 'right')
+        self.assertEqual(compiled.movement_type('north', 'n2', 'S2'), 'straight')
+        self.assertEqual(compiled.movement_type('west', 'w3', 'L'), 'left')
+        self.assertEqual(compiled.movement_type('west', 'n3', 'L'), 'unknown')
+        self.assertEqual(self.make_vehicle('east', 'e2', 'S1', compiled).movement_type, 'straight')
+
+    def test_invalid_layouts(self):
+        """
+        Test that malformed layouts are rejected once, at compile time.
+        """
+        with self.assertRaises(ValueError):
+            CompiledIntersectionLayout({"up": {"1": ["A"]}})
+        with self.assertRaises(ValueError):
+            CompiledIntersectionLayout({"north": {"1": []}})
+        with self.assertRaises(ValueError):
+            CompiledIntersectionLayout({"north": {"1": ["A", "A"]}})
+        with self.assertRaises(ValueError):
+            CompiledIntersectionLayout({"north": {"1": ["A"]}}, {"1": ["left", "right"]})
+
+    def test_read_only_and_picklable(self):
+        """
+        Test that the compiled layout cannot be modified and survives pickling.
+        """
+        with self.assertRaises(AttributeError):
+            self.compiled_layout.lanes = ()
+        with self.assertRaises(ValueError):
+            self.compiled_layout.movement_table[0, 0, 0] = 0
+        restored = pickle.loads(pickle.dumps(self.compiled_layout))
+        self.assertEqual(restored.as_dict(), self.intersection_layout)
+        self.assertTrue((restored.movement_table == self.compiled_layout.movement_table).all())
+
+
+if __name__ == '__main__':
+    unittest.main()
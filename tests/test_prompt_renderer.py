@@ -0,0 +1,179 @@
+# tests/test_prompt_renderer.py
+
+"""
+Unit Tests for the Prompt Renderer
+
+This module checks that batch rendering reproduces the per-row wording of
+the fine-tuning and evaluation code for every style, including JSON strings
+with reordered, missing or escaped fields. It also checks that generated and
+columnar scenarios render like their dicts, that the bulk number formatting
+matches printf-style formatting exactly, and that the compact table styles
+round and derive their columns as documented.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from src.columnar_dataset import load_columnar, write_columnar
+from src.conflict_detection import parse_intersection_layout
+from src.data_generation import generate_dataset
+from src.prompt_renderer import (
+    _format_fixed,
+    compact_system_instruction,
+    render_scenarios,
+    render_user_prompts,
+    render_gpt_conversations,
+    render_llama_texts,
+)
+from src.scenario_generator import VehicleIdNamespace, generate_scenarios
+from src.utils import parse_scenario_to_string
+
+
+def legacy_render(scenario_string, style):
+    """
+    Renders a scenario the way the per-row code did before the batch renderer.
+    """
+    descriptions = []
+    for vehicle in json.loads(scenario_string).get("vehicles_scenario", []):
+        vehicle_id = vehicle.get("vehicle_id", "Unknown")
+        lane = vehicle.get("lane", "Unknown")
+        speed = vehicle.get("speed", "Unknown")
+        distance = vehicle.get("distance_to_intersection", "Unknown")
+        direction = vehicle.get("direction", "Unknown")
+        destination = vehicle.get("destination", "Unknown")
+        if style == 'readable':
+            descriptions.append(
+                f"Vehicle {vehicle_id} is in lane {lane}, approaching from the {direction}, "
+                f"traveling at {speed:.2f} km/h, and is {distance:.2f} meters away from the intersection, "
+                f"heading towards {destination}.")
+        else:
+            descriptions.append(
+                f"Vehicle {vehicle_id} is in lane {lane}, moving {direction} at a speed of "
+                f"{speed:.2f} km/h, and is {distance:.2f} meters away from the intersection, "
+                f"heading towards {destination}.")
+    return ("\n" if style == 'readable' else " ").join(descriptions)
+
+
+class TestPromptRenderer(unittest.TestCase):
+    """
+    Unit tests for the prompt renderer.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dataset = generate_dataset(200, num_vehicles=6, fixed_vehicle_count=False, seed=5)
+        with open('data/intersection_layout.json') as f:
+            cls.intersection_layout = parse_intersection_layout(json.load(f))
+
+    def test_matches_legacy_wording(self):
+        scenarios = self.dataset['scenario'].tolist()
+        for style in ('gpt', 'llama', 'readable'):
+            with self.subTest(style=style):
+                self.assertEqual(render_scenarios(self.dataset, style),
+                                 [legacy_render(scenario, style) for scenario in scenarios])
+        self.assertEqual(parse_scenario_to_string(scenarios[0]), legacy_render(scenarios[0], 'readable'))
+
+    def test_json_fallback(self):
+        vehicle = {"vehicle_id": "Vé \"1\"", "lane": 2, "speed": 50, "distance_to_intersection": 1e2,
+                   "direction": "north", "destination": "B"}
+        reordered = dict(reversed(list(vehicle.items())))
+        scenarios = [
+            json.dumps({"vehicles_scenario": [vehicle]}),
+            json.dumps({"vehicles_scenario": [reordered, reordered]}, indent=2),
+            json.dumps({"vehicles_scenario": [{**vehicle, "vehicle_id": "V1", "lane": "2", "speed": 12.345}]}),
+            json.dumps({"vehicles_scenario": [{k: v for k, v in vehicle.items() if k != 'lane'}]}),
+            json.dumps({"vehicles_scenario": []}),
+        ]
+        for style in ('gpt', 'readable'):
+            self.assertEqual(render_scenarios(scenarios, style), [legacy_render(s, style) for s in scenarios])
+        self.assertIn("lane Unknown", render_scenarios(scenarios[3:4])[0])
+        self.assertEqual(render_scenarios([json.loads(s) for s in scenarios]), render_scenarios(scenarios))
+        with self.assertRaises(ValueError):
+            render_scenarios(scenarios, 'html')
+
+    def test_generated_scenarios(self):
+        for id_namespace in (None, VehicleIdNamespace('CAR-', 0, 10 ** 6, width=7)):
+            with self.subTest(id_namespace=id_namespace):
+                scenarios = generate_scenarios(300, self.intersection_layout, num_vehicles=5,
+                                               fixed_vehicle_count=False, rng=11, id_namespace=id_namespace)
+                expected = [legacy_render(json.dumps(scenario), 'llama') for scenario in scenarios.to_dicts()]
+                self.assertEqual(render_scenarios(scenarios, 'llama'), expected)
+
+    def test_columnar_dataset(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'dataset')
+            write_columnar([self.dataset], path)
+            dataset = load_columnar(path)
+            expected = [legacy_render(json.dumps(dataset.scenario(index)), 'gpt') for index in range(len(dataset))]
+            self.assertEqual(render_scenarios(dataset, 'gpt'), expected)
+            del dataset
+
+    def test_format_fixed(self):
+        rng = np.random.default_rng(8)
+        values = np.concatenate([
+            [2.5, 0.5, 1.5, -2.5, 0.125, 1.005, 2.675, -0.0, 0.0, -1.234, np.nan, np.inf, -np.inf, 1e20, -4.3e9,
+             2.0 ** 32 - 0.5, 123456.785],
+            rng.uniform(-1000, 1000, 2000),
+            rng.uniform(0, 200, 2000).astype(np.float32),
+            np.round(rng.uniform(0, 100, 2000), 3) + 0.0005,
+        ])
+        for decimals in (0, 1, 2):
+            with self.subTest(decimals=decimals):
+                self.assertEqual(_format_fixed(values, decimals),
+                                 ['%.*f' % (decimals, value) for value in values.tolist()])
+
+    def test_table_styles(self):
+        scenario = json.dumps({"vehicles_scenario": [
+            {"vehicle_id": "V1", "lane": "6", "speed": 36.0, "distance_to_intersection": 125.6,
+             "direction": "south", "destination": "A"},
+            {"vehicle_id": "V2", "lane": "3", "speed": 0.0, "distance_to_intersection": 20.4,
+             "direction": "east", "destination": "H"},
+        ]})
+        self.assertEqual(render_scenarios([scenario], 'compact'), ["id,lane,from,kmh,m,to\nV1,6,south,36,126,A\n"
+                                                                   "V2,3,east,0,20,H"])
+        self.assertEqual(render_scenarios([scenario], 'eta'), ["id,lane,from,to,eta_s\nV1,6,south,A,12.6\n"
+                                                               "V2,3,east,H,inf"])
+        self.assertEqual(render_user_prompts([scenario], 'llama', 'eta')[0].split('\n')[:2],
+                         ["Conflict? Yes/No", "id,lane,from,to,eta_s"])
+        self.assertEqual(render_scenarios([json.dumps({"vehicles_scenario": []})], 'compact'),
+                         ["id,lane,from,kmh,m,to"])
+
+        scenarios = generate_scenarios(100, self.intersection_layout, rng=4)
+        for style in ('compact', 'eta'):
+            with self.subTest(style=style):
+                self.assertEqual(render_scenarios(scenarios, style),
+                                 render_scenarios([json.dumps(s) for s in scenarios.to_dicts()], style))
+        instruction = compact_system_instruction(self.intersection_layout)
+        self.assertIn("north 1->F/H, 2->E/D/C", instruction)
+
+    def test_prompts(self):
+        records = pd.DataFrame({'scenario': self.dataset['scenario'][:3],
+                                'is_conflict': [' Yes', 'no ', 'NO']})
+        scenario = legacy_render(records['scenario'][0], 'gpt')
+
+        conversations = render_gpt_conversations(records, 'system')
+        self.assertEqual(conversations[0]['messages'], [
+            {"role": "system", "content": "system"},
+            {"role": "user", "content": "Analyze the following scenario and determine if there is a conflict "
+                                        f"(Respond only with 'yes' or 'no'): {scenario}"},
+            {"role": "assistant", "content": "yes"},
+        ])
+        self.assertEqual([c['messages'][2]['content'] for c in conversations], ['yes', 'no', 'no'])
+
+        user_input = ("Analyze the following scenario and determine if there is a conflict "
+                      f"(Respond only with 'Yes' or 'No'):\n{scenario}")
+        self.assertEqual(render_user_prompts(records, 'llama')[0], user_input)
+        self.assertEqual(render_llama_texts(records, 'system')[0],
+                         "<|begin_of_text|><|start_header_id|>system<|end_header_id|>\n\nsystem<|eot_id|>"
+                         f"<|start_header_id|>user<|end_header_id|>\n\n{user_input}<|eot_id|>"
+                         "<|start_header_id|>assistant<|end_header_id|>\n\nYes<|eot_id|>")
+
+
+if __name__ == '__main__':
+    unittest.main()
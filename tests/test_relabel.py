@@ -0,0 +1,131 @@
+# tests/test_relabel.py
+
+"""
+Unit Tests for Relabeling
+
+This module checks that relabeling a generated dataset with unchanged rules
+reproduces it byte for byte, that corrupted labels are restored and counted,
+and that relabeling with another layout matches running the rule engine on
+every scenario.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import json
+import os
+import tempfile
+import warnings
+import pandas as pd
+from src.columnar_dataset import load_columnar, write_columnar
+from src.conflict_detection import parse_intersection_layout, parse_vehicles, detect_conflicts
+from src.data_generation import generate_dataset, build_record
+from src.dataset_writer import ChunkWriter
+from src.relabel import relabel_dataset, relabel_records, read_chunks
+
+
+class TestRelabel(unittest.TestCase):
+    """
+    Unit tests for relabeling.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dataset = generate_dataset(300, num_vehicles=6, fixed_vehicle_count=False, seed=21)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.directory.name, name)
+
+    def write(self, records, name):
+        with ChunkWriter(self.path(name)) as writer:
+            writer.write(records)
+        return self.path(name)
+
+    def read_bytes(self, path):
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def test_unchanged_round_trip(self):
+        for file_format in ('csv', 'jsonl'):
+            for workers in (1, 2):
+                with self.subTest(file_format=file_format, workers=workers):
+                    input_path = self.write(self.dataset, f'input.{file_format}')
+                    output_path = self.path(f'output.{file_format}')
+                    report = relabel_dataset(input_path, output_path, workers=workers, chunk_size=70)
+                    self.assertEqual(self.read_bytes(output_path), self.read_bytes(input_path))
+                    self.assertEqual(report['records'], 300)
+                    self.assertEqual(report['changed_records'], 0)
+                    self.assertEqual(set(report['changed'].values()), {0})
+                    self.assertEqual(report['class_counts'], {'yes': 150, 'no': 150})
+
+    def test_corrupted_labels(self):
+        corrupted = self.dataset.copy()
+        conflicting = corrupted.index[corrupted['is_conflict'] == 'yes'][:4]
+        corrupted.loc[conflicting, 'is_conflict'] = 'no'
+        corrupted.loc[[0, 1, 2], 'waiting_times'] = [{}, {}, {}]
+        input_path = self.write(corrupted, 'corrupted.csv')
+        output_path = self.path('output.csv')
+        report = relabel_dataset(input_path, output_path, chunk_size=50)
+        self.assertEqual(report['changed']['is_conflict'], 4)
+        self.assertEqual(report['flips'], {'no_to_yes': 4, 'yes_to_no': 0})
+        self.assertEqual(report['changed']['waiting_times'], 3)
+        self.assertEqual(report['changed']['priority_order'], 0)
+        self.assertEqual(report['changed_records'], len(set(conflicting) | {0, 1, 2}))
+        self.assertEqual(self.read_bytes(output_path), self.read_bytes(self.write(self.dataset, 'original.csv')))
+
+    def test_invalid_scenarios(self):
+        records = self.dataset.head(10).copy()
+        records.loc[3, 'scenario'] = 'not a scenario'
+        with open('data/intersection_layout.json') as f:
+            intersection_layout = parse_intersection_layout(json.load(f))
+        relabeled, stats = relabel_records(records, intersection_layout)
+        self.assertEqual(stats['invalid'], 1)
+        self.assertEqual(len(relabeled), 9)
+        self.assertEqual(relabeled['scenario'].tolist(), records['scenario'].drop(3).tolist())
+
+    def test_columnar_output(self):
+        input_path = self.write(self.dataset, 'input.jsonl')
+        relabel_dataset(input_path, self.path('relabeled'), output_format='columnar', chunk_size=64)
+        write_columnar(self.dataset, self.path('original'))
+        pd.testing.assert_frame_equal(load_columnar(self.path('relabeled')).to_dataframe(),
+                                      load_columnar(self.path('original')).to_dataframe())
+
+    def test_layout_change(self):
+        with open('data/intersection_layout.json') as f:
+            layout_data = json.load(f)
+        # Move a destination to the other northbound lane
+        layout = layout_data['intersection_layout']
+        layout['north']['1'] = layout['north']['1'] + ['E']
+        layout['north']['2'] = [destination for destination in layout['north']['2'] if destination != 'E']
+
+        input_path = self.write(self.dataset, 'input.csv')
+        output_path = self.path('output.csv')
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            report = relabel_dataset(input_path, output_path, intersection_layout=layout_data, chunk_size=100)
+            expected = []
+            for scenario in self.dataset['scenario']:
+                vehicles = parse_vehicles(json.loads(scenario), layout)
+                expected.append(build_record(json.loads(scenario), vehicles, detect_conflicts(vehicles)))
+        self.assertGreater(report['changed_records'], 0)
+        relabeled = pd.concat(read_chunks(output_path, chunk_size=1000, file_format='csv'), ignore_index=True)
+        expected_path = self.write(pd.DataFrame(expected), 'expected.csv')
+        self.assertEqual(self.read_bytes(output_path), self.read_bytes(expected_path))
+        self.assertEqual(len(relabeled), 300)
+
+    def test_unknown_format(self):
+        with self.assertRaises(ValueError):
+            relabel_dataset(self.write(self.dataset, 'input.csv'), self.path('output'), output_format='xml')
+        with self.assertRaises(ValueError):
+            next(read_chunks(self.path('input.parquet')))
+
+
+if __name__ == '__main__':
+    unittest.main()
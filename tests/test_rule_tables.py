@@ -0,0 +1,81 @@
+# tests/test_rule_tables.py
+
+"""
+Unit Tests for the Precompiled Rule Tables
+
+This module checks that the lookup tables in `src/rule_tables.py` agree with
+the reference rule functions on every combination of direction and movement.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+from src import rule_tables
+from src.conflict_detection import paths_cross, path_rule, apply_priority_rules, is_vehicle_on_right
+from src.reference_rules import (
+    DIRECTION_ORDER,
+    MOVEMENT_ORDER,
+    RuleProbe,
+    build_rule_tables,
+    paths_cross_reference,
+    paths_cross_rule_reference,
+    apply_priority_rules_reference,
+    is_vehicle_on_right_reference,
+)
+
+
+class TestRuleTables(unittest.TestCase):
+    """
+    Unit tests for the precompiled rule tables.
+    """
+
+    def setUp(self):
+        self.combinations = [(direction, movement)
+                             for direction in DIRECTION_ORDER
+                             for movement in MOVEMENT_ORDER + ['unknown']]
+
+    def test_tables_are_up_to_date(self):
+        """
+        Test that the checked-in tables match a fresh build from the reference rules.
+        """
+        tables = build_rule_tables()
+        self.assertEqual(rule_tables.CONFLICT_TABLE, tables['CONFLICT_TABLE'])
+        self.assertEqual(rule_tables.PATH_RULE_TABLE, tables['PATH_RULE_TABLE'])
+        self.assertEqual(rule_tables.PRIORITY_TABLE, tables['PRIORITY_TABLE'])
+        self.assertEqual(rule_tables.RIGHT_OF_TABLE, tables['RIGHT_OF_TABLE'])
+        self.assertEqual(len(rule_tables.CONFLICT_TABLE) * len(rule_tables.CONFLICT_TABLE[0]), 144)
+
+    def test_paths_cross_matches_reference(self):
+        """
+        Test paths_cross against the reference on all direction and movement pairs.
+        """
+        for direction1, movement1 in self.combinations:
+            for direction2, movement2 in self.combinations:
+                vehicle1 = RuleProbe('V1', direction1, movement1)
+                vehicle2 = RuleProbe('V2', direction2, movement2)
+                with self.subTest(vehicle1=(direction1, movement1), vehicle2=(direction2, movement2)):
+                    self.assertEqual(paths_cross(vehicle1, vehicle2),
+                                     paths_cross_reference(vehicle1, vehicle2))
+                    self.assertEqual(path_rule(vehicle1, vehicle2),
+                                     paths_cross_rule_reference(vehicle1, vehicle2)[1])
+                    self.assertEqual(is_vehicle_on_right(vehicle1, vehicle2),
+                                     is_vehicle_on_right_reference(vehicle1, vehicle2))
+
+    def test_priority_rules_match_reference(self):
+        """
+        Test apply_priority_rules against the reference for close and distant arrivals.
+        """
+        for direction1, movement1 in self.combinations:
+            for direction2, movement2 in self.combinations:
+                for time2 in (10.0, 10.5, 11.0, 12.0, 8.0):
+                    vehicle1 = RuleProbe('V1', direction1, movement1, 10.0)
+                    vehicle2 = RuleProbe('V2', direction2, movement2, time2)
+                    with self.subTest(vehicle1=(direction1, movement1),
+                                      vehicle2=(direction2, movement2), time2=time2):
+                        self.assertEqual(apply_priority_rules(vehicle1, vehicle2),
+                                         apply_priority_rules_reference(vehicle1, vehicle2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+# tests/test_scenario_generator.py
+
+"""
+Unit Tests for the Scenario Generator
+
+This module checks that `generate_scenarios` produces scenarios that
+`parse_vehicles` accepts, with unique vehicle IDs, sizes in range and the
+same vehicles in its dict and VehicleBatch exports, and that
+`generate_near_threshold_scenarios` puts far more crossing vehicles near the
+decision thresholds than uniform sampling. Vehicle ID namespaces must give
+unique IDs for scenarios far beyond the 9000 default IDs.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import json
+import numpy as np
+from src.conflict_detection import parse_intersection_layout, parse_vehicles, detect_conflicts, MOVEMENT_CODES
+from src.batch_detection import compute_times_to_intersection
+from src.scenario_generator import (
+    generate_scenarios,
+    generate_conflict_free_scenarios,
+    generate_near_threshold_scenarios,
+    iter_scenarios,
+    DEFAULT_THRESHOLD_BANDS,
+    VehicleIdNamespace,
+    _PATHS_CROSS,
+)
+from src.data_generation import generate_vehicle_scenario
+
+
+def near_threshold_shares(scenarios, num_vehicles):
+    """
+    Returns the share of crossing pairs whose arrival time difference is in each threshold's band.
+    """
+    times = compute_times_to_intersection(scenarios.speed, scenarios.distance).reshape(-1, num_vehicles)
+    direction = scenarios.direction.reshape(-1, num_vehicles)
+    movement = scenarios.movement.reshape(-1, num_vehicles)
+    first, second = np.triu_indices(num_vehicles, 1)
+    crossing = _PATHS_CROSS[direction[:, first], movement[:, first], direction[:, second], movement[:, second]]
+    difference = np.abs(times[:, first] - times[:, second])[crossing]
+    return {threshold: np.mean(np.abs(difference - threshold) <= width)
+            for threshold, width in DEFAULT_THRESHOLD_BANDS.items()}
+
+
+class TestScenarioGenerator(unittest.TestCase):
+    """
+    Unit tests for the scenario generator.
+    """
+
+    def setUp(self):
+        with open('data/intersection_layout.json') as f:
+            self.intersection_layout = parse_intersection_layout(json.load(f))
+
+    def test_scenarios_are_valid(self):
+        for fixed_vehicle_count in (True, False):
+            with self.subTest(fixed_vehicle_count=fixed_vehicle_count):
+                scenarios = generate_scenarios(500, self.intersection_layout, num_vehicles=8,
+                                               fixed_vehicle_count=fixed_vehicle_count, rng=1)
+                self.assertEqual(len(scenarios), 500)
+                sizes = np.diff(scenarios.offsets)
+                if fixed_vehicle_count:
+                    self.assertTrue((sizes == 8).all())
+                else:
+                    self.assertTrue(((sizes >= 2) & (sizes <= 8)).all())
+                    self.assertEqual(set(sizes.tolist()), set(range(2, 9)))
+                for scenario in scenarios.to_dicts():
+                    vehicles = parse_vehicles(scenario, self.intersection_layout)
+                    ids = [vehicle.vehicle_id for vehicle in vehicles]
+                    self.assertEqual(len(set(ids)), len(ids))
+                    for vehicle in vehicles:
+                        self.assertRegex(vehicle.vehicle_id, r'^V[1-9]\d{3}$')
+                        self.assertTrue(20 <= vehicle.speed < 80)
+                        self.assertTrue(50 <= vehicle.distance_to_intersection < 500)
+                        self.assertNotEqual(vehicle.movement_type, 'unknown')
+
+    def test_exports_agree(self):
+        scenarios = generate_scenarios(200, self.intersection_layout, num_vehicles=6,
+                                       fixed_vehicle_count=False, rng=2)
+        dicts = scenarios.to_dicts()
+        self.assertEqual(scenarios.to_dicts(50, 60), dicts[50:60])
+        batch = scenarios.to_vehicle_batch()
+        movement_names = {code: name for name, code in MOVEMENT_CODES.items()}
+        row = 0
+        for scenario in dicts:
+            for vehicle in parse_vehicles(scenario, self.intersection_layout):
+                self.assertEqual(batch.vehicle_ids[batch.vehicle_id[row]], vehicle.vehicle_id)
+                self.assertEqual(movement_names[batch.movement[row]], vehicle.movement_type)
+                self.assertEqual(batch.speed[row], vehicle.speed)
+                row += 1
+        self.assertEqual(row, scenarios.num_vehicles)
+
+    def test_reproducible(self):
+        first = generate_scenarios(50, self.intersection_layout, rng=np.random.default_rng(7)).to_dicts()
+        second = generate_scenarios(50, self.intersection_layout, rng=np.random.default_rng(7)).to_dicts()
+        self.assertEqual(first, second)
+        stream = iter_scenarios(self.intersection_layout, rng=7, chunk_size=20)
+        self.assertEqual([next(stream) for _ in range(50)][:20],
+                         generate_scenarios(20, self.intersection_layout, rng=7).to_dicts())
+
+    def test_large_scenarios(self):
+        scenarios = generate_scenarios(3, self.intersection_layout, num_vehicles=300, rng=3)
+        for begin, end in zip(scenarios.offsets, scenarios.offsets[1:]):
+            numbers = scenarios.vehicle_number[begin:end]
+            self.assertEqual(len(np.unique(numbers)), 300)
+        with self.assertRaises(ValueError):
+            generate_scenarios(1, self.intersection_layout, num_vehicles=9001)
+
+    def test_conflict_free(self):
+        for num_vehicles in (3, 10, 25):
+            with self.subTest(num_vehicles=num_vehicles):
+                scenarios = generate_conflict_free_scenarios(100, self.intersection_layout, num_vehicles,
+                                                             fixed_vehicle_count=False, rng=4)
+                self.assertGreater(len(scenarios), 90)
+                self.assertTrue((np.diff(scenarios.offsets) >= 2).all())
+                for scenario in scenarios.to_dicts():
+                    vehicles = parse_vehicles(scenario, self.intersection_layout)
+                    self.assertEqual(len({vehicle.vehicle_id for vehicle in vehicles}), len(vehicles))
+                    self.assertEqual(detect_conflicts(vehicles), [])
+
+    def test_select(self):
+        scenarios = generate_scenarios(30, self.intersection_layout, num_vehicles=5,
+                                       fixed_vehicle_count=False, rng=5)
+        dicts = scenarios.to_dicts()
+        self.assertEqual(scenarios.select([7, 2, 29]).to_dicts(), [dicts[7], dicts[2], dicts[29]])
+        self.assertEqual(len(scenarios.select([])), 0)
+
+    def test_near_threshold(self):
+        uniform = near_threshold_shares(generate_scenarios(2000, self.intersection_layout, rng=6), 5)
+        scenarios = generate_near_threshold_scenarios(2000, self.intersection_layout, rng=6)
+        near_threshold = near_threshold_shares(scenarios, 5)
+        for threshold in DEFAULT_THRESHOLD_BANDS:
+            self.assertGreater(near_threshold[threshold], 3 * uniform[threshold])
+        for scenario in scenarios.to_dicts():
+            vehicles = parse_vehicles(scenario, self.intersection_layout)
+            self.assertEqual(len({vehicle.vehicle_id for vehicle in vehicles}), len(vehicles))
+            for vehicle in vehicles:
+                self.assertTrue(20 <= vehicle.speed <= 80)
+                self.assertTrue(50 <= vehicle.distance_to_intersection <= 500)
+        self.assertEqual(scenarios.to_dicts(),
+                         generate_near_threshold_scenarios(2000, self.intersection_layout, rng=6).to_dicts())
+        # Variable scenario sizes and custom bands
+        varied = generate_near_threshold_scenarios(300, self.intersection_layout, num_vehicles=8,
+                                                   fixed_vehicle_count=False, rng=7, bands={2.0: 0.1})
+        self.assertTrue(((np.diff(varied.offsets) >= 2) & (np.diff(varied.offsets) <= 8)).all())
+
+    def test_near_threshold_band_edges(self):
+        """
+        Test that pairs whose partner is near the end of TIME_RANGE still land in the band.
+        """
+        # With two vehicles, the second is paired with the first; a 45-55 s band is out of
+        # reach on one side of most partners and on both sides of those at 45-47.25 s
+        scenarios = generate_near_threshold_scenarios(3000, self.intersection_layout, num_vehicles=2, rng=8,
+                                                      bands={50.0: 5.0})
+        original = generate_scenarios(3000, self.intersection_layout, num_vehicles=2, rng=8)
+        times = compute_times_to_intersection(scenarios.speed, scenarios.distance).reshape(-1, 2)
+        original_times = compute_times_to_intersection(original.speed, original.distance).reshape(-1, 2)
+        direction = scenarios.direction.reshape(-1, 2)
+        movement = scenarios.movement.reshape(-1, 2)
+        crossing = _PATHS_CROSS[direction[:, 0], movement[:, 0], direction[:, 1], movement[:, 1]]
+        partner = times[:, 0]
+        reachable = (partner + 45 <= 90 - 1e-9) | (partner - 45 >= 50 / (80 / 3.6) + 1e-9)
+        difference = np.abs(times[:, 1] - partner)
+        moved = crossing & reachable
+        self.assertGreater(moved.sum(), 100)
+        self.assertTrue(((difference[moved] >= 45 - 1e-6) & (difference[moved] <= 55 + 1e-6)).all())
+        # Vehicles that cannot reach the band keep their times
+        np.testing.assert_allclose(times[crossing & ~reachable], original_times[crossing & ~reachable])
+
+    def test_id_namespace(self):
+        namespace = VehicleIdNamespace('VH', first=1, size=10 ** 6, width=7)
+        scenarios = generate_scenarios(2, self.intersection_layout, num_vehicles=120000, rng=8,
+                                       id_namespace=namespace)
+        for begin, end in zip(scenarios.offsets, scenarios.offsets[1:]):
+            numbers = scenarios.vehicle_number[begin:end]
+            self.assertEqual(len(np.unique(numbers)), 120000)
+            self.assertTrue(((numbers >= 1) & (numbers <= 10 ** 6)).all())
+        self.assertNotEqual(scenarios.vehicle_number[:10].tolist(), scenarios.vehicle_number[120000:120010].tolist())
+        self.assertRegex(scenarios.to_dicts(0, 1)[0]['vehicles_scenario'][0]['vehicle_id'], r'^VH\d{7}$')
+        np.testing.assert_array_equal(
+            scenarios.vehicle_number,
+            generate_scenarios(2, self.intersection_layout, num_vehicles=120000, rng=8,
+                               id_namespace=namespace).vehicle_number)
+        with self.assertRaises(ValueError):
+            generate_scenarios(1, self.intersection_layout, num_vehicles=11, id_namespace=VehicleIdNamespace(size=10))
+
+    def test_id_namespace_exhaustive(self):
+        # Scenarios as large as the namespace take every ID once, whatever its size
+        for size in (1, 2, 3, 5, 64, 1000, 1025):
+            with self.subTest(size=size):
+                namespace = VehicleIdNamespace('N', first=100, size=size)
+                numbers = namespace.allocate(np.random.default_rng(size), np.array([size, size, size // 2]))
+                self.assertEqual(sorted(numbers[:size]), list(range(100, 100 + size)))
+                self.assertEqual(sorted(numbers[size:2 * size]), list(range(100, 100 + size)))
+                self.assertEqual(len(np.unique(numbers[2 * size:])), size // 2)
+
+    def test_id_namespace_exports(self):
+        namespace = VehicleIdNamespace('car-', size=2 ** 40)
+        scenarios = generate_conflict_free_scenarios(50, self.intersection_layout, num_vehicles=6,
+                                                     fixed_vehicle_count=False, rng=9, id_namespace=namespace)
+        batch = scenarios.to_vehicle_batch()
+        row = 0
+        for scenario in scenarios.to_dicts():
+            for vehicle in parse_vehicles(scenario, self.intersection_layout):
+                self.assertTrue(vehicle.vehicle_id.startswith('car-'))
+                self.assertEqual(batch.vehicle_ids[batch.vehicle_id[row]], vehicle.vehicle_id)
+                row += 1
+        dicts = scenarios.to_dicts()
+        self.assertEqual(scenarios.select([3, 1]).to_dicts(), [dicts[3], dicts[1]])
+        scenario = generate_vehicle_scenario(12000, self.intersection_layout, id_namespace=namespace)
+        self.assertEqual(len({vehicle['vehicle_id'] for vehicle in scenario['vehicles_scenario']}), 12000)
+        with self.assertRaises(ValueError):
+            generate_vehicle_scenario(9001, self.intersection_layout)
+
+    def test_missing_direction(self):
+        layout = {direction: lanes for direction, lanes in self.intersection_layout.items() if direction != 'west'}
+        with self.assertRaises(ValueError):
+            generate_scenarios(1, layout)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,156 @@
+# tests/test_scheduling.py
+
+"""
+Unit Tests for Intersection Scheduling
+
+This module checks `schedule_intersection` and the grouped
+`compute_waiting_times` against the chained and pairwise formulations they
+replace.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import json
+import math
+import random
+from src.conflict_detection import (
+    Vehicle,
+    parse_intersection_layout,
+    parse_vehicles,
+    paths_cross,
+    compute_waiting_times,
+)
+from src.scheduling import schedule_intersection
+
+
+def chained_schedule_reference(vehicles, traversal_time=2):
+    """
+    Single-file schedule formerly computed inline by `generate_dataset`.
+    """
+    priority_order = {}
+    waiting_times = {}
+    sorted_vehicles = sorted(vehicles, key=lambda v: v.time_to_intersection)
+    for idx, vehicle in enumerate(sorted_vehicles):
+        priority_order[vehicle.vehicle_id] = idx + 1
+    arrival_times = {v.vehicle_id: v.time_to_intersection for v in vehicles}
+    for idx, vehicle in enumerate(sorted_vehicles):
+        if idx == 0:
+            waiting_times[vehicle.vehicle_id] = 0
+        else:
+            required_arrival_time = arrival_times[sorted_vehicles[idx - 1].vehicle_id] + traversal_time
+            wait_time = max(0, required_arrival_time - arrival_times[vehicle.vehicle_id])
+            waiting_times[vehicle.vehicle_id] = math.ceil(wait_time)
+            arrival_times[vehicle.vehicle_id] += wait_time
+    return priority_order, waiting_times
+
+
+def pairwise_waiting_times_reference(vehicles, priorities):
+    """
+    Former quadratic `compute_waiting_times`.
+    """
+    waiting_times = {}
+    for vehicle_id, priority in priorities.items():
+        vehicle = next((v for v in vehicles if v.vehicle_id == vehicle_id), None)
+        if vehicle is None:
+            continue
+        if priority == 1:
+            waiting_times[vehicle_id] = 0
+        else:
+            max_wait = 0
+            for hp_vehicle_id in [v_id for v_id, p in priorities.items() if p < priority]:
+                hp_vehicle = next((v for v in vehicles if v.vehicle_id == hp_vehicle_id), None)
+                if hp_vehicle:
+                    wait_time = max(0, (hp_vehicle.time_to_intersection + 2) - vehicle.time_to_intersection)
+                    max_wait = max(max_wait, wait_time)
+            waiting_times[vehicle_id] = math.ceil(max_wait)
+    return waiting_times
+
+
+class TestScheduling(unittest.TestCase):
+    """
+    Unit tests for intersection scheduling.
+    """
+
+    def setUp(self):
+        with open('data/intersection_layout.json') as f:
+            self.intersection_layout = parse_intersection_layout(json.load(f))
+
+    def random_vehicles(self, rng, num_vehicles):
+        vehicles_scenario_data = {"vehicles_scenario": []}
+        for i in range(num_vehicles):
+            direction = rng.choice(['north', 'east', 'south', 'west'])
+            lane = rng.choice(list(self.intersection_layout[direction]))
+            vehicles_scenario_data["vehicles_scenario"].append({
+                "vehicle_id": f"V{i}",
+                "lane": lane,
+                "speed": rng.uniform(20, 80),
+                "distance_to_intersection": rng.uniform(10, 150),
+                "direction": direction,
+                "destination": rng.choice(self.intersection_layout[direction][lane])
+            })
+        return parse_vehicles(vehicles_scenario_data, self.intersection_layout)
+
+    def make_vehicle(self, vehicle_id, lane, direction, destination, distance=100):
+        return Vehicle(vehicle_id, lane, 50, distance, direction, destination, self.intersection_layout)
+
+    def test_single_file_mode_matches_chained_waits(self):
+        """
+        Test that conflict_aware=False reproduces the previous chained schedule exactly.
+        """
+        rng = random.Random(5)
+        for num_vehicles in (1, 2, 5, 30):
+            vehicles = self.random_vehicles(rng, num_vehicles)
+            self.assertEqual(schedule_intersection(vehicles, conflict_aware=False),
+                             chained_schedule_reference(vehicles))
+
+    def test_non_conflicting_vehicles_proceed_together(self):
+        """
+        Test that vehicles going straight from opposite directions do not wait for each other.
+        """
+        vehicles = [
+            self.make_vehicle('V1', '1', 'north', 'H'),
+            self.make_vehicle('V2', '5', 'south', 'D'),
+            self.make_vehicle('V3', '3', 'east', 'B', distance=101),
+        ]
+        priority_order, waiting_times = schedule_intersection(vehicles)
+        self.assertEqual(waiting_times, {'V1': 0, 'V2': 0, 'V3': 2})
+        self.assertEqual(priority_order, {'V1': 1, 'V2': 2, 'V3': 3})
+
+    def test_conflict_aware_schedule_is_valid(self):
+        """
+        Test that crossing vehicles never occupy the intersection at the same time
+        and that every wait is caused by an earlier crossing vehicle.
+        """
+        rng = random.Random(9)
+        for num_vehicles in (2, 8, 40):
+            vehicles = self.random_vehicles(rng, num_vehicles)
+            priority_order, waiting_times = schedule_intersection(vehicles)
+            self.assertEqual(sorted(priority_order.values()), list(range(1, num_vehicles + 1)))
+            releases = {}
+            for vehicle in sorted(vehicles, key=lambda v: v.time_to_intersection):
+                release = vehicle.time_to_intersection
+                for other_id, other_release in releases.items():
+                    other = next(v for v in vehicles if v.vehicle_id == other_id)
+                    if paths_cross(vehicle, other):
+                        release = max(release, other_release + 2)
+                releases[vehicle.vehicle_id] = release
+                self.assertEqual(waiting_times[vehicle.vehicle_id],
+                                 math.ceil(release - vehicle.time_to_intersection - 1e-9))
+
+    def test_compute_waiting_times_matches_pairwise(self):
+        """
+        Test that the grouped compute_waiting_times matches the pairwise formulation.
+        """
+        rng = random.Random(13)
+        for num_vehicles in (2, 6, 25):
+            vehicles = self.random_vehicles(rng, num_vehicles)
+            priorities = {vehicle.vehicle_id: rng.randint(1, 4) for vehicle in vehicles}
+            priorities['missing'] = 2
+            self.assertEqual(compute_waiting_times(vehicles, priorities),
+                             pairwise_waiting_times_reference(vehicles, priorities))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+# tests/test_together_utils.py
+
+"""
+Unit Tests for the Together AI Utilities
+
+This module runs `LlamaClient`, `llama_client` and `llama32` against a
+local stand-in for the Together AI chat completions endpoint. The stand-in
+records the path, headers and body of every request and the client port
+it came from, so the tests check the endpoint path, the token budget and
+stop tokens that are sent, that calls share one kept-alive connection, and
+that the configuration and the .env file are read only once.
+
+Author: Your Name
+Date: YYYY-MM-DD
+"""
+
+import unittest
+import importlib.util
+import json
+import os
+import sys
+import threading
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+# The package __init__ also imports the Together SDK and the plotting libraries; load this module on its own
+_SPEC = importlib.util.spec_from_file_location(
+    'together_utils', os.path.join(os.path.dirname(__file__), '..', 'llama_finetuning', 'together_utils.py'))
+together_utils = importlib.util.module_from_spec(_SPEC)
+_SPEC.loader.exec_module(together_utils)
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """
+    Answers ' Yes' to every request and records what it was sent in `server.received`.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, delayed ACKs stall kept-alive connections
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with self.server.lock:
+            self.server.received.append((self.path, self.headers.get('Authorization'), body))
+            self.server.ports.add(self.client_address[1])
+        payload = json.dumps({'choices': [{'message': {'role': 'assistant', 'content': ' Yes'}}]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+MESSAGES = [{'role': 'system', 'content': 'system'}, {'role': 'user', 'content': 'scenario'}]
+
+
+class TestTogetherUtils(unittest.TestCase):
+    """
+    Unit tests for the Together AI utilities.
+    """
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        self.server.lock = threading.Lock()
+        self.server.received = []
+        self.server.ports = set()
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+        environment = mock.patch.dict(os.environ, {'DLAI_TOGETHER_API_BASE': self.base_url + '/',
+                                                   'TOGETHER_API_KEY': 'key'})
+        environment.start()
+        self.addCleanup(environment.stop)
+        together_utils.load_env.cache_clear()
+        together_utils.llama_client.cache_clear()
+
+    def tearDown(self):
+        # The tests only share the 11B client
+        if together_utils.llama_client.cache_info().currsize:
+            together_utils.llama_client(11).close()
+        together_utils.load_env.cache_clear()
+        together_utils.llama_client.cache_clear()
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def test_requests(self):
+        with together_utils.LlamaClient(11) as client:
+            self.assertEqual(client.classify(MESSAGES), 'Yes')
+            self.assertEqual(client.chat(MESSAGES), ' Yes')
+        (path, authorization, classify_body), (_, _, chat_body) = self.server.received
+        self.assertEqual(path, '/v1/chat/completions')
+        self.assertEqual(authorization, 'Bearer key')
+        self.assertEqual(classify_body['model'], 'meta-llama/Llama-3.2-11B-Vision-Instruct-Turbo')
+        self.assertEqual(classify_body['messages'], MESSAGES)
+        self.assertEqual(classify_body['max_tokens'], 3)
+        self.assertEqual(chat_body['max_tokens'], 4096)
+        for body in (classify_body, chat_body):
+            self.assertEqual(body['stop'], ["<|eot_id|>", "<|eom_id|>"])
+
+    def test_shared_connection(self):
+        for _ in range(5):
+            self.assertEqual(together_utils.llama32(MESSAGES), ' Yes')
+        client = together_utils.llama_client(11)
+        self.assertEqual(client.classify(MESSAGES), 'Yes')
+        self.assertIs(together_utils.llama_client(11), client)
+        self.assertEqual(len(self.server.received), 6)
+        self.assertEqual(client.connections_opened, 1)
+        self.assertEqual(len(self.server.ports), 1)
+
+    def test_configuration_read_once(self):
+        dotenv = types.ModuleType('dotenv')
+        dotenv.find_dotenv = mock.Mock(return_value='.env')
+        dotenv.load_dotenv = mock.Mock(return_value=True)
+        with mock.patch.dict(sys.modules, {'dotenv': dotenv}):
+            client = together_utils.llama_client(11)
+            together_utils.LlamaClient(3).close()
+            # Later changes of the environment do not reach a client that already exists
+            with mock.patch.dict(os.environ, {'DLAI_TOGETHER_API_BASE': 'http://127.0.0.1:9',
+                                              'TOGETHER_API_KEY': 'other'}):
+                self.assertEqual(together_utils.llama32(MESSAGES), ' Yes')
+                self.assertEqual(client.classify(MESSAGES), 'Yes')
+        dotenv.find_dotenv.assert_called_once_with()
+        dotenv.load_dotenv.assert_called_once_with('.env')
+        self.assertEqual({authorization for _, authorization, _ in self.server.received}, {'Bearer key'})
+
+    def test_without_dotenv(self):
+        # A None entry makes the import fail as if python-dotenv were not installed
+        with mock.patch.dict(sys.modules, {'dotenv': None}):
+            together_utils.load_env()
+            with together_utils.LlamaClient(11) as client:
+                self.assertEqual(client.classify(MESSAGES), 'Yes')
+
+
+if __name__ == '__main__':
+    unittest.main()